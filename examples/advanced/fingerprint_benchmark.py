@@ -0,0 +1,44 @@
+"""Benchmark of the structural input fingerprint against the md5 of JSON.
+
+An agent fingerprints the arguments of every call, including a short memory
+shared across rounds. The former ``get_md5(to_json(arguments))`` serializes
+the whole memory each time, the structural fingerprint reuses the digests of
+its large strings.
+
+    python -m examples.advanced.fingerprint_benchmark
+"""
+
+import time
+
+from oxygent.utils.common_utils import get_md5, to_json
+from oxygent.utils.fingerprint_utils import get_arguments_fingerprint
+
+MESSAGES = 200
+ROUNDS = 20
+
+
+def timed(func, arguments):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        func(arguments)
+    return (time.perf_counter() - start) / ROUNDS
+
+
+def main():
+    memory = [
+        {"role": "user", "content": f"question {i} " + "x" * 2000}
+        for i in range(MESSAGES)
+    ]
+    arguments = {"query": "q", "short_memory": memory}
+    # The first fingerprint fills the digest cache, as the first round does
+    get_arguments_fingerprint(arguments)
+
+    print(f"{MESSAGES} messages of 2KB, {ROUNDS} rounds")
+    json_md5 = timed(lambda a: get_md5(to_json(a)), arguments)
+    fingerprint = timed(get_arguments_fingerprint, arguments)
+    print(f"{'json + md5':<20} {json_md5 * 1e3:8.2f} ms")
+    print(f"{'cached fingerprint':<20} {fingerprint * 1e3:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
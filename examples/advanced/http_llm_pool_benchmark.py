@@ -0,0 +1,102 @@
+"""Benchmark of the pooled HttpLLM client against a client per call.
+
+A local stand-in of an OpenAI-compatible server answers each completion after
+a fixed delay. The same calls are sent with a new ``httpx.AsyncClient`` per
+call, as HttpLLM used to do, and through the pooled client of ``HttpLLM``.
+
+The server is plain HTTP on localhost, so there is no TLS handshake to save:
+against a remote HTTPS endpoint the gap is larger.
+
+    python -m examples.advanced.http_llm_pool_benchmark
+"""
+
+import asyncio
+import statistics
+import time
+
+import httpx
+import uvicorn
+from fastapi import FastAPI
+
+from oxygent import Config, oxy
+from oxygent.schemas import OxyRequest
+
+HOST, PORT = "127.0.0.1", 18090
+BASE_URL = f"http://{HOST}:{PORT}/v1"
+SERVER_DELAY = 0.005
+CALLS = 200
+CONCURRENCY = 20
+
+app = FastAPI()
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(body: dict):
+    await asyncio.sleep(SERVER_DELAY)
+    return {
+        "choices": [{"message": {"role": "assistant", "content": "pong"}}],
+        "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+    }
+
+
+async def call_with_new_client(payload):
+    async with httpx.AsyncClient(timeout=60) as client:
+        response = await client.post(f"{BASE_URL}/chat/completions", json=payload)
+        response.raise_for_status()
+        return response.json()
+
+
+async def run(name, call):
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    latencies = []
+
+    async def timed_call():
+        async with semaphore:
+            start = time.perf_counter()
+            await call()
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(timed_call() for _ in range(CALLS)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    print(
+        f"{name:<16} {CALLS / elapsed:8.1f} calls/s  "
+        f"p50 {statistics.median(latencies) * 1000:6.2f} ms  "
+        f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:6.2f} ms"
+    )
+
+
+async def main():
+    Config.set_llm_config({})
+    server = uvicorn.Server(
+        uvicorn.Config(app, host=HOST, port=PORT, log_level="warning")
+    )
+    server_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+
+    llm = oxy.HttpLLM(
+        name="bench_llm", api_key="sk-bench", base_url=BASE_URL, model_name="bench"
+    )
+    await llm.init()
+    messages = [{"role": "user", "content": "ping"}]
+    payload = {"model": "bench", "messages": messages}
+
+    async def call_pooled():
+        await llm._execute(OxyRequest(arguments={"messages": messages}))
+
+    # Warm both paths up before measuring
+    await call_with_new_client(payload)
+    await call_pooled()
+    print(f"{CALLS} calls, {CONCURRENCY} concurrent, server delay {SERVER_DELAY}s")
+    await run("client per call", lambda: call_with_new_client(payload))
+    await run("pooled HttpLLM", call_pooled)
+
+    await llm.cleanup()
+    server.should_exit = True
+    await server_task
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
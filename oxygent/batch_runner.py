@@ -0,0 +1,248 @@
+"""Batch runs of queries over a MAS.
+
+:class:`BatchRunner` runs a batch with a bounded footprint instead of
+starting every query at once:
+
+- queries are read lazily from a list, a generator (sync or async) or a
+  JSONL file, and at most ``concurrency`` of them run at a time;
+- each result is appended to a JSONL file as soon as its run completes,
+  with the trace ID of the run, so memory does not grow with the batch;
+- the output file is the checkpoint: a restarted batch skips the items it
+  already holds a successful result for;
+- :meth:`BatchRunner.run` reports the throughput and latency percentiles.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Any, AsyncIterator, Callable, Optional
+
+import aiofiles
+import shortuuid
+
+from .schemas import OxyState
+
+logger = logging.getLogger(__name__)
+
+
+def iter_jsonl(path):
+    """Yield the JSON values of the non-empty lines of a file."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _ends_with_newline(path) -> bool:
+    """Whether a file is empty or its last line is complete."""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        if not f.tell():
+            return True
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+def get_percentile(ordered: list, percentile: float) -> float:
+    """Return the ``percentile`` (0 to 1) of sorted values, 0 if there are none."""
+    if not ordered:
+        return 0.0
+    return ordered[int(percentile * (len(ordered) - 1))]
+
+
+class BatchRunner:
+    """Run a stream of queries with bounded concurrency and resumable output.
+
+    Each item of the batch is a query string, or a dict payload of
+    ``MAS.chat_with_agent`` whose ``id_key`` field identifies it across
+    restarts (its position in the stream otherwise). Each result line holds
+    the ``id``, ``query``, ``trace_id``, ``state``, ``output`` or ``error``
+    and ``latency`` of an item.
+
+    Example:
+        >>> runner = BatchRunner(mas.chat_with_agent, concurrency=16,
+        ...                      output_path="./results.jsonl")
+        >>> report = await runner.run("./queries.jsonl")
+    """
+
+    def __init__(
+        self,
+        func_run: Callable,
+        concurrency: int = 32,
+        output_path: Optional[str] = None,
+        is_resume: bool = True,
+        id_key: str = "id",
+        query_key: str = "query",
+    ):
+        """Create a runner.
+
+        Args:
+            func_run: Coroutine function from a payload to an OxyResponse,
+                usually ``MAS.chat_with_agent``.
+            concurrency (int): Items running at the same time.
+            output_path (str): JSONL file the results are appended to.
+            is_resume (bool): Skip the items already completed in
+                ``output_path``.
+            id_key (str): Field of a dict item holding its ID.
+            query_key (str): Field of a dict item holding its query.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.func_run = func_run
+        self.concurrency = concurrency
+        self.output_path = output_path
+        self.is_resume = is_resume
+        self.id_key = id_key
+        self.query_key = query_key
+
+    def load_completed(self) -> set:
+        """Return the IDs of the items completed in ``output_path``."""
+        if not self.output_path or not os.path.exists(self.output_path):
+            return set()
+        completed = set()
+        with open(self.output_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # The last line of a crashed run may be cut
+                    continue
+                if record.get("state") == OxyState.COMPLETED.name:
+                    completed.add(record["id"])
+        return completed
+
+    async def _iter_items(self, queries) -> AsyncIterator:
+        """Yield the ``(item_id, payload)`` of each query."""
+        if isinstance(queries, (str, os.PathLike)):
+            queries = iter_jsonl(queries)
+        if not hasattr(queries, "__aiter__"):
+
+            async def to_async(items):
+                for item in items:
+                    yield item
+
+            queries = to_async(queries)
+
+        index = 0
+        async for item in queries:
+            if isinstance(item, dict):
+                payload = dict(item)
+                item_id = payload.pop(self.id_key, index)
+                if self.query_key in payload:
+                    payload["query"] = payload.pop(self.query_key)
+            else:
+                payload = {"query": item}
+                item_id = index
+            index += 1
+            payload.setdefault("priority", "batch")
+            yield str(item_id), payload
+
+    async def _run_item(self, item_id: str, payload: dict) -> dict:
+        # The trace ID is set here to be recorded even if the run fails
+        payload.setdefault("current_trace_id", shortuuid.ShortUUID().random(length=16))
+        record = {
+            "id": item_id,
+            "query": payload.get("query", ""),
+            "trace_id": payload["current_trace_id"],
+        }
+        start = time.perf_counter()
+        try:
+            oxy_response = await self.func_run(payload=payload)
+            record["state"] = oxy_response.state.name
+            record["output"] = oxy_response.output
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Batch item {item_id} failed: {e}")
+            record["state"] = OxyState.FAILED.name
+            record["error"] = f"{type(e).__name__}: {e}"
+        record["latency"] = round(time.perf_counter() - start, 6)
+        return record
+
+    async def run(
+        self, queries, on_result: Optional[Callable[[dict], Any]] = None
+    ) -> dict:
+        """Run every query of ``queries`` not completed yet.
+
+        Args:
+            queries: List or (async) iterable of items, or path of a JSONL
+                file of items.
+            on_result: Function called with each result, in completion order.
+
+        Returns:
+            dict: Counts of the items, elapsed seconds, throughput in items
+            per second and latency percentiles in seconds.
+        """
+        completed = self.load_completed() if self.is_resume else set()
+        # A few items wait per worker, so the source is read as it is consumed
+        queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        latencies = []
+        report = {"total": 0, "completed": 0, "failed": 0, "skipped": 0}
+        output_file = None
+        if self.output_path:
+            os.makedirs(os.path.dirname(self.output_path) or ".", exist_ok=True)
+            output_file = await aiofiles.open(self.output_path, "a", encoding="utf-8")
+            if not _ends_with_newline(self.output_path):
+                # Keep the next record off a line cut by a crash
+                await output_file.write("\n")
+
+        async def produce():
+            async for item_id, payload in self._iter_items(queries):
+                report["total"] += 1
+                if item_id in completed:
+                    report["skipped"] += 1
+                    continue
+                await queue.put((item_id, payload))
+            for _ in range(self.concurrency):
+                await queue.put(None)
+
+        async def work():
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                record = await self._run_item(*item)
+                latencies.append(record["latency"])
+                if record["state"] == OxyState.COMPLETED.name:
+                    report["completed"] += 1
+                else:
+                    report["failed"] += 1
+                if output_file is not None:
+                    line = json.dumps(record, ensure_ascii=False, default=str)
+                    await output_file.write(line + "\n")
+                    await output_file.flush()
+                if on_result is not None:
+                    on_result(record)
+
+        start = time.perf_counter()
+        tasks = [asyncio.create_task(produce())] + [
+            asyncio.create_task(work()) for _ in range(self.concurrency)
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            if output_file is not None:
+                await output_file.close()
+
+        elapsed = time.perf_counter() - start
+        latencies.sort()
+        report["elapsed"] = round(elapsed, 3)
+        report["throughput"] = round(len(latencies) / elapsed, 3) if elapsed else 0.0
+        report["latency"] = {
+            "mean": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+            "p50": round(get_percentile(latencies, 0.5), 3),
+            "p90": round(get_percentile(latencies, 0.9), 3),
+            "p99": round(get_percentile(latencies, 0.99), 3),
+            "max": round(latencies[-1], 3) if latencies else 0.0,
+        }
+        logger.info(
+            f"Batch done: {report['completed']} completed, {report['failed']} "
+            f"failed, {report['skipped']} skipped in {report['elapsed']}s "
+            f"({report['throughput']}/s, p50 {report['latency']['p50']}s, "
+            f"p99 {report['latency']['p99']}s)"
+        )
+        return report
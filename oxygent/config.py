@@ -68,6 +68,8 @@ class Config:
             "is_stored": False,
             "is_show_in_terminal": False,
             "is_send_full_arguments": False,
+            "bus": "auto",  # auto, memory or redis
+            "heartbeat_interval": 15,  # seconds
         },
         "vearch": {},
         "es": {},
@@ -83,6 +85,7 @@ class Config:
             "port": 8080,
             "auto_open_webpage": True,
             "log_level": "INFO",
+            "request_timeout": None,  # seconds a web request may take
         },
         "agent": {
             "prompt": "",
@@ -95,6 +98,35 @@ class Config:
             "welcome_message": "Hi, I’m OxyGent. How can I assist you?",
         },
         "tool": {"mcp_is_keep_alive": True, "is_concurrent_init": True},
+        "scheduling": {
+            "policy": "weighted",  # weighted | strict
+            "weights": {"interactive": 8, "default": 4, "batch": 1},
+        },
+        "persistence": {
+            "is_write_behind": False,
+            "max_queue_size": 10000,
+            "max_batch_size": 500,
+            "flush_interval": 1.0,  # seconds
+            "overflow_policy": "block",  # block | drop
+        },
+        "tracing": {
+            "is_enabled": False,
+            "path": "",  # OTLP-JSON file, defaults to {cache_dir}/traces.jsonl
+            "max_queue_size": 4096,
+            "max_batch_size": 512,
+            "schedule_delay": 1.0,  # seconds
+        },
+        "profiling": {
+            "interval": 0.005,  # seconds between two stack samples
+            "max_stack_depth": 128,
+        },
+        "loop_monitor": {
+            "is_enabled": False,
+            "interval": 0.1,  # seconds between two beats of the loop task
+            "block_threshold": 0.1,  # seconds without a beat to report a block
+            "stack_limit": 8,
+        },
+        "batch": {"concurrency": 32},  # queries of a batch running at a time
     }
 
     @classmethod
@@ -364,6 +396,22 @@ class Config:
     def get_message_is_send_full_arguments(cls):
         return cls.get_module_config("message", "is_send_full_arguments")
 
+    @classmethod
+    def set_message_bus(cls, bus):
+        cls.set_module_config("message", "bus", bus)
+
+    @classmethod
+    def get_message_bus(cls):
+        return cls.get_module_config("message", "bus", "auto")
+
+    @classmethod
+    def set_message_heartbeat_interval(cls, heartbeat_interval):
+        cls.set_module_config("message", "heartbeat_interval", heartbeat_interval)
+
+    @classmethod
+    def get_message_heartbeat_interval(cls):
+        return cls.get_module_config("message", "heartbeat_interval", 15)
+
     """ es """
 
     @classmethod
@@ -490,6 +538,14 @@ class Config:
     def get_server_log_level(cls):
         return cls.get_module_config("server", "log_level")
 
+    @classmethod
+    def set_server_request_timeout(cls, request_timeout):
+        cls.set_module_config("server", "request_timeout", request_timeout)
+
+    @classmethod
+    def get_server_request_timeout(cls):
+        return cls.get_module_config("server", "request_timeout")
+
     """ agent """
 
     @classmethod
@@ -565,3 +621,207 @@ class Config:
     @classmethod
     def get_tool_is_concurrent_init(cls):
         return cls.get_module_config("tool", "is_concurrent_init")
+
+    """ scheduling """
+
+    @classmethod
+    def set_scheduling_config(cls, scheduling_config):
+        cls.set_module_config("scheduling", scheduling_config)
+
+    @classmethod
+    def get_scheduling_config(cls):
+        return cls.get_module_config("scheduling")
+
+    @classmethod
+    def set_scheduling_policy(cls, policy):
+        cls.set_module_config("scheduling", "policy", policy)
+
+    @classmethod
+    def get_scheduling_policy(cls):
+        return cls.get_module_config("scheduling", "policy", "weighted")
+
+    @classmethod
+    def set_scheduling_weights(cls, weights):
+        cls.set_module_config("scheduling", "weights", weights)
+
+    @classmethod
+    def get_scheduling_weights(cls):
+        return cls.get_module_config("scheduling", "weights", {})
+
+    """ persistence """
+
+    @classmethod
+    def set_persistence_config(cls, persistence_config):
+        cls.set_module_config("persistence", persistence_config)
+
+    @classmethod
+    def get_persistence_config(cls):
+        return cls.get_module_config("persistence")
+
+    @classmethod
+    def set_persistence_is_write_behind(cls, is_write_behind):
+        cls.set_module_config("persistence", "is_write_behind", is_write_behind)
+
+    @classmethod
+    def get_persistence_is_write_behind(cls):
+        return cls.get_module_config("persistence", "is_write_behind", False)
+
+    @classmethod
+    def set_persistence_max_queue_size(cls, max_queue_size):
+        cls.set_module_config("persistence", "max_queue_size", max_queue_size)
+
+    @classmethod
+    def get_persistence_max_queue_size(cls):
+        return cls.get_module_config("persistence", "max_queue_size", 10000)
+
+    @classmethod
+    def set_persistence_max_batch_size(cls, max_batch_size):
+        cls.set_module_config("persistence", "max_batch_size", max_batch_size)
+
+    @classmethod
+    def get_persistence_max_batch_size(cls):
+        return cls.get_module_config("persistence", "max_batch_size", 500)
+
+    @classmethod
+    def set_persistence_flush_interval(cls, flush_interval):
+        cls.set_module_config("persistence", "flush_interval", flush_interval)
+
+    @classmethod
+    def get_persistence_flush_interval(cls):
+        return cls.get_module_config("persistence", "flush_interval", 1.0)
+
+    @classmethod
+    def set_persistence_overflow_policy(cls, overflow_policy):
+        cls.set_module_config("persistence", "overflow_policy", overflow_policy)
+
+    @classmethod
+    def get_persistence_overflow_policy(cls):
+        return cls.get_module_config("persistence", "overflow_policy", "block")
+
+    """ tracing """
+
+    @classmethod
+    def set_tracing_config(cls, tracing_config):
+        cls.set_module_config("tracing", tracing_config)
+
+    @classmethod
+    def get_tracing_config(cls):
+        return cls.get_module_config("tracing")
+
+    @classmethod
+    def set_tracing_is_enabled(cls, is_enabled):
+        cls.set_module_config("tracing", "is_enabled", is_enabled)
+
+    @classmethod
+    def get_tracing_is_enabled(cls):
+        return cls.get_module_config("tracing", "is_enabled", False)
+
+    @classmethod
+    def set_tracing_path(cls, path):
+        cls.set_module_config("tracing", "path", path)
+
+    @classmethod
+    def get_tracing_path(cls):
+        return cls.get_module_config("tracing", "path", "")
+
+    @classmethod
+    def set_tracing_max_queue_size(cls, max_queue_size):
+        cls.set_module_config("tracing", "max_queue_size", max_queue_size)
+
+    @classmethod
+    def get_tracing_max_queue_size(cls):
+        return cls.get_module_config("tracing", "max_queue_size", 4096)
+
+    @classmethod
+    def set_tracing_max_batch_size(cls, max_batch_size):
+        cls.set_module_config("tracing", "max_batch_size", max_batch_size)
+
+    @classmethod
+    def get_tracing_max_batch_size(cls):
+        return cls.get_module_config("tracing", "max_batch_size", 512)
+
+    @classmethod
+    def set_tracing_schedule_delay(cls, schedule_delay):
+        cls.set_module_config("tracing", "schedule_delay", schedule_delay)
+
+    @classmethod
+    def get_tracing_schedule_delay(cls):
+        return cls.get_module_config("tracing", "schedule_delay", 1.0)
+
+    """ profiling """
+
+    @classmethod
+    def set_profiling_config(cls, profiling_config):
+        cls.set_module_config("profiling", profiling_config)
+
+    @classmethod
+    def get_profiling_config(cls):
+        return cls.get_module_config("profiling")
+
+    @classmethod
+    def set_profiling_interval(cls, interval):
+        cls.set_module_config("profiling", "interval", interval)
+
+    @classmethod
+    def get_profiling_interval(cls):
+        return cls.get_module_config("profiling", "interval", 0.005)
+
+    @classmethod
+    def set_profiling_max_stack_depth(cls, max_stack_depth):
+        cls.set_module_config("profiling", "max_stack_depth", max_stack_depth)
+
+    @classmethod
+    def get_profiling_max_stack_depth(cls):
+        return cls.get_module_config("profiling", "max_stack_depth", 128)
+
+    """ loop monitor """
+
+    @classmethod
+    def set_loop_monitor_config(cls, loop_monitor_config):
+        cls.set_module_config("loop_monitor", loop_monitor_config)
+
+    @classmethod
+    def get_loop_monitor_config(cls):
+        return cls.get_module_config("loop_monitor")
+
+    @classmethod
+    def set_loop_monitor_is_enabled(cls, is_enabled):
+        cls.set_module_config("loop_monitor", "is_enabled", is_enabled)
+
+    @classmethod
+    def get_loop_monitor_is_enabled(cls):
+        return cls.get_module_config("loop_monitor", "is_enabled", False)
+
+    @classmethod
+    def set_loop_monitor_interval(cls, interval):
+        cls.set_module_config("loop_monitor", "interval", interval)
+
+    @classmethod
+    def get_loop_monitor_interval(cls):
+        return cls.get_module_config("loop_monitor", "interval", 0.1)
+
+    @classmethod
+    def set_loop_monitor_block_threshold(cls, block_threshold):
+        cls.set_module_config("loop_monitor", "block_threshold", block_threshold)
+
+    @classmethod
+    def get_loop_monitor_block_threshold(cls):
+        return cls.get_module_config("loop_monitor", "block_threshold", 0.1)
+
+    @classmethod
+    def set_loop_monitor_stack_limit(cls, stack_limit):
+        cls.set_module_config("loop_monitor", "stack_limit", stack_limit)
+
+    @classmethod
+    def get_loop_monitor_stack_limit(cls):
+        return cls.get_module_config("loop_monitor", "stack_limit", 8)
+
+    """ batch """
+
+    @classmethod
+    def set_batch_concurrency(cls, concurrency):
+        cls.set_module_config("batch", "concurrency", concurrency)
+
+    @classmethod
+    def get_batch_concurrency(cls):
+        return cls.get_module_config("batch", "concurrency", 32)
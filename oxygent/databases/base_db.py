@@ -6,6 +6,9 @@ such as retry mechanisms and error handling for database operations.
 
 import asyncio
 import functools
+import time
+
+from oxygent.metrics import db_client_duration, db_client_errors
 
 
 class BaseDB:
@@ -42,18 +45,28 @@ class BaseDB:
                 Returns:
                     Callable: Result from the original function, or None if all retries failed
                 """
+                client = type(args[0]).__name__ if args else ""
+                start = time.perf_counter()
                 retries = 0
                 while retries < max_retries:
                     try:
-                        return await func(
+                        result = await func(
                             *args, **kwargs
                         )  # Attempt to execute the original function
+                        db_client_duration.observe(
+                            time.perf_counter() - start, client, func.__name__
+                        )
+                        return result
                     except Exception:
                         retries += 1
                         if retries < max_retries:
                             await asyncio.sleep(
                                 delay_between_retries
                             )  # Retry until reached max retries
+                db_client_duration.observe(
+                    time.perf_counter() - start, client, func.__name__
+                )
+                db_client_errors.inc(client, func.__name__)
                 return None
 
             return wrapper
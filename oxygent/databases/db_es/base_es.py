@@ -56,6 +56,34 @@ class BaseEs(BaseDB, ABC):
     async def update(self, index_name, doc_id, body):
         pass
 
+    async def bulk(self, actions):
+        """Apply several index and update actions.
+
+        The default implementation sends one request per action, subclasses
+        override it with a single round trip.
+
+        Args:
+            actions: List of dicts with ``op_type`` ("index" or "update"),
+                ``index_name``, ``doc_id`` and ``body``. Updates create the
+                document when it does not exist.
+
+        Returns:
+            Dict with ``errors`` (whether any action failed) and ``items``
+            (the result of each action)
+        """
+        items = []
+        for action in actions:
+            if action["op_type"] == "update":
+                item = await self.update(
+                    action["index_name"], action["doc_id"], action["body"]
+                )
+            else:
+                item = await self.index(
+                    action["index_name"], action["doc_id"], action["body"]
+                )
+            items.append(item)
+        return {"errors": any(item is None for item in items), "items": items}
+
     @abstractmethod
     async def search(self, index_name, body):
         """Execute a search query against an Elasticsearch index.
@@ -73,6 +73,18 @@ class JesEs(BaseEs):
     async def update(self, index_name, doc_id, body):
         return await self.client.update(index=index_name, id=doc_id, body={"doc": body})
 
+    async def bulk(self, actions):
+        operations = []
+        for action in actions:
+            meta = {"_index": action["index_name"], "_id": action["doc_id"]}
+            if action["op_type"] == "update":
+                operations.append({"update": meta})
+                operations.append({"doc": action["body"], "doc_as_upsert": True})
+            else:
+                operations.append({"index": meta})
+                operations.append(action["body"])
+        return await self.client.bulk(body=operations)
+
     async def search(self, index_name, body):
         return await self.client.search(index=index_name, body=body)
 
@@ -118,6 +118,47 @@ class LocalEs(BaseEs):
             await self._write_json_atomic(index_path, {})
         return {"acknowledged": True}
 
+    async def _load_for_write(self, index_name: str) -> Dict[str, Any]:
+        """Load an index before a write, recovering from corrupted files.
+
+        Must be called under the lock of the index.
+        """
+        data_path = self._index_path(index_name)
+        backup_path = f"{data_path}.bak"
+        data = await self._read_json_safe(data_path)
+
+        if data is None:  # unrecoverable corruption; try backup once
+            if await aiofiles.os.path.exists(backup_path):
+                await aiofiles.os.replace(backup_path, data_path)
+                data = await self._read_json_safe(data_path)
+
+        if data is None:
+            # still corrupted – preserve original file, switch to fresh store
+            corrupt_path = f"{data_path}.corrupt"
+            await aiofiles.os.rename(data_path, corrupt_path)
+            logger.error(
+                "Index %s is corrupted – moved to %s", index_name, corrupt_path
+            )
+            data = {}
+        return data
+
+    async def _persist(self, index_name: str, data: Dict[str, Any]) -> None:
+        """Back up the current file of an index and write *data* in its place."""
+        data_path = self._index_path(index_name)
+        if await aiofiles.os.path.exists(data_path):
+            await aiofiles.os.replace(data_path, f"{data_path}.bak")
+        await self._write_json_atomic(data_path, data)
+
+    @staticmethod
+    def _apply(data, doc_id, body, update_mode) -> dict[str, str]:
+        if update_mode:
+            merged = data.get(doc_id, {})
+            merged.update(body)
+            data[doc_id] = merged
+        else:
+            data[doc_id] = body
+        return {"_id": doc_id, "result": "updated" if update_mode else "created"}
+
     async def insert(
         self,
         index_name: str,
@@ -126,42 +167,33 @@ class LocalEs(BaseEs):
         *,
         update_mode: bool,
     ) -> dict[str, str]:
-        data_path = self._index_path(index_name)
-        backup_path = f"{data_path}.bak"
-
         lock = self._locks.setdefault(index_name, asyncio.Lock())
         async with lock:
-            # --- load existing data ---
-            data = await self._read_json_safe(data_path)
-
-            if data is None:  # unrecoverable corruption; try backup once
-                if await aiofiles.os.path.exists(backup_path):
-                    await aiofiles.os.replace(backup_path, data_path)
-                    data = await self._read_json_safe(data_path)
-
-            if data is None:
-                # still corrupted – preserve original file, switch to fresh store
-                corrupt_path = f"{data_path}.corrupt"
-                await aiofiles.os.rename(data_path, corrupt_path)
-                logger.error(
-                    "Index %s is corrupted – moved to %s", index_name, corrupt_path
-                )
-                data = {}
-
-            # --- apply mutation ---
-            if update_mode:
-                merged = data.get(doc_id, {})
-                merged.update(body)
-                data[doc_id] = merged
-            else:
-                data[doc_id] = body
-
-            # --- backup & persist ---
-            if await aiofiles.os.path.exists(data_path):
-                await aiofiles.os.replace(data_path, backup_path)
-            await self._write_json_atomic(data_path, data)
-
-        return {"_id": doc_id, "result": "updated" if update_mode else "created"}
+            data = await self._load_for_write(index_name)
+            result = self._apply(data, doc_id, body, update_mode)
+            await self._persist(index_name, data)
+        return result
+
+    async def bulk(self, actions: list[dict[str, Any]]) -> dict[str, Any]:
+        """Apply the actions with one read and one write per index."""
+        by_index: dict[str, list] = {}
+        for position, action in enumerate(actions):
+            by_index.setdefault(action["index_name"], []).append((position, action))
+
+        items = [None] * len(actions)
+        for index_name, index_actions in by_index.items():
+            lock = self._locks.setdefault(index_name, asyncio.Lock())
+            async with lock:
+                data = await self._load_for_write(index_name)
+                for position, action in index_actions:
+                    items[position] = self._apply(
+                        data,
+                        action["doc_id"],
+                        action["body"],
+                        action["op_type"] == "update",
+                    )
+                await self._persist(index_name, data)
+        return {"errors": False, "items": items}
 
     async def index(self, index_name: str, doc_id: str, body: dict[str, Any]):
         return await self.insert(index_name, doc_id, body, update_mode=False)
@@ -8,6 +8,8 @@ operations with size limits and expiration management.
 import asyncio
 import json
 import logging
+import math
+import time
 import traceback
 from functools import wraps
 from typing import Union
@@ -16,9 +18,14 @@ from aioredis import Redis
 from aioredis.exceptions import ConnectionError, TimeoutError
 
 from ...config import Config
+from ...metrics import db_client_duration, db_client_errors
 
 logger = logging.getLogger(__name__)
 
+# Bounds of the interval between the rpop calls of a simulated brpop
+BRPOP_MIN_INTERVAL = 0.01
+BRPOP_MAX_INTERVAL = 0.25
+
 
 def retry_decorator(func):
     """Decorator that provides automatic retry logic for Redis operations.
@@ -35,6 +42,7 @@ def retry_decorator(func):
 
     @wraps(func)
     async def wrapper(self, *args, **kwargs):
+        start = time.perf_counter()
         try:
             return await func(self, *args, **kwargs)
         except (ConnectionError, ConnectionResetError, TimeoutError) as e:
@@ -46,7 +54,12 @@ def retry_decorator(func):
         except Exception as e:
             logger.error(f"Error in {func.__name__}: {str(e)}")
             logger.error(traceback.format_exc())
+            db_client_errors.inc(type(self).__name__, func.__name__)
             return None
+        finally:
+            db_client_duration.observe(
+                time.perf_counter() - start, type(self).__name__, func.__name__
+            )
 
     return wrapper
 
@@ -59,18 +72,32 @@ class JimdbApRedis:
     built-in size limits and expiration handling.
     """
 
-    def __init__(self, host, port, password, db=0):
+    def __init__(
+        self,
+        host,
+        port,
+        password,
+        db=0,
+        max_connections=5,
+        is_brpop_supported=False,
+    ):
         """Initialize the JimDB Redis client.
 
         Args:
             host: Redis server hostname or IP address
             port: Redis server port number
             password: Authentication password for Redis server
+            max_connections: Size of the connection pool. A blocking brpop
+                holds a connection while it waits.
+            is_brpop_supported: Whether the server implements BRPOP (Redis
+                does, JimDB does not)
         """
         self.host = host
         self.port = port
         self.password = password
         self.db = db
+        self.max_connections = max_connections
+        self.is_brpop_supported = is_brpop_supported
         self.redis_pool = None
         self.default_expire_time = Config.get_redis_expire_time()
         self.default_list_max_size = Config.get_redis_max_size()
@@ -92,7 +119,7 @@ class JimdbApRedis:
         return Redis.from_url(
             f"redis://{self.host}:{self.port}/{self.db}",
             password=self.password,
-            max_connections=5,
+            max_connections=self.max_connections,
             # decode_responses=True,  # Automatic decoding (disabled)
             health_check_interval=30,
         )
@@ -274,23 +301,94 @@ class JimdbApRedis:
     async def brpop(self, key: str, timeout=1):  # Waiting for 1 sec for default
         """Blocking pop operation that removes and returns the last element of a list.
 
-        NOTE: Since JimDB doesn't support brpop, this implementation simulates
-        blocking behavior using rpop with sleep fallback.
+        NOTE: Since JimDB doesn't support brpop, unless ``is_brpop_supported``
+        this implementation simulates blocking behavior with rpop calls spaced
+        by a growing interval: quick after a value, sparse on an idle list.
 
         Args:
             key: The list key to pop from
-            timeout: Maximum time to wait in seconds (default: 1)
+            timeout: Maximum time to wait in seconds, 0 to wait forever
+                (default: 1)
 
         Returns:
-            Optional[bytes]: The response of the simulated brpop operation
+            Optional[bytes]: The popped value, or None if none came in time
         """
+        if self.is_brpop_supported:
+            # Servers before Redis 6 only take whole seconds
+            result = await self.redis_pool.brpop(key, timeout=math.ceil(timeout))
+            return result[1] if result else None
+
         # Simulating brpop
-        value = await self.redis_pool.rpop(key)
-        if value is not None:
-            return value
-        else:  # Simulating blocking by sleeping and trying again
-            await asyncio.sleep(timeout)
-            return await self.redis_pool.rpop(key)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout if timeout else None
+        interval = BRPOP_MIN_INTERVAL
+        while True:
+            value = await self.redis_pool.rpop(key)
+            if value is not None:
+                return value
+            sleep_time = interval
+            if deadline is not None:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return None
+                sleep_time = min(interval, remaining)
+            await asyncio.sleep(sleep_time)
+            interval = min(interval * 2, BRPOP_MAX_INTERVAL)
+
+    @retry_decorator
+    async def xadd(self, key: str, value, maxlen: int = None, ex: int = None):
+        """Append a value to a stream, trimmed to about ``maxlen`` entries.
+
+        NOTE: Streams need a server implementing XADD / XREAD (Redis 5+).
+
+        Args:
+            key: The stream key
+            value: The value, stored in the ``data`` field of the entry
+            maxlen: Entries kept, approximately (default: default_list_max_size)
+            ex: Expiration time in seconds (default: 1 day)
+
+        Returns:
+            Optional[str]: The ID of the entry
+        """
+        if ex is None:
+            ex = self.default_expire_time
+        if maxlen is None:
+            maxlen = self.default_list_max_size
+        async with self.redis_pool.pipeline(transaction=False) as pipe:
+            pipe.xadd(key, {"data": value}, maxlen=maxlen, approximate=True)
+            pipe.expire(key, ex)
+            results = await pipe.execute()
+        entry_id = results[0]
+        return entry_id.decode() if isinstance(entry_id, bytes) else entry_id
+
+    @retry_decorator
+    async def xread(self, key: str, last_id="0", count=None, timeout=None):
+        """Read the entries of a stream after ``last_id``.
+
+        Args:
+            key: The stream key
+            last_id: ID of the last entry already read, "0" for all of them
+                and "$" for the entries added from now on
+            count: Maximum number of entries returned
+            timeout: Seconds to wait for an entry, None not to wait and 0 to
+                wait forever
+
+        Returns:
+            list: ``(entry_id, value)`` pairs, empty if none came in time, or
+            None after an error
+        """
+        block = None
+        if timeout is not None:
+            # BLOCK is in milliseconds, and 0 waits forever
+            block = max(1, int(timeout * 1000)) if timeout else 0
+        response = await self.redis_pool.xread({key: last_id}, count=count, block=block)
+        entries = []
+        for _, stream_entries in response or []:
+            for entry_id, fields in stream_entries:
+                if isinstance(entry_id, bytes):
+                    entry_id = entry_id.decode()
+                entries.append((entry_id, fields.get(b"data", fields.get("data"))))
+        return entries
 
     @retry_decorator
     async def lrange(self, key: str, start: int = 0, end: int = -1):
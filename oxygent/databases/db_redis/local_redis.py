@@ -5,14 +5,42 @@ providing Redis-like functionality for development and testing environments with
 requiring an actual Elasticsearch server.
 """
 
+import asyncio
 import json
 import time
 from collections import deque
-from typing import Dict, Union
+from typing import Awaitable, Callable, Dict, List, Tuple, Union
 
 from ...config import Config
 
 
+def parse_stream_id(entry_id: str) -> Tuple[int, int]:
+    """Parse a stream entry ID ``<milliseconds>-<sequence>`` into a tuple."""
+    milliseconds, _, sequence = str(entry_id).partition("-")
+    return int(milliseconds), int(sequence or 0)
+
+
+def format_stream_id(entry_id: Tuple[int, int]) -> str:
+    return f"{entry_id[0]}-{entry_id[1]}"
+
+
+class LocalStream:
+    """Entries of a stream of LocalRedis, in ID order."""
+
+    def __init__(self):
+        self.entries = deque()
+        self.last_id = (0, 0)
+
+    def next_id(self) -> Tuple[int, int]:
+        """Return a new ID, greater than every previous one."""
+        milliseconds = int(time.time() * 1000)
+        if milliseconds > self.last_id[0]:
+            self.last_id = (milliseconds, 0)
+        else:
+            self.last_id = (self.last_id[0], self.last_id[1] + 1)
+        return self.last_id
+
+
 class LocalRedis:
     """Local in-memory implementation of Redis-like key-value store.
 
@@ -24,15 +52,20 @@ class LocalRedis:
     - In-memory key-value storage using deques for list operations
     - Automatic expiration handling with TTL support
     - List operations with configurable size limits
+    - Blocking pops woken up by pushes, without polling
+    - Streams read from a last entry ID by any number of readers
     - Value type validation and conversion
     """
 
     def __init__(self):
-        self.data: Dict[str, deque] = {}
+        self.data: Dict[str, Union[deque, bytes, int, str, float]] = {}
         self.expiry: Dict[str, float] = {}
         self.default_expire_time = Config.get_redis_expire_time()
         self.default_list_max_size = Config.get_redis_max_size()
         self.default_list_max_length = Config.get_redis_max_length() * 1024
+        # key -> condition notified by lpush, while brpop calls wait on it
+        self.conditions: Dict[str, asyncio.Condition] = {}
+        self.waiting: Dict[str, int] = {}
 
     async def lpush(
         self,
@@ -96,7 +129,14 @@ class LocalRedis:
             reversed(new_values)
         )  # Use reserved to ensure proper order
         self.expiry[key] = time.time() + ex
-        return len(self.data[key])
+        length = len(self.data[key])
+
+        # Wake up a blocked brpop per pushed value
+        condition = self.conditions.get(key)
+        if condition is not None:
+            async with condition:
+                condition.notify(len(new_values))
+        return length
 
     async def rpop(self, key: str) -> Union[str, bytes, int, float, None]:
         """Remove and return the last (rightmost, tail) element from a list.
@@ -119,6 +159,172 @@ class LocalRedis:
             return self.data[key].pop()
         return None
 
+    async def brpop(
+        self, key: str, timeout: float = 1
+    ) -> Union[str, bytes, int, float, None]:
+        """Remove and return the last element of a list, waiting for one.
+
+        The wait is on an ``asyncio.Condition`` notified by ``lpush``, so an
+        idle caller costs nothing and gets a pushed value right away.
+
+        Args:
+            key: The list key to pop from
+            timeout: Maximum time to wait in seconds, 0 to wait forever
+
+        Returns:
+            The removed element, or None if none was pushed in time
+        """
+        return await self._wait(key, lambda: self.rpop(key), timeout)
+
+    async def xadd(
+        self,
+        key: str,
+        value: Union[bytes, str, int, float],
+        maxlen: int = None,
+        ex: int = None,
+    ) -> str:
+        """Append a value to a stream, like ``XADD key MAXLEN ~ maxlen * data value``.
+
+        Args:
+            key: The stream key
+            value: The value of the entry
+            maxlen: Entries kept in the stream (default: default_list_max_size)
+            ex: Expiration time in seconds (default: 1 day)
+
+        Returns:
+            str: The ID of the entry, ``<milliseconds>-<sequence>``
+        """
+        if ex is None:
+            ex = self.default_expire_time
+        if maxlen is None:
+            maxlen = self.default_list_max_size
+        self._check_expiry(key)
+        stream = self.data.get(key)
+        if not isinstance(stream, LocalStream):
+            stream = self.data[key] = LocalStream()
+        entry_id = stream.next_id()
+        stream.entries.append((entry_id, value))
+        while len(stream.entries) > maxlen:
+            stream.entries.popleft()
+        self.expiry[key] = time.time() + ex
+
+        condition = self.conditions.get(key)
+        if condition is not None:
+            async with condition:
+                condition.notify_all()
+        return format_stream_id(entry_id)
+
+    async def xread(
+        self, key: str, last_id: str = "0", count: int = None, timeout: float = None
+    ) -> List[Tuple[str, Union[bytes, str, int, float]]]:
+        """Read the entries of a stream after ``last_id``, like ``XREAD``.
+
+        Entries are not consumed, so several readers can follow a stream,
+        each from its own last ID.
+
+        Args:
+            key: The stream key
+            last_id: ID of the last entry already read, "0" for all of them
+                and "$" for the entries added from now on
+            count: Maximum number of entries returned
+            timeout: Seconds to wait for an entry, None not to wait and 0 to
+                wait forever
+
+        Returns:
+            list: ``(entry_id, value)`` pairs, empty if none came in time
+        """
+        self._check_expiry(key)
+        stream = self.data.get(key)
+        if last_id == "$":
+            last_id = (
+                format_stream_id(stream.last_id)
+                if isinstance(stream, LocalStream)
+                else "0"
+            )
+        after = parse_stream_id(last_id)
+
+        async def read():
+            self._check_expiry(key)
+            stream = self.data.get(key)
+            if not isinstance(stream, LocalStream):
+                return None
+            entries = [
+                (format_stream_id(entry_id), value)
+                for entry_id, value in stream.entries
+                if entry_id > after
+            ][:count]
+            return entries or None
+
+        if timeout is None:
+            entries = await read()
+        else:
+            entries = await self._wait(key, read, timeout)
+        return entries or []
+
+    async def _wait(self, key: str, read: Callable[[], Awaitable], timeout: float):
+        """Return the first result of ``read`` that is not None.
+
+        ``read`` is retried each time ``lpush`` or ``xadd`` notify the
+        ``asyncio.Condition`` of the key, so an idle caller costs nothing.
+
+        Args:
+            key: The key written by the awaited push
+            read: Coroutine function returning None while nothing is there
+            timeout: Maximum time to wait in seconds, 0 to wait forever
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout if timeout else None
+        condition = self.conditions.setdefault(key, asyncio.Condition())
+        self.waiting[key] = self.waiting.get(key, 0) + 1
+        try:
+            async with condition:
+                while True:
+                    value = await read()
+                    if value is not None:
+                        return value
+                    if deadline is None:
+                        await condition.wait()
+                        continue
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        return None
+                    try:
+                        await asyncio.wait_for(condition.wait(), remaining)
+                    except asyncio.TimeoutError:
+                        return await read()
+        finally:
+            self.waiting[key] -= 1
+            if not self.waiting[key]:
+                del self.waiting[key]
+                del self.conditions[key]
+
+    async def set(self, key: str, value: Union[bytes, int, str, float], ex: int = None):
+        """Set a key to a plain value with an expiration time.
+
+        Args:
+            key: The key to set
+            value: The value to store
+            ex: Expiration time in seconds (default: 1 day)
+        """
+        if ex is None:
+            ex = self.default_expire_time
+        self.data[key] = value
+        self.expiry[key] = time.time() + ex
+        return True
+
+    async def get(self, key: str) -> Union[str, bytes, int, float, None]:
+        """Get the value set for a key, or None if it is missing or expired."""
+        self._check_expiry(key)
+        value = self.data.get(key)
+        if isinstance(value, (deque, LocalStream)):
+            raise TypeError(f"Key {key} holds a list, not a value")
+        return value
+
+    async def exists(self, key: str) -> int:
+        """Return 1 if the key holds a value, a list or a stream, else 0."""
+        self._check_expiry(key)
+        return int(key in self.data)
+
     def _check_expiry(self, key: str):
         """Check if a key has expired and remove it if necessary.
 
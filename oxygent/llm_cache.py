@@ -0,0 +1,115 @@
+"""Exact-match cache of LLM responses.
+
+``BaseLLM`` reuses the response of a previous call when the model, the
+messages and the effective parameters are the same (``is_cache_response``).
+It relies on a :class:`~result_cache.ResultCache`:
+
+- the in-process LRU tier serves repeats of the running process;
+- a :class:`SqliteStore` under ``Config.get_cache_save_dir()`` keeps the
+  responses across restarts, e.g. for regression runs of a batch.
+
+Only deterministic calls are cached unless forced: streaming calls, whose
+output reaches the user while it is generated, and calls sampled with a
+non-zero temperature go to the model.
+"""
+
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+
+from .config import Config
+
+# path -> SqliteStore, one connection per file for the whole process
+_stores = {}
+
+
+def get_llm_cache_path() -> str:
+    return os.path.join(Config.get_cache_save_dir(), "llm_cache.db")
+
+
+def get_sqlite_store(path=None) -> "SqliteStore":
+    """Return the store of ``path``, shared by every LLM of the process."""
+    path = path or get_llm_cache_path()
+    store = _stores.get(path)
+    if store is None:
+        store = _stores[path] = SqliteStore(path)
+    return store
+
+
+def is_deterministic(params: dict) -> bool:
+    """Whether a call with these parameters may be answered from the cache."""
+    if params.get("stream"):
+        return False
+    try:
+        return float(params.get("temperature", 1)) == 0
+    except (TypeError, ValueError):
+        return False
+
+
+class SqliteStore:
+    """Persistent key-value store with the ``get``/``set`` methods of redis.
+
+    Queries run in a worker thread, the connection is opened on first use.
+
+    Example:
+        >>> store = SqliteStore("./cache_dir/llm_cache.db")
+        >>> await store.set("key", "value", ex=3600)
+        >>> await store.get("key")
+        'value'
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS kv "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expire_at REAL)"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _get(self, key):
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT value, expire_at FROM kv WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, expire_at = row
+            if expire_at is not None and expire_at <= time.time():
+                conn.execute("DELETE FROM kv WHERE key = ?", (key,))
+                conn.commit()
+                return None
+            return value
+
+    def _set(self, key, value, ex):
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO kv (key, value, expire_at) VALUES (?, ?, ?)",
+                (key, value, time.time() + ex if ex else None),
+            )
+            conn.commit()
+
+    async def get(self, key):
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key, value, ex=None):
+        await asyncio.to_thread(self._set, key, value, ex)
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
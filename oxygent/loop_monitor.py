@@ -0,0 +1,140 @@
+"""Event-loop lag and blocking-call detection.
+
+Everything in a MAS shares one asyncio loop, so a slow synchronous call
+(a sync tool, JSON encoding of a ``LocalEs`` index, a file handler ...)
+stalls every concurrent request. A :class:`LoopMonitor` watches the loop
+from two sides:
+
+- a task on the loop sleeps ``interval`` seconds in a row and records the
+  extra time each sleep took as loop lag (``oxygent_event_loop_lag_seconds``);
+- a watchdog thread checks that this task keeps beating. When it has been
+  silent for more than ``block_threshold`` seconds, the watchdog reads the
+  stack of the loop thread, finds the ``oxy_request`` being served in it,
+  and logs a warning with the innermost frames, the Oxy and the trace.
+  Blocks are counted per Oxy in ``oxygent_event_loop_blocks_total``.
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+
+from . import metrics
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+
+def _find_oxy_request(frame):
+    """Return the innermost ``oxy_request`` local of a stack, or None."""
+    while frame is not None:
+        oxy_request = frame.f_locals.get("oxy_request")
+        if hasattr(oxy_request, "current_trace_id"):
+            return oxy_request
+        frame = frame.f_back
+    return None
+
+
+class LoopMonitor:
+    """Measure the lag of the running loop and report the calls blocking it.
+
+    Example:
+        >>> loop_monitor = LoopMonitor(block_threshold=0.2)
+        >>> loop_monitor.start()
+        >>> ...
+        >>> await loop_monitor.stop()
+    """
+
+    def __init__(self, interval=None, block_threshold=None, stack_limit=None):
+        """Create a monitor, it watches the running loop once started.
+
+        Args:
+            interval (float): Seconds between two beats of the loop task.
+            block_threshold (float): Seconds without a beat, beyond
+                ``interval``, after which the loop is reported as blocked.
+            stack_limit (int): Innermost frames logged for a block.
+        """
+        self.interval = interval or Config.get_loop_monitor_interval()
+        self.block_threshold = (
+            block_threshold or Config.get_loop_monitor_block_threshold()
+        )
+        self.stack_limit = stack_limit or Config.get_loop_monitor_stack_limit()
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.blocks = 0
+        self._loop = None
+        self._thread_id = None
+        self._task = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._heartbeat = 0.0
+        # Heartbeat of the last block reported, and its (oxy name, trace id)
+        self._reported_beat = None
+        self._reported_block = None
+
+    def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._thread_id = threading.get_ident()
+        self._heartbeat = time.perf_counter()
+        self._task = asyncio.create_task(self._run())
+        self._thread = threading.Thread(
+            target=self._watch, name="loop-monitor", daemon=True
+        )
+        self._thread.start()
+
+    async def stop(self):
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._thread is not None:
+            await asyncio.to_thread(self._thread.join)
+            self._thread = None
+
+    async def _run(self):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            now = time.perf_counter()
+            self._heartbeat = now
+            lag = max(0.0, now - start - self.interval)
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+            metrics.event_loop_lag.observe(lag)
+            metrics.event_loop_last_lag.set(lag)
+            if self._reported_block is not None:
+                oxy_name, trace_id = self._reported_block
+                self._reported_block = None
+                self.blocks += 1
+                metrics.event_loop_blocks.inc(oxy_name)
+                logger.warning(
+                    f"Event loop was blocked for {lag:.3f}s in {oxy_name or 'unknown'}",
+                    extra={"trace_id": trace_id},
+                )
+
+    def _watch(self):
+        check_interval = min(self.interval, self.block_threshold) / 2
+        while not self._stop.wait(check_interval):
+            heartbeat = self._heartbeat
+            blocked = time.perf_counter() - heartbeat - self.interval
+            if blocked > self.block_threshold and self._reported_beat != heartbeat:
+                self._reported_beat = heartbeat
+                self._report_block(blocked)
+
+    def _report_block(self, blocked):
+        frame = sys._current_frames().get(self._thread_id)
+        if frame is None:
+            return
+        oxy_request = _find_oxy_request(frame)
+        oxy_name = oxy_request.callee if oxy_request else ""
+        trace_id = oxy_request.current_trace_id if oxy_request else ""
+        self._reported_block = (oxy_name, trace_id)
+        stack = "".join(traceback.format_stack(frame, limit=self.stack_limit))
+        logger.warning(
+            f"Event loop blocked for more than {blocked:.3f}s "
+            f"in {oxy_name or 'unknown'}:\n{stack}",
+            extra={"trace_id": trace_id},
+        )
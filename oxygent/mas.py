@@ -12,6 +12,7 @@ NOTE: This module contains the following parts:
     - master_agent_name: Name of the master agent (instance of BaseAgent)
     - active_tasks: Dictionary to manage active tasks, for SSE and other async operations
     - es_client / redis_client / vearch_client: Database clients for Elasticsearch, Redis, and Vearch
+    - persistence_queue: Optional write-behind queue batching the ES records
     - agent_organization: Dictionary representing the organization structure of agents
     - lock: Boolean to control task execution flow
 """
@@ -21,33 +22,38 @@ import asyncio
 import datetime
 import json
 import os
+import time
 import traceback
 from collections import OrderedDict
-from typing import Callable, Optional
+from typing import Any, Callable, Optional
 
-import msgpack
 import shortuuid
 from elasticsearch import AsyncElasticsearch
 from pydantic import BaseModel, ConfigDict, Field
 
+from .batch_runner import BatchRunner
 from .config import Config
 from .databases.db_es import JesEs, LocalEs
 from .databases.db_redis import JimdbApRedis, LocalRedis
 from .databases.db_vector import VearchDB
 from .db_factory import DBFactory
 from .log_setup import setup_logging
+from .loop_monitor import LoopMonitor
+from .message_bus import BaseMessageBus, create_message_bus
 from .oxy import Oxy
 from .oxy.agents.base_agent import BaseAgent
 from .oxy.agents.remote_agent import RemoteAgent
 from .oxy.base_flow import BaseFlow
 from .oxy.base_tool import BaseTool
 from .oxy.llms.base_llm import BaseLLM
-from .oxy.mcp_tools.base_mcp_client import BaseMCPClient
+from .metrics import registry as metrics_registry
+from .persistence_queue import PersistenceQueue
+from .profiling import TraceProfiler
+from .tracing import BatchSpanProcessor, OTLPJsonFileExporter
 from .routes import router
 from .schemas import OxyRequest, OxyResponse, WebResponse
 from .utils.common_utils import (
     _compose_query_parts,
-    msgpack_preprocess,
     print_tree,
     to_json,
 )
@@ -79,6 +85,21 @@ class MAS(BaseModel):
     vearch_client: Optional[VearchDB] = Field(None)
     es_client: Optional[AsyncElasticsearch] = Field(None)
     redis_client: Optional[JimdbApRedis] = Field(None)
+    message_bus: Optional[BaseMessageBus] = Field(
+        None, description="Carries the messages of a trace to its SSE client"
+    )
+    persistence_queue: Optional[PersistenceQueue] = Field(
+        None, description="Write-behind queue of ES records, if enabled"
+    )
+    span_exporter: Optional[Any] = Field(
+        None, description="Sink of finished spans, with export(spans)"
+    )
+    span_processor: Optional[BatchSpanProcessor] = Field(
+        None, description="Batches spans to the exporter, if tracing is enabled"
+    )
+    loop_monitor: Optional[LoopMonitor] = Field(
+        None, description="Event loop lag and blocking-call monitor"
+    )
 
     lock: bool = Field(False)
     active_tasks: dict = Field(default_factory=dict)
@@ -116,6 +137,12 @@ class MAS(BaseModel):
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         await asyncio.gather(*self.background_tasks)
+        if self.persistence_queue:
+            await self.persistence_queue.close()
+        if self.span_processor:
+            await self.span_processor.shutdown()
+        if self.loop_monitor:
+            await self.loop_monitor.stop()
         logger.info("=" * 64)
         logger.info("🪂 OxyGent MAS Application Exit")
         logger.info("=" * 64)
@@ -189,6 +216,7 @@ class MAS(BaseModel):
         - Initializing the database connections (Elasticsearch, Redis)
         - Setting up the agent organization structure
         - Initialize the vector search if configured
+        - Starting the event loop monitor if enabled
         """
         self.show_banner()
         self.show_mas_info()
@@ -200,6 +228,7 @@ class MAS(BaseModel):
             self.add_oxy(retrieve_fh)
         # Initialize datebase asynchronously
         await self.init_db()
+        self.init_tracing()
         # Initialize all oxy instances
         await self.init_all_oxy()
         # Initialize the master agent name
@@ -210,18 +239,82 @@ class MAS(BaseModel):
         # Build the agent organization structure
         self.init_agent_organization()
         self.show_org()
+        self.register_metrics()
+        if Config.get_loop_monitor_is_enabled():
+            self.loop_monitor = LoopMonitor()
+            self.loop_monitor.start()
+
+    def register_metrics(self):
+        """Expose the runtime state of this MAS on the ``/metrics`` route.
+
+        The gauges are read from the MAS at scrape time, a MAS created later
+        replaces them.
+        """
+
+        def get_oxy_stat(key):
+            return lambda: {
+                (name,): oxy.get_concurrency_stats()[key]
+                for name, oxy in self.oxy_name_to_oxy.items()
+            }
+
+        for key, documentation in [
+            ("limit", "Concurrency limit of each Oxy."),
+            ("in_flight", "Oxy calls holding a concurrency slot."),
+            ("queue_depth", "Oxy calls waiting for a concurrency slot."),
+        ]:
+            metrics_registry.gauge(
+                f"oxygent_oxy_{key}", documentation, ["oxy"], get_oxy_stat(key)
+            )
+        metrics_registry.gauge(
+            "oxygent_mas_active_streams",
+            "Running SSE chat tasks.",
+            callback=lambda: len(self.active_tasks),
+        )
+        metrics_registry.gauge(
+            "oxygent_mas_background_tasks",
+            "Background tasks (data saving ...) not finished yet.",
+            callback=lambda: len(self.background_tasks),
+        )
+        if self.persistence_queue:
+            for key, documentation in [
+                ("pending", "Records waiting in the persistence queue."),
+                ("dropped", "Records dropped by the persistence queue."),
+                ("queue_lag", "Seconds the oldest pending record has waited."),
+                ("last_flush_latency", "Seconds taken by the last bulk write."),
+            ]:
+                metrics_registry.gauge(
+                    f"oxygent_persistence_{key}",
+                    documentation,
+                    callback=lambda key=key: self.persistence_queue.stats()[key],
+                )
+
+    def init_tracing(self):
+        """Export a span per Oxy call when tracing is enabled.
+
+        Spans go to ``span_exporter`` if it is set, to an OTLP-JSON file
+        otherwise.
+        """
+        if not (Config.get_tracing_is_enabled() or self.span_exporter):
+            return
+        exporter = self.span_exporter or OTLPJsonFileExporter(
+            Config.get_tracing_path() or None
+        )
+        self.span_processor = BatchSpanProcessor(
+            exporter,
+            max_queue_size=Config.get_tracing_max_queue_size(),
+            max_batch_size=Config.get_tracing_max_batch_size(),
+            schedule_delay=Config.get_tracing_schedule_delay(),
+        )
 
     async def cleanup_servers(self) -> None:
         """Gracefully shut down remote servers/clients.
 
-        The method concurrently calls ``cleanup()`` on every
-        :class:`BaseMCPClient` that has been registered.  It is automatically
-        invoked by :func:`__aexit__`.
+        The method concurrently calls ``cleanup()`` on every registered Oxy,
+        which closes MCP sessions and pooled HTTP clients.  It is
+        automatically invoked by :func:`__aexit__`.
         """
         cleanup_tasks = []
         for oxy in self.oxy_name_to_oxy.values():
-            if not isinstance(oxy, BaseMCPClient):
-                continue
             cleanup_tasks.append(asyncio.create_task(oxy.cleanup()))
 
         if cleanup_tasks:
@@ -250,6 +343,14 @@ class MAS(BaseModel):
             self.es_client = db_factory.get_instance(JesEs, hosts, user, password)
         else:
             self.es_client = db_factory.get_instance(LocalEs)
+        if Config.get_persistence_is_write_behind():
+            self.persistence_queue = PersistenceQueue(
+                self.es_client,
+                max_queue_size=Config.get_persistence_max_queue_size(),
+                max_batch_size=Config.get_persistence_max_batch_size(),
+                flush_interval=Config.get_persistence_flush_interval(),
+                overflow_policy=Config.get_persistence_overflow_policy(),
+            )
 
         # trace table
         await self.es_client.create_index(
@@ -306,6 +407,7 @@ class MAS(BaseModel):
             "output": {"type": "text"},
             "state": {"type": "keyword"},
             "extra": {"type": "text"},
+            "timings": {"type": "object", "enabled": False},
             "call_stack": {"type": "text"},
             "node_id_stack": {"type": "text"},
             "pre_node_ids": {"type": "text"},
@@ -352,10 +454,16 @@ class MAS(BaseModel):
             password = redis_config["password"]
             db = redis_config.get("db", 0)
             self.redis_client = JimdbApRedis(
-                host=host, port=port, password=password, db=db
+                host=host,
+                port=port,
+                password=password,
+                db=db,
+                max_connections=redis_config.get("max_connections", 5),
+                is_brpop_supported=redis_config.get("is_brpop_supported", False),
             )
         else:
             self.redis_client = LocalRedis()
+        self.message_bus = create_message_bus(self.redis_client)
 
     async def batch_init_oxy(self, *class_type):
         """Batch initialize oxy objects of specified types asynchronously.
@@ -533,7 +641,7 @@ class MAS(BaseModel):
             )
             return False
 
-    async def call(self, callee, arguments, **kwargs):
+    async def call(self, callee, arguments, timeout=None, **kwargs):
         """Invoke an *Oxy* component directly and return its output.
 
         Args:
@@ -541,6 +649,8 @@ class MAS(BaseModel):
                 internal registry).
             arguments (dict): Payload that will populate
                 :attr:`~schemas.OxyRequest.arguments`.
+            timeout (float, optional): Seconds the whole call, nested calls
+                included, may take. Sets the request deadline.
             **kwargs: Additional :class:`~schemas.OxyRequest` fields such as
                 *caller*, *from_trace_id*, or *shared_data*.
 
@@ -553,24 +663,25 @@ class MAS(BaseModel):
         """
         oxy_request = OxyRequest(callee=callee, arguments=arguments, **kwargs)
         oxy_request.mas = self
+        if timeout is not None:
+            oxy_request.set_timeout(timeout)
 
-        oxy = self.oxy_name_to_oxy[oxy_request.callee]
-        oxy_response = await oxy.execute(oxy_request)
+        oxy_response = await oxy_request.start()
         return oxy_response.output
 
     async def send_message(self, message, redis_key):
-        """Push *message* onto a capped Redis list.
+        """Publish *message* on the message bus under *redis_key*.
 
-        The data is MsgPack‑encoded before being stored.  At most **10** items
-        are kept to bound memory usage for long‑running SSE connections.
+        In process the message object itself is queued for the SSE client,
+        with Redis it is MsgPack‑encoded onto a capped list (see
+        :mod:`oxygent.message_bus`).
 
         Args:
             message: Any serialisable Python object.
-            redis_key: Target Redis key (usually ``mas_msg:{app}:{trace_id}``).
+            redis_key: Target key (usually ``mas_msg:{app}:{trace_id}``).
         """
         if Config.get_message_is_show_in_terminal():
             logger.info(message)
-        bytes_msg = msgpack.packb(msgpack_preprocess(message))
         if Config.get_message_is_stored():
             parts = redis_key.split(":")
             current_trace_id = parts[-1] if len(parts) >= 3 else ""
@@ -588,7 +699,7 @@ class MAS(BaseModel):
             await self.es_client.index(
                 index=Config.get_app_name() + "_message", body=message_doc
             )
-        await self.redis_client.lpush(redis_key, bytes_msg)
+        await self.message_bus.publish(redis_key, message)
 
     async def chat_with_agent(
         self,
@@ -606,7 +717,9 @@ class MAS(BaseModel):
         them to the browser.
 
         Args:
-            payload: Mapping that **must** contain the key ``query``.
+            payload: Mapping that **must** contain the key ``query``. With
+                ``profile=True`` the stacks of the trace are sampled and saved
+                to ``{cache_dir}/profiles/{trace_id}.collapsed``.
             send_msg_key: Optional Redis key for SSE streaming.
 
         Returns:
@@ -641,6 +754,13 @@ class MAS(BaseModel):
             # payload = payload or {}
             # payload.setdefault("shared_data",{})["query"] = payload.get("query","")
 
+            # A request continuing or restarting a trace reads its trace, node
+            # and history records: write those still queued first
+            if self.persistence_queue and (
+                payload.get("from_trace_id") or payload.get("restart_node_id")
+            ):
+                await self.persistence_queue.flush()
+
             if "restart_node_id" in payload and payload.get("restart_node_id"):
                 es_response = await self.es_client.search(
                     Config.get_app_name() + "_node",
@@ -696,6 +816,8 @@ class MAS(BaseModel):
                 if hits:
                     oxy_request.group_id = hits[0]["_source"].get("group_id", "")
 
+            # "false" or "0" in a JSON body does not turn profiling on
+            is_profile = str(payload.pop("profile", False)).lower() in ("1", "true")
             oxy_request_fields = oxy_request.model_fields
             for k, v in payload.items():
                 if k in oxy_request_fields:
@@ -706,7 +828,11 @@ class MAS(BaseModel):
             if not oxy_request.callee:
                 oxy_request.callee = self.master_agent_name
 
-            oxy_response = await oxy_request.start()
+            if is_profile:
+                async with TraceProfiler(oxy_request.current_trace_id):
+                    oxy_response = await oxy_request.start()
+            else:
+                oxy_response = await oxy_request.start()
 
             if send_msg_key:
                 await self.send_message(
@@ -747,53 +873,93 @@ class MAS(BaseModel):
     # FastAPI + SSE web service (unedited original docstring preserved)
     # ------------------------------------------------------------------
 
-    async def event_stream(self, redis_key, current_trace_id, task):
+    @staticmethod
+    def _to_sse_message(message):
+        """Convert a bus message into what the frontend displays."""
+        if not isinstance(message, dict) or "event" in message:
+            return message
+        # Convert before sending message: Use msg.content.arguments.query
+        if message.get("type", "") == "tool_call" and isinstance(
+            message.get("content", {}).get("arguments", {}).get("query", ""),
+            list,
+        ):
+            # Copy what is rewritten: an in-process message shares its
+            # content with the sender
+            content = message["content"]
+            for msg in content["arguments"]["query"]:
+                if msg.get("type") == "text":
+                    arguments = {**content["arguments"], "query": msg.get("text", "")}
+                    content = {**content, "arguments": arguments}
+                    message = {**message, "content": content}
+                    break
+        if message.get("type", "") == "observation":
+            content = {
+                **message["content"],
+                "output": to_json(message["content"]["output"]),
+            }
+            message = {**message, "content": content}
+        return message
+
+    async def event_stream(
+        self, redis_key, current_trace_id, task=None, last_event_id=None
+    ):
+        """Forward the messages of a trace to its SSE client.
+
+        Args:
+            redis_key: Key of the messages of the trace.
+            current_trace_id: The trace.
+            task: The chat producing the messages, cancelled when the client
+                disconnects, unless the message bus lets it resume later.
+                None when resuming the stream of a running or finished chat.
+            last_event_id: Event ID after which a resumable bus is read.
+        """
         try:
-            task.add_done_callback(
-                lambda future: self.active_tasks.pop(current_trace_id, None)
-            )
-            self.active_tasks[current_trace_id] = task
+            if task is not None:
+                task.add_done_callback(
+                    lambda future: self.active_tasks.pop(current_trace_id, None)
+                )
+                self.active_tasks[current_trace_id] = task
+            self.message_bus.subscribe(redis_key)
+            heartbeat_interval = Config.get_message_heartbeat_interval()
             while True:
-                bytes_msg = await self.redis_client.rpop(redis_key)
-                if bytes_msg is None:
-                    await asyncio.sleep(0.1)
+                # Wait for the next messages, sending a heartbeat comment when
+                # the stream is idle to keep proxies from closing it
+                entries = await self.message_bus.read(
+                    redis_key, last_event_id, timeout=heartbeat_interval
+                )
+                if not entries:
+                    yield {"comment": "heartbeat"}
                     continue
-                message = msgpack.unpackb(bytes_msg)
-                if message:
-                    if isinstance(message, dict):
-                        if "event" in message:
-                            yield message
-                            logger.info(
-                                "SSE connection terminated.",
-                                extra={"trace_id": current_trace_id},
-                            )
-                            break
-                        # Convert before sending message: Use msg.content.arguments.query
-                        if message.get("type", "") == "tool_call" and isinstance(
-                            message.get("content", {})
-                            .get("arguments", {})
-                            .get("query", ""),
-                            list,
-                        ):
-                            for msg in message["content"]["arguments"]["query"]:
-                                if msg.get("type") == "text":
-                                    message["content"]["arguments"]["query"] = msg.get(
-                                        "text", ""
-                                    )
-                                    break
-                        if message.get("type", "") == "observation":
-                            message["content"]["output"] = to_json(
-                                message["content"]["output"]
-                            )
+                for event_id, message in entries:
+                    if event_id:
+                        # Sent as the SSE id, returned as Last-Event-ID
+                        last_event_id = event_id
+                    if not message:
+                        continue
+                    message = self._to_sse_message(message)
+                    if isinstance(message, dict) and "event" in message:
+                        yield {**message, "id": event_id} if event_id else message
+                        logger.info(
+                            "SSE connection terminated.",
+                            extra={"trace_id": current_trace_id},
+                        )
+                        return
                     # Send message
-                    yield {"data": to_json(message)}
+                    event = {"data": to_json(message)}
+                    if event_id:
+                        event["id"] = event_id
+                    yield event
         except asyncio.CancelledError:
             logger.info(
                 "SSE connection terminated.",
                 extra={"trace_id": current_trace_id},
             )
-            self.active_tasks[current_trace_id].cancel()
+            # A resumable chat goes on for the client to reconnect
+            if task is not None and not self.message_bus.is_resumable:
+                task.cancel()
             raise
+        finally:
+            self.message_bus.unsubscribe(redis_key)
 
     async def start_web_service(
         self, first_query=None, welcome_message=None, host=None, port=None
@@ -815,7 +981,8 @@ class MAS(BaseModel):
         import importlib.resources
 
         import uvicorn
-        from fastapi import FastAPI, Request
+        from fastapi import FastAPI, HTTPException, Request
+        from fastapi.responses import JSONResponse
         from fastapi.staticfiles import StaticFiles
         from sse_starlette.sse import EventSourceResponse
 
@@ -906,7 +1073,7 @@ class MAS(BaseModel):
                 }
             ).to_dict()
 
-        async def request_to_payload(request: Request):
+        async def request_to_payload(request: Request, is_new_trace: bool = True):
             if request.method == "GET":
                 params = dict(request.query_params)
                 payload = dict()
@@ -919,6 +1086,9 @@ class MAS(BaseModel):
                         ).to_dict()
             elif request.method == "POST":
                 payload = await request.json()
+            # Sample the stacks of this trace only, see /profile
+            if request.query_params.get("profile", "").lower() in ("1", "true"):
+                payload["profile"] = True
 
             if "query" not in payload:
                 payload["query"] = ""
@@ -953,8 +1123,31 @@ class MAS(BaseModel):
                     payload.get("query", ""), attachments_with_path
                 )
 
-            if "current_trace_id" not in payload:
+            # Nodes of this request join the trace of a remote caller
+            traceparent = request.headers.get("traceparent")
+            if traceparent:
+                payload["trace_parent"] = traceparent
+
+            if is_new_trace and "current_trace_id" not in payload:
                 payload["current_trace_id"] = shortuuid.ShortUUID().random(length=16)
+            # Web users are served before batch jobs when slots are contended
+            payload.setdefault("priority", "interactive")
+            # The deadline covers every nested call of the request
+            request_timeout = payload.pop(
+                "request_timeout", Config.get_server_request_timeout()
+            )
+            if request_timeout and "deadline" not in payload:
+                try:
+                    request_timeout = float(request_timeout)
+                except (TypeError, ValueError):
+                    request_timeout = None
+                if request_timeout is None or not 0 < request_timeout < float("inf"):
+                    raise HTTPException(
+                        status_code=400,
+                        detail="request_timeout must be a positive number of seconds",
+                    )
+                # Wall-clock, like a deadline sent by the client in the payload
+                payload["deadline"] = time.time() + request_timeout
 
             return payload
 
@@ -966,14 +1159,42 @@ class MAS(BaseModel):
 
         @app.api_route("/sse/chat", methods=["GET", "POST"])
         async def sse_chat(request: Request):
-            payload = await request_to_payload(request)
-            current_trace_id = payload["current_trace_id"]
+            payload = await request_to_payload(request, is_new_trace=False)
+            # A reconnecting client resumes the messages of its trace
+            last_event_id = request.headers.get("last-event-id") or payload.get(
+                "last_event_id"
+            )
+            is_resume = bool(last_event_id) and self.message_bus.is_resumable
+            if is_resume and not payload.get("current_trace_id"):
+                return JSONResponse(
+                    WebResponse(
+                        code=400, message="current_trace_id is required to resume"
+                    ).to_dict(),
+                    status_code=400,
+                )
+            current_trace_id = payload.setdefault(
+                "current_trace_id", shortuuid.ShortUUID().random(length=16)
+            )
 
             logger.info(
                 "SSE connection established.",
                 extra={"trace_id": current_trace_id},
             )
             redis_key = f"{self.message_prefix}:{self.name}:{current_trace_id}"
+            if is_resume:
+                if not await self.message_bus.exists(redis_key):
+                    return JSONResponse(
+                        WebResponse(code=404, message="trace not found").to_dict(),
+                        status_code=404,
+                    )
+                return EventSourceResponse(
+                    self.event_stream(
+                        redis_key, current_trace_id, last_event_id=last_event_id
+                    )
+                )
+
+            # Subscribe first, so that no message of the chat is missed
+            self.message_bus.subscribe(redis_key)
             task = asyncio.create_task(
                 self.chat_with_agent(payload=payload, send_msg_key=redis_key)
             )
@@ -1015,42 +1236,70 @@ class MAS(BaseModel):
     # Batch helper
     # ------------------------------------------------------------------
 
-    async def start_batch_processing(self, querys, return_trace_id=False):
+    async def start_batch_processing(
+        self, querys, return_trace_id=False, concurrency=None
+    ):
         """Execute a batch of queries concurrently.
 
         Args:
             querys: Iterable of natural-language prompts.
             return_trace_id: If ``True`` the trace ID is returned together
                 with each answer - handy for offline audits.
+            concurrency: Queries running at the same time,
+                ``Config.get_batch_concurrency()`` by default.
 
         Returns:
-            list: Answers (or dicts with *output* + *trace_id*).
+            list: Answers (or dicts with *output* + *trace_id*), in the order
+            of *querys*. A failed query gives its error message.
         """
-        import time
-
-        cost_times = []
+        results = {}
 
-        async def handle_query(query):
-            start_time = time.time()
-            from_trace_id = ""
-            payload = {
-                "query": query,
-                "from_trace_id": from_trace_id,
-                "extra_arg": "value",
-            }
-            oxy_response = await self.chat_with_agent(payload=payload)
-            from_trace_id = oxy_response.oxy_request.current_trace_id
-            end_time = time.time()
-            cost_times.append(end_time - start_time)
+        def collect(record):
+            output = record.get("output", record.get("error"))
             if return_trace_id:
-                return {
-                    "output": oxy_response.output,
-                    "trace_id": oxy_response.oxy_request.current_trace_id,
-                }
-            else:
-                return oxy_response.output
+                output = {"output": output, "trace_id": record["trace_id"]}
+            results[int(record["id"])] = output
 
-        tasks = [asyncio.create_task(handle_query(query)) for query in querys]
-        results = await asyncio.gather(*tasks)
+        runner = BatchRunner(
+            self.chat_with_agent,
+            concurrency=concurrency or Config.get_batch_concurrency(),
+            is_resume=False,
+        )
+        await runner.run(({"query": query} for query in querys), on_result=collect)
         logger.info("done.")
-        return results
+        return [results[i] for i in range(len(results))]
+
+    async def run_batch(
+        self,
+        queries,
+        output_path,
+        concurrency=None,
+        is_resume=True,
+        **kwargs,
+    ) -> dict:
+        """Run a large batch, writing the results to a JSONL file.
+
+        Unlike :meth:`start_batch_processing`, results are not kept in
+        memory and a restarted run skips the queries already completed in
+        *output_path* (see :class:`~oxygent.batch_runner.BatchRunner`).
+
+        Args:
+            queries: List or (async) iterable of queries or payloads, or path
+                of a JSONL file of them.
+            output_path: JSONL file the results are appended to.
+            concurrency: Queries running at the same time,
+                ``Config.get_batch_concurrency()`` by default.
+            is_resume: Skip the queries completed in *output_path*.
+            **kwargs: ``id_key`` / ``query_key`` of the payloads.
+
+        Returns:
+            dict: Counts, throughput and latency percentiles of the run.
+        """
+        runner = BatchRunner(
+            self.chat_with_agent,
+            concurrency=concurrency or Config.get_batch_concurrency(),
+            output_path=output_path,
+            is_resume=is_resume,
+            **kwargs,
+        )
+        return await runner.run(queries)
@@ -0,0 +1,242 @@
+"""Transport of the messages sent to the frontend.
+
+``OxyRequest.send_message`` (tool calls, observations, LLM stream deltas
+...) ends in ``MAS.send_message``, and ``MAS.event_stream`` forwards the
+messages of a trace to its SSE client. A message bus carries them between
+the two:
+
+- :class:`InProcessMessageBus` hands the message objects over an
+  ``asyncio.Queue`` per subscribed key, without serialization or polling.
+  It serves producers and SSE clients living in the same process;
+- :class:`RedisMessageBus` MsgPack-encodes the messages into a Redis list,
+  for deployments where the SSE client may be served by another process.
+  It reads them with a blocking pop rather than by polling.
+- :class:`StreamMessageBus` appends them to a Redis stream. Messages are
+  not consumed by reading, so several observers (the UI, an audit logger)
+  can follow a trace, and a reconnecting SSE client resumes after the last
+  event ID it received.
+
+With ``Config.get_message_bus()`` set to ``auto``, the in-process bus is
+used unless a Redis server is configured.
+"""
+
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from typing import List, Optional, Tuple
+
+import msgpack
+
+from .config import Config
+from .utils.common_utils import msgpack_preprocess
+
+logger = logging.getLogger(__name__)
+
+MESSAGE_BUSES = ("auto", "memory", "redis", "stream")
+
+
+class BaseMessageBus(ABC):
+    """Publish messages under a key, and read those of a subscribed key."""
+
+    # Whether messages can be read again from an event ID
+    is_resumable = False
+
+    def subscribe(self, key: str):
+        """Start keeping the messages of ``key``, before they are read."""
+
+    def unsubscribe(self, key: str):
+        """Stop keeping the messages of ``key`` and drop those left."""
+
+    @abstractmethod
+    async def publish(self, key: str, message):
+        pass
+
+    @abstractmethod
+    async def get(self, key: str, timeout: float):
+        """Return the next message of ``key``, None after ``timeout`` seconds."""
+
+    async def read(
+        self, key: str, last_event_id: Optional[str], timeout: float
+    ) -> List[Tuple[Optional[str], object]]:
+        """Return the next messages of ``key`` with their event IDs.
+
+        Buses that are not resumable ignore ``last_event_id`` and return at
+        most a message, without an event ID. The list is empty after
+        ``timeout`` seconds.
+        """
+        message = await self.get(key, timeout)
+        return [] if message is None else [(None, message)]
+
+    async def exists(self, key: str) -> bool:
+        """Whether messages of ``key`` can still be read from an event ID.
+
+        Only resumable buses keep messages once they are read.
+        """
+        return False
+
+
+class InProcessMessageBus(BaseMessageBus):
+    """Message bus over in-process queues.
+
+    Messages of a key nobody subscribed to are dropped: in a single process
+    the SSE handler subscribes before starting the chat that produces them.
+    Messages are passed by reference and must not be changed once sent.
+    """
+
+    def __init__(self, max_size=10000):
+        """Create an empty bus.
+
+        Args:
+            max_size (int): Messages kept per key for a slow reader, the
+                oldest ones are dropped beyond it.
+        """
+        self.max_size = max_size
+        self.queues = {}
+        self.dropped = 0
+
+    def subscribe(self, key: str):
+        if key not in self.queues:
+            self.queues[key] = asyncio.Queue()
+
+    def unsubscribe(self, key: str):
+        self.queues.pop(key, None)
+
+    async def publish(self, key: str, message):
+        queue = self.queues.get(key)
+        if queue is None:
+            return
+        if queue.qsize() >= self.max_size:
+            queue.get_nowait()
+            self.dropped += 1
+        queue.put_nowait(message)
+
+    async def get(self, key: str, timeout: float):
+        queue = self.queues.get(key)
+        if queue is None:
+            self.subscribe(key)
+            queue = self.queues[key]
+        try:
+            return await asyncio.wait_for(queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class RedisMessageBus(BaseMessageBus):
+    """Message bus over Redis lists, shared by every process of the app."""
+
+    def __init__(self, redis_client):
+        """Create a bus on ``redis_client``.
+
+        Args:
+            redis_client: A ``BaseRedis`` client with ``lpush`` / ``brpop``.
+        """
+        self.redis_client = redis_client
+
+    async def publish(self, key: str, message):
+        bytes_msg = msgpack.packb(msgpack_preprocess(message))
+        await self.redis_client.lpush(key, bytes_msg)
+
+    async def get(self, key: str, timeout: float):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return None
+            bytes_msg = await self.redis_client.brpop(key, timeout=remaining)
+            if bytes_msg is not None:
+                return msgpack.unpackb(bytes_msg)
+
+
+class StreamMessageBus(BaseMessageBus):
+    """Message bus over Redis streams, readable from any event ID.
+
+    Each reader keeps its own position, the ID of the last entry it read.
+    Streams are trimmed to about ``max_len`` entries and expire with the
+    other Redis keys.
+    """
+
+    is_resumable = True
+
+    def __init__(self, redis_client, max_len=None, batch_size=100):
+        """Create a bus on ``redis_client``.
+
+        Args:
+            redis_client: A Redis client with ``xadd`` / ``xread``.
+            max_len (int): Entries kept per stream,
+                ``Config.get_redis_max_size()`` by default.
+            batch_size (int): Maximum entries returned by a read.
+        """
+        self.redis_client = redis_client
+        self.max_len = max_len
+        self.batch_size = batch_size
+        # key -> last event ID read by get()
+        self.positions = {}
+
+    def subscribe(self, key: str):
+        self.positions.setdefault(key, "0")
+
+    def unsubscribe(self, key: str):
+        self.positions.pop(key, None)
+
+    async def publish(self, key: str, message):
+        bytes_msg = msgpack.packb(msgpack_preprocess(message))
+        return await self.redis_client.xadd(key, bytes_msg, maxlen=self.max_len)
+
+    async def _xread(self, key: str, last_id: str, count: int, timeout: float):
+        entries = await self.redis_client.xread(
+            key, last_id, count=count, timeout=timeout
+        )
+        if entries is None:
+            # The client logged an error it could not retry, wait as if no
+            # entry came rather than spinning on a failing server
+            await asyncio.sleep(timeout or 0)
+            return []
+        return entries
+
+    async def get(self, key: str, timeout: float):
+        entries = await self._xread(key, self.positions.get(key, "0"), 1, timeout)
+        if not entries:
+            return None
+        entry_id, bytes_msg = entries[0]
+        self.positions[key] = entry_id
+        return msgpack.unpackb(bytes_msg)
+
+    async def read(self, key: str, last_event_id: Optional[str], timeout: float):
+        """Return the messages of ``key`` after ``last_event_id``.
+
+        Without ``last_event_id`` the stream is read from its start, so no
+        message sent before the reader arrived is missed.
+        """
+        entries = await self._xread(
+            key, last_event_id or "0", self.batch_size, timeout
+        )
+        return [
+            (entry_id, msgpack.unpackb(bytes_msg)) for entry_id, bytes_msg in entries
+        ]
+
+    async def exists(self, key: str) -> bool:
+        return bool(await self.redis_client.exists(key))
+
+
+def create_message_bus(redis_client, bus: str = None) -> BaseMessageBus:
+    """Return the message bus of a MAS.
+
+    Args:
+        redis_client: The Redis client of the MAS.
+        bus (str): "memory", "redis" (lists), "stream" (Redis streams), or
+            "auto" for the in-process bus unless a Redis server is configured.
+            ``Config.get_message_bus()`` by default.
+    """
+    bus = bus or Config.get_message_bus()
+    if bus not in MESSAGE_BUSES:
+        raise ValueError(
+            f"Unknown message bus {bus}, expected one of {list(MESSAGE_BUSES)}"
+        )
+    if bus == "auto":
+        bus = "redis" if Config.get_redis_config() else "memory"
+    if bus == "redis":
+        return RedisMessageBus(redis_client)
+    if bus == "stream":
+        return StreamMessageBus(redis_client)
+    return InProcessMessageBus()
@@ -0,0 +1,283 @@
+"""In-process metrics in the Prometheus text format.
+
+The module-level :data:`registry` is served by the ``/metrics`` route. It
+holds three kinds of metrics:
+
+- :class:`Counter`: monotonically increasing values per label set;
+- :class:`Histogram`: observations counted in pre-computed buckets;
+- :class:`Gauge`: values set directly, or read from a callback at scrape
+  time (in-flight calls, queue depths ...).
+
+Recording is a dict lookup and an integer increment on the event loop
+thread, so there is no lock to take on the hot path.
+"""
+
+from bisect import bisect_left
+
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    120.0,
+)
+
+
+def _format_labels(labelnames, labels, extra=()) -> str:
+    pairs = list(zip(labelnames, labels)) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (
+        (k, str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"'))
+        for k, v in pairs
+    )
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+
+def _format_value(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def render(self) -> list:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type}",
+        ]
+        lines.extend(self._render_samples())
+        return lines
+
+    def _render_samples(self) -> list:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self.values = {}
+
+    def inc(self, *labels, amount=1):
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def get(self, *labels):
+        return self.values.get(labels, 0)
+
+    def _render_samples(self):
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(v)}"
+            for labels, v in self.values.items()
+        ]
+
+
+class Gauge(_Metric):
+    """Gauge set directly, or read from ``callback`` at scrape time.
+
+    The callback returns a number, or a dict from label tuples to numbers.
+    """
+
+    type = "gauge"
+
+    def __init__(self, name, documentation, labelnames=(), callback=None):
+        super().__init__(name, documentation, labelnames)
+        self.values = {}
+        self.callback = callback
+
+    def set(self, value, *labels):
+        self.values[labels] = value
+
+    def collect(self) -> dict:
+        if self.callback is None:
+            return self.values
+        values = self.callback()
+        return values if isinstance(values, dict) else {(): values}
+
+    def _render_samples(self):
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(v)}"
+            for labels, v in self.collect().items()
+        ]
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [count per bucket (last one is +Inf), sum, count]
+        self.values = {}
+
+    def observe(self, value, *labels):
+        entry = self.values.get(labels)
+        if entry is None:
+            entry = self.values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        entry[0][bisect_left(self.buckets, value)] += 1
+        entry[1] += value
+        entry[2] += 1
+
+    def get_count(self, *labels):
+        entry = self.values.get(labels)
+        return entry[2] if entry else 0
+
+    def _render_samples(self):
+        lines = []
+        for labels, (counts, total, count) in self.values.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                label_str = _format_labels(
+                    self.labelnames, labels, [("le", _format_value(bound))]
+                )
+                lines.append(f"{self.name}_bucket{label_str} {cumulative}")
+            label_str = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_str} {_format_value(total)}")
+            lines.append(f"{self.name}_count{label_str} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named metrics, created once and rendered together.
+
+    Example:
+        >>> calls = registry.counter("calls_total", "Calls.", ["oxy"])
+        >>> calls.inc("search")
+        >>> text = registry.render()
+    """
+
+    def __init__(self):
+        self.metrics = {}
+
+    def _get_or_create(self, cls, name, *args, **kwargs):
+        metric = self.metrics.get(name)
+        if metric is None:
+            metric = self.metrics[name] = cls(name, *args, **kwargs)
+        elif not isinstance(metric, cls):
+            raise ValueError(f"Metric {name} is already a {metric.type}")
+        return metric
+
+    def counter(self, name, documentation, labelnames=()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def histogram(
+        self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._get_or_create(
+            Histogram, name, documentation, labelnames, buckets=buckets
+        )
+
+    def gauge(self, name, documentation, labelnames=(), callback=None) -> Gauge:
+        """Return the gauge ``name``; a given ``callback`` replaces the old one."""
+        metric = self._get_or_create(Gauge, name, documentation, labelnames)
+        if callback is not None:
+            metric.callback = callback
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in list(self.metrics.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+oxy_calls = registry.counter(
+    "oxygent_oxy_calls_total", "Oxy calls by final state.", ["oxy", "state"]
+)
+oxy_call_duration = registry.histogram(
+    "oxygent_oxy_call_duration_seconds",
+    "Oxy call latency, queue wait included.",
+    ["oxy"],
+)
+oxy_retries = registry.counter(
+    "oxygent_oxy_retries_total", "Attempts of Oxy calls beyond the first.", ["oxy"]
+)
+db_client_duration = registry.histogram(
+    "oxygent_db_client_duration_seconds",
+    "Latency of ES / Redis / vector DB client methods.",
+    ["client", "method"],
+)
+db_client_errors = registry.counter(
+    "oxygent_db_client_errors_total",
+    "DB client calls that failed after their retries.",
+    ["client", "method"],
+)
+
+event_loop_lag = registry.histogram(
+    "oxygent_event_loop_lag_seconds",
+    "Delay of the event loop in running a scheduled callback.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+event_loop_last_lag = registry.gauge(
+    "oxygent_event_loop_last_lag_seconds", "Last measured event loop lag."
+)
+event_loop_blocks = registry.counter(
+    "oxygent_event_loop_blocks_total",
+    "Synchronous calls that blocked the event loop, by Oxy being served.",
+    ["oxy"],
+)
+
+semantic_cache_lookups = registry.counter(
+    "oxygent_semantic_cache_lookups_total",
+    "Semantic cache lookups by result (hit or miss).",
+    ["oxy", "result"],
+)
+semantic_cache_saved_seconds = registry.counter(
+    "oxygent_semantic_cache_saved_seconds_total",
+    "Latency of the original calls answered again by semantic cache hits.",
+    ["oxy"],
+)
+
+llm_endpoint_requests = registry.counter(
+    "oxygent_llm_endpoint_requests_total",
+    "Calls of RouterLLM endpoints by result (ok or error).",
+    ["oxy", "endpoint", "result"],
+)
+llm_endpoint_duration = registry.histogram(
+    "oxygent_llm_endpoint_duration_seconds",
+    "Latency of successful calls of RouterLLM endpoints.",
+    ["oxy", "endpoint"],
+)
+llm_endpoint_outstanding = registry.gauge(
+    "oxygent_llm_endpoint_outstanding",
+    "Calls in flight on RouterLLM endpoints.",
+    ["oxy", "endpoint"],
+)
+llm_endpoint_ejections = registry.counter(
+    "oxygent_llm_endpoint_ejections_total",
+    "RouterLLM endpoints ejected after failures.",
+    ["oxy", "endpoint"],
+)
+
+llm_hedges = registry.counter(
+    "oxygent_llm_hedges_total",
+    "Hedged LLM calls, by whether the hedge or the original call won.",
+    ["oxy", "result"],
+)
+
+
+def observe_oxy_call(oxy_name: str, state: str, seconds: float, retries: int):
+    oxy_calls.inc(oxy_name, state)
+    oxy_call_duration.observe(seconds, oxy_name)
+    if retries:
+        oxy_retries.inc(oxy_name, amount=retries)
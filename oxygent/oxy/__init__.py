@@ -15,7 +15,7 @@ from .flows import (
 )
 from .function_tools.function_hub import FunctionHub
 from .function_tools.function_tool import FunctionTool
-from .llms import HttpLLM, OpenAILLM
+from .llms import HttpLLM, OpenAILLM, RouterLLM
 from .mcp_tools import MCPTool, SSEMCPClient, StdioMCPClient, StreamableMCPClient
 
 __all__ = [
@@ -28,6 +28,7 @@ __all__ = [
     "HttpTool",
     "HttpLLM",
     "OpenAILLM",
+    "RouterLLM",
     "MCPTool",
     "StdioMCPClient",
     "StreamableMCPClient",
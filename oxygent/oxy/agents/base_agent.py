@@ -88,10 +88,10 @@ class BaseAgent(BaseFlow):
         if oxy_request.caller_category == "user":
             if self.mas and self.mas.es_client:
                 # Store the current conversation trace record
-                await self.mas.es_client.index(
+                await self._save_doc(
                     Config.get_app_name() + "_trace",
-                    doc_id=oxy_request.current_trace_id,
-                    body={
+                    oxy_request.current_trace_id,
+                    {
                         "request_id": oxy_request.request_id,
                         "trace_id": oxy_request.current_trace_id,
                         "group_id": oxy_request.group_id,
@@ -122,10 +122,10 @@ class BaseAgent(BaseFlow):
         if oxy_request.caller_category == "user":
             # Update trace record with the response output
             if self.mas and self.mas.es_client:
-                await self.mas.es_client.index(
+                await self._save_doc(
                     Config.get_app_name() + "_trace",
-                    doc_id=oxy_request.current_trace_id,
-                    body={
+                    oxy_request.current_trace_id,
+                    {
                         "request_id": oxy_request.request_id,
                         "trace_id": oxy_request.current_trace_id,
                         "group_id": oxy_request.group_id,
@@ -156,10 +156,10 @@ class BaseAgent(BaseFlow):
                 history.update(oxy_response.extra)
 
                 # Store the conversation history record
-                await self.mas.es_client.index(
+                await self._save_doc(
                     Config.get_app_name() + "_history",
-                    doc_id=current_sub_session_id,
-                    body={
+                    current_sub_session_id,
+                    {
                         "sub_session_id": current_sub_session_id,
                         "session_name": oxy_request.session_name,
                         "trace_id": oxy_request.current_trace_id,
@@ -44,12 +44,14 @@ class ChatAgent(LocalAgent):
         # Add the current user query to continue the multi-turn conversation
         temp_memory.add_message(Message.user_message(oxy_request.get_query()))
 
+        messages = temp_memory.to_dict_list(short_memory_size=self.short_memory_size)
+        # Fit instruction + short memory + query into the token budget
+        packed_messages = self._pack_messages(
+            system=messages[:1], short_memory=messages[1:-1], query=messages[-1:]
+        )
+
         # Prepare arguments for the language model call
-        arguments = {
-            "messages": temp_memory.to_dict_list(
-                short_memory_size=self.short_memory_size
-            )
-        }
+        arguments = {"messages": packed_messages or messages}
         llm_params = oxy_request.arguments.get("llm_params", dict())
         arguments.update(llm_params)
 
@@ -16,6 +16,7 @@ from pydantic import Field
 
 from ...config import Config
 from ...schemas import Memory, Message, OxyRequest, OxyResponse
+from ...tokenizer import TokenCounter, default_token_counter, pack_messages
 from ...utils.common_utils import process_attachments
 from ..base_tool import BaseTool
 from ..function_tools.function_hub import FunctionHub
@@ -49,6 +50,7 @@ class LocalAgent(BaseAgent):
         team_size (int): Number of parallel instances for team execution.
         is_retain_master_short_memory (bool): Whether to retain user history.
         is_multimodal_supported (bool): Whether to support multimodal input.
+        max_prompt_tokens (int): Token budget of the messages sent to the LLM.
         team_size (int): Number of parallel instances for m execution.
     """
 
@@ -107,6 +109,12 @@ class LocalAgent(BaseAgent):
         False, description="Whether support for multimodal input"
     )
 
+    max_prompt_tokens: int = Field(
+        0,
+        description="Token budget of the messages sent to the LLM, "
+        "0 to use the context window of the LLM",
+    )
+
     team_size: int = Field(1, description="Number of instances for team execution")
 
     def __init__(self, **kwargs):
@@ -323,6 +331,41 @@ class LocalAgent(BaseAgent):
                     llm_tool_desc_list.append(oxy_response.output)
         return llm_tool_desc_list
 
+    def _get_llm(self):
+        return self.mas.oxy_name_to_oxy.get(self.llm_model) if self.mas else None
+
+    def _get_token_counter(self) -> TokenCounter:
+        """Return the token counter of the LLM, or an approximate one."""
+        llm = self._get_llm()
+        if hasattr(llm, "get_token_counter"):
+            return llm.get_token_counter()
+        return default_token_counter
+
+    def _get_prompt_budget(self) -> int:
+        if self.max_prompt_tokens:
+            return self.max_prompt_tokens
+        llm = self._get_llm()
+        return llm.get_prompt_budget() if hasattr(llm, "get_prompt_budget") else 0
+
+    def _pack_messages(
+        self, system: list, short_memory: list, query: list, react_memory=()
+    ) -> Optional[list]:
+        """Fit the prompt into the token budget, None when there is no budget.
+
+        See :func:`~tokenizer.pack_messages` for what is kept.
+        """
+        budget = self._get_prompt_budget()
+        if not budget:
+            return None
+        return pack_messages(
+            self._get_token_counter(),
+            budget,
+            system=system,
+            short_memory=short_memory,
+            query=query,
+            react_memory=react_memory,
+        )
+
     def _build_instruction(self, arguments) -> str:
         """Build instruction prompt by substituting template variables.
 
@@ -56,7 +56,8 @@ class ReActAgent(LocalAgent):
     Attributes:
         max_react_rounds (int): Maximum number of reasoning-acting iterations.
         is_discard_react_memory (bool): Whether to discard detailed ReAct memory.
-        memory_max_tokens (int): Maximum tokens for memory management.
+        memory_max_tokens (int): Maximum tokens of the history kept when
+            ReAct memory is retained, counted by the tokenizer of the LLM.
         trust_mode (bool): Whether to enable trust mode for direct tool results.
 
     TODO:
@@ -201,12 +202,13 @@ class ReActAgent(LocalAgent):
                 ]
 
                 # Apply token-based filtering to stay within limits
+                counter = self._get_token_counter()
                 count_token = 0
                 retained_index = set()
                 for index in sorted_scores:
                     q, a, short_i, memory_type = qa_list[index]
-                    count_token += len(q)
-                    count_token += len(a)
+                    count_token += counter.count(q)
+                    count_token += counter.count(a)
                     if count_token > self.memory_max_tokens:
                         break
                     retained_index.add(index)
@@ -332,9 +334,8 @@ class ReActAgent(LocalAgent):
             temp_memory.add_message(
                 Message.system_message(self._build_instruction(oxy_request.arguments))
             )
-            temp_memory.add_messages(
-                Message.dict_list_to_messages(oxy_request.get_short_memory())
-            )
+            short_memory = Message.dict_list_to_messages(oxy_request.get_short_memory())
+            temp_memory.add_messages(short_memory)
             raw_query = oxy_request.arguments.get("query", "")
             if self.is_multimodal_supported and isinstance(raw_query, list):
                 user_query_content = raw_query
@@ -344,7 +345,17 @@ class ReActAgent(LocalAgent):
             temp_memory.add_message(Message.user_message(user_query_content))
             temp_memory.add_messages(react_memory.messages)
 
-            full_memory = temp_memory.to_dict_list()
+            # Fit them into the token budget, or keep the most recent messages
+            messages = [message.to_dict() for message in temp_memory.messages]
+            query_index = len(short_memory) + 1
+            full_memory = self._pack_messages(
+                system=messages[:1],
+                short_memory=messages[1:query_index],
+                query=messages[query_index : query_index + 1],
+                react_memory=messages[query_index + 1 :],
+            )
+            if full_memory is None:
+                full_memory = temp_memory.to_dict_list()
             oxy_response = await oxy_request.call(
                 callee=self.llm_model,
                 arguments={"messages": full_memory},
@@ -6,6 +6,7 @@ import httpx
 from pydantic import Field
 
 from ...schemas import OxyRequest, OxyResponse, OxyState
+from ...tracing import get_traceparent
 from ...utils.common_utils import build_url
 from .remote_agent import RemoteAgent
 
@@ -33,7 +34,7 @@ class SSEOxyGent(RemoteAgent):
             },
         )
         payload = oxy_request.model_dump(
-            exclude={"mas", "parallel_id", "latest_node_ids"}
+            exclude={"mas", "parallel_id", "latest_node_ids", "trace_parent"}
         )
         payload.update(payload["arguments"])
         payload["caller_category"] = "user"
@@ -52,6 +53,8 @@ class SSEOxyGent(RemoteAgent):
         headers = {
             "Accept": "text/event-stream",
             "Content-Type": "application/json",
+            # The remote MAS continues the trace of this node
+            "traceparent": get_traceparent(oxy_request),
         }
         async with aiohttp.ClientSession() as session:
             async with session.post(
@@ -6,11 +6,14 @@ handling, logging, and data persistence patterns.
 """
 
 import asyncio
+import copy
 import inspect
 import json
 import logging
+import time
 import traceback
 from abc import ABC, abstractmethod
+from contextlib import nullcontext
 from typing import Any, Callable, Optional
 
 import shortuuid
@@ -18,12 +21,33 @@ from pydantic import BaseModel, Field
 
 # from ..mas import MAS
 from ..config import Config
+from ..metrics import observe_oxy_call
+from ..persistence_queue import PersistenceQueue
+from ..profiling import watch_current_task
 from ..schemas import OxyRequest, OxyResponse, OxyState
-from ..utils.common_utils import filter_json_types, get_format_time, get_md5, to_json
+from ..tracing import BatchSpanProcessor, build_span
+from ..utils.common_utils import filter_json_types, get_format_time, to_json
+from ..utils.fingerprint_utils import get_arguments_fingerprint, get_fingerprint
+from .limiters import BaseLimiter, create_limiter
 
 logger = logging.getLogger(__name__)
 
 
+def _add_timing(timings: dict, phase: str, start: float) -> float:
+    """Add the milliseconds elapsed since ``start`` to a phase, return now."""
+    now = time.perf_counter()
+    timings[phase] = round(timings.get(phase, 0) + (now - start) * 1000, 3)
+    return now
+
+
+def _set_total_timing(timings: dict, lifecycle_start: float):
+    """Set the milliseconds from the queue up to now as the total."""
+    timings["total"] = round(
+        timings.get("queue_wait", 0) + (time.perf_counter() - lifecycle_start) * 1000,
+        3,
+    )
+
+
 def ensure_async(func: Callable) -> Callable:
     """
     Ensure a function is async. If it's sync, wrap it to make it async.
@@ -51,6 +75,50 @@ async def default_async_identity(x):
     return x
 
 
+class ExecutionPipeline:
+    """Lifecycle steps of :meth:`Oxy.execute` that do real work for one Oxy.
+
+    Each flag tells ``execute`` whether a stage has to be awaited. A stage is
+    skipped when its hook is not overridden and its ``func_*`` is the default
+    identity, or when it is disabled by flags such as ``is_send_tool_call``
+    or ``is_save_data``.
+    """
+
+    __slots__ = (
+        "is_process_input",
+        "is_save_data",
+        "is_format_input",
+        "is_pre_send_message",
+        "is_before_execute",
+        "is_after_execute",
+        "is_post_process",
+        "is_format_output",
+        "is_post_send_message",
+    )
+
+    def __init__(self, **steps):
+        for step in self.__slots__:
+            setattr(self, step, steps.get(step, True))
+
+    def __repr__(self):
+        steps = [step for step in self.__slots__ if getattr(self, step)]
+        return f"{self.__class__.__name__}({', '.join(steps)})"
+
+
+# Fields that decide which lifecycle steps are compiled into the pipeline
+PIPELINE_FIELDS = {
+    "func_process_input",
+    "func_process_output",
+    "func_format_input",
+    "func_format_output",
+    "is_save_data",
+    "is_send_tool_call",
+    "is_send_observation",
+    "is_send_answer",
+    "friendly_error_text",
+}
+
+
 class Oxy(BaseModel, ABC):
     """Abstract base class for all agents and tools in the OxyGent system.
 
@@ -65,6 +133,8 @@ class Oxy(BaseModel, ABC):
         category (str): Category classification (tool, agent, etc.).
         is_permission_required (bool): Whether permission is needed for execution.
         semaphore (int): Maximum number of concurrent executions.
+        limiter_strategy (str): How the concurrency limit is managed. "static"
+            keeps it at ``semaphore``, "aimd" and "gradient" adapt it.
         timeout (float): Execution timeout in seconds.
         retries (int): Number of retry attempts on failure.
     """
@@ -141,19 +211,96 @@ class Oxy(BaseModel, ABC):
 
     mas: Optional[Any] = Field(None, exclude=True, description="MAS instance reference")
 
+    semantic_cache: Optional[Any] = Field(
+        None,
+        exclude=True,
+        description="SemanticCache answering paraphrases of previous queries",
+    )
+    semantic_cache_context: str = Field(
+        "",
+        description="Version of the semantic cache context, change it to stop "
+        "reusing answers, e.g. after a tool or prompt update",
+    )
+
     friendly_error_text: Optional[str] = Field(
         None, description="User-friendly error message"
     )
     semaphore: int = Field(16, description="Concurrency limit")
+    limiter_strategy: str = Field(
+        "static",
+        description="Concurrency limiter: static, aimd or gradient. "
+        "Adaptive ones start from semaphore",
+    )
+    limiter_params: dict = Field(
+        default_factory=dict, description="Keyword arguments of the limiter"
+    )
+    is_single_flight: bool = Field(
+        False,
+        description="Whether identical concurrent calls share one execution",
+    )
     timeout: float = Field(3600, description="Timeout in seconds.")
     retries: int = Field(2)
     delay: float = Field(1.0)
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self._semaphore: asyncio.Semaphore = asyncio.Semaphore(self.semaphore)
+        self._limiter: BaseLimiter = create_limiter(
+            self.limiter_strategy, self.semaphore, **self.limiter_params
+        )
+        # Semaphore of the static limiter, None for adaptive ones
+        self._semaphore: Optional[asyncio.Semaphore] = getattr(
+            self._limiter, "semaphore", None
+        )
+        # Fingerprint of arguments -> future of the leader's response
+        self._in_flight: dict = {}
         self._ensure_async_functions()
         self._set_desc_for_llm()
+        self.compile_pipeline()
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name in PIPELINE_FIELDS:
+            self.compile_pipeline()
+
+    def get_concurrency_stats(self) -> dict:
+        """Return the limit, in-flight calls and queue depth of this Oxy."""
+        return self._limiter.stats()
+
+    def _is_overridden(self, method_name: str) -> bool:
+        """Whether a subclass overrides a lifecycle hook of :class:`Oxy`."""
+        return getattr(type(self), method_name) is not getattr(Oxy, method_name)
+
+    def compile_pipeline(self):
+        """Compile the minimal list of lifecycle steps run by :meth:`execute`.
+
+        Called on construction, in :meth:`init` and whenever a field in
+        ``PIPELINE_FIELDS`` is reassigned, so every call reuses the result.
+        """
+
+        def is_custom(func_name):
+            return getattr(self, func_name, None) is not default_async_identity
+
+        overridden = self._is_overridden
+        self._pipeline = ExecutionPipeline(
+            is_process_input=is_custom("func_process_input"),
+            is_save_data=self.is_save_data
+            or overridden("_pre_save_data")
+            or overridden("_post_save_data"),
+            is_format_input=overridden("_format_input")
+            or is_custom("func_format_input"),
+            is_pre_send_message=overridden("_pre_send_message")
+            or self.is_send_tool_call,
+            is_before_execute=overridden("_before_execute"),
+            is_after_execute=overridden("_after_execute"),
+            is_post_process=overridden("_post_process")
+            or is_custom("func_process_output"),
+            is_format_output=overridden("_format_output")
+            or is_custom("func_format_output")
+            or bool(self.friendly_error_text),
+            is_post_send_message=overridden("_post_send_message")
+            or self.is_send_observation
+            or self.is_send_answer,
+        )
 
     def _ensure_async_functions(self):
         """Ensure all function fields are async. Convert sync functions to async if needed."""
@@ -215,6 +362,10 @@ class Oxy(BaseModel, ABC):
             """
 
     async def init(self):
+        self.compile_pipeline()
+
+    async def cleanup(self):
+        """Release the resources held by this Oxy, called on MAS shutdown."""
         pass
 
     async def _pre_process(self, oxy_request: OxyRequest) -> OxyRequest:
@@ -227,11 +378,14 @@ class Oxy(BaseModel, ABC):
         oxy_request.call_stack.append(self.name)
         oxy_request.node_id_stack.append(oxy_request.node_id)
         # Handle input
-        oxy_request = await self.func_process_input(oxy_request)
+        if self._pipeline.is_process_input:
+            oxy_request = await self.func_process_input(oxy_request)
         return oxy_request
 
     async def _pre_log(self, oxy_request: OxyRequest):
         """Log the tool call information."""
+        if not logger.isEnabledFor(logging.INFO):
+            return
         query = (
             oxy_request.arguments.get("query", "...")
             if self.is_detailed_tool_call
@@ -280,7 +434,11 @@ class Oxy(BaseModel, ABC):
                                             "trace_id": oxy_request.reference_trace_id
                                         }
                                     },
-                                    {"term": {"input_md5": oxy_request.input_md5}},
+                                    {
+                                        "term": {
+                                            "input_md5": oxy_request.get_input_md5()
+                                        }
+                                    },
                                 ]
                             }
                         },
@@ -380,14 +538,30 @@ class Oxy(BaseModel, ABC):
                     for k, v in oxy_request.shared_data.items()
                     if k in shared_data_schema
                 }
-            await self.mas.es_client.index(
-                Config.get_app_name() + "_node",
-                doc_id=oxy_request.node_id,
-                body=save_body,
+            await self._save_doc(
+                Config.get_app_name() + "_node", oxy_request.node_id, save_body
             )
         else:
             logger.warning(f"Node {oxy_request.callee} data unsaved.")
 
+    def _get_persistence_queue(self) -> Optional[PersistenceQueue]:
+        queue = getattr(self.mas, "persistence_queue", None)
+        return queue if isinstance(queue, PersistenceQueue) else None
+
+    def _get_span_processor(self) -> Optional[BatchSpanProcessor]:
+        processor = getattr(self.mas, "span_processor", None)
+        return processor if isinstance(processor, BatchSpanProcessor) else None
+
+    async def _save_doc(self, index_name, doc_id, body, is_update=False):
+        """Write an ES record through the MAS persistence queue if it has one."""
+        queue = self._get_persistence_queue()
+        if queue is not None:
+            await queue.put(index_name, doc_id, body, is_update=is_update)
+        elif is_update:
+            await self.mas.es_client.update(index_name, doc_id=doc_id, body=body)
+        else:
+            await self.mas.es_client.index(index_name, doc_id=doc_id, body=body)
+
     async def _format_input(self, oxy_request: OxyRequest) -> OxyRequest:
         """Format input arguments for execution."""
         return await self.func_format_input(oxy_request)
@@ -425,6 +599,35 @@ class Oxy(BaseModel, ABC):
     async def _execute(self, oxy_request: OxyRequest) -> OxyResponse:
         pass
 
+    async def _execute_once(self, oxy_request: OxyRequest) -> OxyResponse:
+        """Run one attempt of the call, through ``func_execute`` if it is set.
+
+        With a ``semantic_cache``, the answer to a similar previous query is
+        returned instead. Agent calls continuing a conversation
+        (``from_trace_id``) depend on history the query does not carry and
+        always run.
+        """
+        cache = self.semantic_cache
+        if cache is None or (
+            oxy_request.from_trace_id and "messages" not in oxy_request.arguments
+        ):
+            return await self._run_once(oxy_request)
+        text, context_key = cache.get_context_key(self, oxy_request)
+        oxy_response = await cache.lookup(text, context_key, self.name)
+        if oxy_response is not None:
+            return oxy_response
+        start = time.perf_counter()
+        oxy_response = await self._run_once(oxy_request)
+        await cache.add(
+            text, context_key, oxy_response, latency=time.perf_counter() - start
+        )
+        return oxy_response
+
+    async def _run_once(self, oxy_request: OxyRequest) -> OxyResponse:
+        if self.func_execute:
+            return await self.func_execute(oxy_request)
+        return await self._execute(oxy_request)
+
     async def _handle_exception(self, e):
         pass
 
@@ -436,6 +639,8 @@ class Oxy(BaseModel, ABC):
 
     async def _post_log(self, oxy_response: OxyResponse):
         """Log the execution result."""
+        if not logger.isEnabledFor(logging.INFO):
+            return
         obs = oxy_response.output if self.is_detailed_observation else "..."
         oxy_request = oxy_response.oxy_request
         logger.info(
@@ -461,10 +666,10 @@ class Oxy(BaseModel, ABC):
         callee_name = oxy_request.callee
         callee_cat = oxy_request.callee_category
         if self.mas and self.mas.es_client:
-            await self.mas.es_client.update(
+            await self._save_doc(
                 Config.get_app_name() + "_node",
-                doc_id=oxy_request.node_id,
-                body={
+                oxy_request.node_id,
+                {
                     "node_id": oxy_request.node_id,
                     "node_type": callee_cat,
                     "trace_id": oxy_request.current_trace_id,
@@ -473,12 +678,14 @@ class Oxy(BaseModel, ABC):
                     "caller": oxy_request.caller,
                     "callee": callee_name,
                     "input": to_json(oxy_input),
-                    "input_md5": oxy_request.input_md5,
+                    "input_md5": oxy_request.get_input_md5(),
                     "output": to_json(oxy_response.output),
                     "state": oxy_response.state.value,
                     "extra": to_json(oxy_response.extra),
+                    "timings": oxy_response.extra.get("timings", {}),
                     "update_time": get_format_time(),
                 },
+                is_update=True,
             )
         else:
             logger.warning(f"Node {oxy_request.callee} data unsaved.")
@@ -522,6 +729,159 @@ class Oxy(BaseModel, ABC):
                 }
             )
 
+    async def _intercept(self, oxy_request: OxyRequest) -> Optional[OxyResponse]:
+        """Return a skipped response if ``func_interceptor`` rejects the call."""
+        if self.func_interceptor:
+            error_message = await self.func_interceptor(oxy_request)
+            if error_message:
+                return OxyResponse(state=OxyState.SKIPPED, output=error_message)
+        return None
+
+    async def _execute_with_retries(
+        self, oxy_request: OxyRequest, timings: Optional[dict] = None
+    ) -> OxyResponse:
+        """Run the call, retrying failed attempts up to ``retries`` times.
+
+        ``timings`` receives the interceptor time and the duration of each
+        attempt in ``execute``.
+        """
+        timings = {} if timings is None else timings
+        attempts = timings.setdefault("execute", [])
+        attempt = 0
+        while attempt < self.retries:
+            attempt_start = time.perf_counter()
+            execute_start = attempt_start
+            try:
+                oxy_response = await self._intercept(oxy_request)
+                execute_start = _add_timing(timings, "interceptor", attempt_start)
+                if oxy_response is not None:
+                    break
+                oxy_response = await self._execute_once(oxy_request)
+                attempts.append(round((time.perf_counter() - execute_start) * 1000, 3))
+                break
+            except asyncio.CancelledError:
+                # if the task is cancelled, log and return a canceled response
+                logger.error(
+                    f"oxy {self.name} was cancelled---",
+                    extra={
+                        "trace_id": oxy_request.current_trace_id,
+                        "node_id": oxy_request.node_id,
+                    },
+                )
+                oxy_response = OxyResponse(
+                    state=OxyState.CANCELED,
+                    output=f"Tool {self.name} was cancelled",
+                )
+                oxy_response.oxy_request = oxy_request
+                asyncio.create_task(self._post_save_data(oxy_response))
+                raise
+            except Exception as e:
+                attempts.append(round((time.perf_counter() - execute_start) * 1000, 3))
+                # Handle exceptions and retry logic
+                await self._handle_exception(e)
+                attempt += 1
+                logger.warning(
+                    f"Error executing oxy {self.name}: {str(e)}. Attempt {attempt} of {self.retries}.",
+                    extra={
+                        "trace_id": oxy_request.current_trace_id,
+                        "node_id": oxy_request.node_id,
+                    },
+                )
+                logger.error(
+                    traceback.format_exc(),
+                    extra={
+                        "trace_id": oxy_request.current_trace_id,
+                        "node_id": oxy_request.node_id,
+                    },
+                )
+                # Another attempt is not worth it if the deadline cuts it short
+                remaining = oxy_request.get_remaining_time()
+                is_in_budget = remaining is None or remaining > self.delay + (
+                    time.perf_counter() - attempt_start
+                )
+                if attempt < self.retries and is_in_budget:
+                    await asyncio.sleep(self.delay)
+                else:
+                    if not is_in_budget:
+                        logger.warning(
+                            f"Skip retrying oxy {self.name}: {remaining:.2f}s left "
+                            "before the deadline.",
+                            extra={
+                                "trace_id": oxy_request.current_trace_id,
+                                "node_id": oxy_request.node_id,
+                            },
+                        )
+                    error_msg = traceback.format_exc()
+                    logger.error(
+                        f"Max retries reached. Failed. {error_msg}",
+                        extra={
+                            "trace_id": oxy_request.current_trace_id,
+                            "node_id": oxy_request.node_id,
+                        },
+                    )
+                    oxy_response = OxyResponse(
+                        state=OxyState.FAILED,
+                        output=f"Error executing oxy {self.name}: {str(e)}",
+                    )
+                    break
+        return oxy_response
+
+    async def _follow_flight(
+        self,
+        oxy_request: OxyRequest,
+        flight: asyncio.Future,
+        timings: Optional[dict] = None,
+    ) -> OxyResponse:
+        """Wait for the identical in-flight call led by another request.
+
+        The follower gets a copy of the leader's response and records the
+        leader's node in ``extra``. If the leader ended without a response
+        (cancelled or failed before executing), the follower runs the call
+        itself.
+        """
+        timings = {} if timings is None else timings
+        start = time.perf_counter()
+        oxy_response = await self._intercept(oxy_request)
+        start = _add_timing(timings, "interceptor", start)
+        if oxy_response is not None:
+            return oxy_response
+        leader_response = await asyncio.shield(flight)
+        if leader_response is None:
+            async with self._limiter.slot(oxy_request.priority) as slot:
+                oxy_response = await self._execute_with_retries(oxy_request, timings)
+                slot.is_dropped = oxy_response.state is OxyState.FAILED
+                return oxy_response
+        # The leader's execution, as seen from this node
+        timings["execute"] = [round((time.perf_counter() - start) * 1000, 3)]
+        extra = copy.deepcopy(leader_response.extra)
+        extra["single_flight"] = {
+            "leader_node_id": leader_response.oxy_request.node_id,
+            "leader_trace_id": leader_response.oxy_request.current_trace_id,
+        }
+        return OxyResponse(
+            state=leader_response.state,
+            output=copy.deepcopy(leader_response.output),
+            extra=extra,
+        )
+
+    def _get_flight_key(self, oxy_request: OxyRequest) -> str:
+        """Return the key under which identical concurrent calls are shared.
+
+        Besides the arguments, it covers the context a call may read: the
+        conversation it continues (``from_trace_id`` and session) and the
+        shared and group data, so calls from different conversations never
+        share an answer.
+        """
+        return get_fingerprint(
+            {
+                "arguments": get_arguments_fingerprint(oxy_request.arguments),
+                "from_trace_id": oxy_request.from_trace_id or "",
+                "session_name": oxy_request.session_name,
+                "shared_data": oxy_request.shared_data,
+                "group_data": oxy_request.group_data,
+            }
+        )
+
     async def execute(self, oxy_request: OxyRequest) -> OxyResponse:
         """Execute the complete lifecycle of an Oxy operation.
 
@@ -543,142 +903,171 @@ class Oxy(BaseModel, ABC):
         - Output formatting
         - Post-send message handling
         """
-        async with self._semaphore:
-            # Pre-process
-            oxy_request = await self._pre_process(oxy_request)
-            await self._pre_log(oxy_request)
-
-            key_to_md5 = {
-                k: v
-                for k, v in oxy_request.arguments.items()
-                if isinstance(v, (int, str, float, list, dict, tuple, set))
-            }
-            oxy_request.input_md5 = get_md5(to_json(key_to_md5))
-            result = await self._request_interceptor(oxy_request)
-            if isinstance(result, OxyResponse):
-                return result
-
-            event = asyncio.Event()
-            if self.mas:
-
-                def pre_done_callback(task):
-                    self.mas.background_tasks.discard(task)
-                    event.set()
-
-                pre_save_data_task = asyncio.create_task(
-                    self._pre_save_data(oxy_request)
+        watch_current_task(oxy_request.current_trace_id)
+        flight_key, leader_flight = None, None
+        if self.is_single_flight:
+            key = self._get_flight_key(oxy_request)
+            leader_flight = self._in_flight.get(key)
+            if leader_flight is None:
+                flight_key = key
+                self._in_flight[key] = asyncio.get_running_loop().create_future()
+        try:
+            # Followers wait for the leader instead of taking a slot
+            limiter = (
+                self._limiter.slot(oxy_request.priority)
+                if leader_flight is None
+                else nullcontext()
+            )
+            timings = {"start_time": time.time()}
+            wait_start = time.perf_counter()
+            async with limiter as slot:
+                _add_timing(timings, "queue_wait", wait_start)
+                oxy_response = await self._run_lifecycle(
+                    oxy_request, flight_key, leader_flight, timings
                 )
-
-                pre_save_data_task.add_done_callback(pre_done_callback)
-                self.mas.background_tasks.add(pre_save_data_task)
-            else:
-                logger.warning(
-                    "Temporary invocation without storing data.",
-                    extra={
-                        "trace_id": oxy_request.current_trace_id,
-                        "node_id": oxy_request.node_id,
-                    },
+                if slot is not None:
+                    slot.is_dropped = oxy_response.state is OxyState.FAILED
+                observe_oxy_call(
+                    self.name,
+                    oxy_response.state.name,
+                    time.perf_counter() - wait_start,
+                    max(0, len(timings.get("execute", [])) - 1),
                 )
+                span_processor = self._get_span_processor()
+                if span_processor is not None:
+                    span_processor.on_end(
+                        build_span(
+                            self,
+                            oxy_response.oxy_request or oxy_request,
+                            oxy_response,
+                            timings,
+                        )
+                    )
+                return oxy_response
+        finally:
+            if flight_key is not None:
+                flight = self._in_flight.pop(flight_key)
+                if not flight.done():
+                    flight.set_result(None)
+
+    async def _run_lifecycle(
+        self,
+        oxy_request: OxyRequest,
+        flight_key: Optional[str] = None,
+        leader_flight: Optional[asyncio.Future] = None,
+        timings: Optional[dict] = None,
+    ) -> OxyResponse:
+        """Run the lifecycle of :meth:`execute` for one request.
+
+        The milliseconds spent in each phase are added to ``timings``, which
+        ends up in ``extra["timings"]`` and in the node record.
+        """
+        pipeline = self._pipeline
+        timings = {} if timings is None else timings
+        lifecycle_start = mark = time.perf_counter()
+        # Pre-process
+        oxy_request = await self._pre_process(oxy_request)
+        await self._pre_log(oxy_request)
+
+        oxy_request.snapshot_input()
+        mark = _add_timing(timings, "pre_process", mark)
+        result = await self._request_interceptor(oxy_request)
+        mark = _add_timing(timings, "interceptor", mark)
+        if isinstance(result, OxyResponse):
+            return result
+
+        event = asyncio.Event()
+        persistence_queue = self._get_persistence_queue()
+        if not pipeline.is_save_data:
+            event.set()
+        elif persistence_queue is not None:
+            # Only enqueues, the record is coalesced with the post-save
+            await self._pre_save_data(oxy_request)
+            event.set()
+        elif self.mas:
+
+            def pre_done_callback(task):
+                self.mas.background_tasks.discard(task)
+                event.set()
+
+            pre_save_data_task = asyncio.create_task(self._pre_save_data(oxy_request))
+
+            pre_save_data_task.add_done_callback(pre_done_callback)
+            self.mas.background_tasks.add(pre_save_data_task)
+        else:
+            logger.warning(
+                "Temporary invocation without storing data.",
+                extra={
+                    "trace_id": oxy_request.current_trace_id,
+                    "node_id": oxy_request.node_id,
+                },
+            )
+        if pipeline.is_format_input:
             oxy_request = await self._format_input(oxy_request)
+        mark = _add_timing(timings, "pre_process", mark)
+        if pipeline.is_pre_send_message:
             await self._pre_send_message(oxy_request)
+        mark = _add_timing(timings, "send", mark)
 
+        if pipeline.is_before_execute:
             oxy_request = await self._before_execute(oxy_request)
+        _add_timing(timings, "pre_process", mark)
 
-            # Execute the request with retry logic
-            attempt = 0
-            while attempt < self.retries:
-                try:
-                    if self.func_interceptor:
-                        error_message = await self.func_interceptor(oxy_request)
-                        if error_message:
-                            oxy_response = OxyResponse(
-                                state=OxyState.SKIPPED,
-                                output=error_message,
-                            )
-                            break
-                    if self.func_execute:
-                        oxy_response = await self.func_execute(oxy_request)
-                    else:
-                        oxy_response = await self._execute(oxy_request)
-                    break
-                except asyncio.CancelledError:
-                    # if the task is cancelled, log and return a canceled response
-                    logger.error(
-                        f"oxy {self.name} was cancelled---",
-                        extra={
-                            "trace_id": oxy_request.current_trace_id,
-                            "node_id": oxy_request.node_id,
-                        },
-                    )
-                    oxy_response = OxyResponse(
-                        state=OxyState.CANCELED,
-                        output=f"Tool {self.name} was cancelled",
-                    )
-                    oxy_response.oxy_request = oxy_request
-                    asyncio.create_task(self._post_save_data(oxy_response))
-                    raise
-                except Exception as e:
-                    # Handle exceptions and retry logic
-                    await self._handle_exception(e)
-                    attempt += 1
-                    logger.warning(
-                        f"Error executing oxy {self.name}: {str(e)}. Attempt {attempt} of {self.retries}.",
-                        extra={
-                            "trace_id": oxy_request.current_trace_id,
-                            "node_id": oxy_request.node_id,
-                        },
-                    )
-                    logger.error(
-                        traceback.format_exc(),
-                        extra={
-                            "trace_id": oxy_request.current_trace_id,
-                            "node_id": oxy_request.node_id,
-                        },
-                    )
-                    if attempt < self.retries:
-                        await asyncio.sleep(self.delay)
-                    else:
-                        error_msg = traceback.format_exc()
-                        logger.error(
-                            f"Max retries reached. Failed. {error_msg}",
-                            extra={
-                                "trace_id": oxy_request.current_trace_id,
-                                "node_id": oxy_request.node_id,
-                            },
-                        )
-                        oxy_response = OxyResponse(
-                            state=OxyState.FAILED,
-                            output=f"Error executing oxy {self.name}: {str(e)}",
-                        )
-
-            oxy_response.oxy_request = oxy_request
+        # Execute the request with retry logic
+        if leader_flight is not None:
+            oxy_response = await self._follow_flight(
+                oxy_request, leader_flight, timings
+            )
+        else:
+            oxy_response = await self._execute_with_retries(oxy_request, timings)
+        mark = time.perf_counter()
+
+        oxy_response.oxy_request = oxy_request
+        if flight_key is not None:
+            # Release the followers before this node's own post-processing
+            self._in_flight[flight_key].set_result(oxy_response)
+        if pipeline.is_after_execute:
             oxy_response = await self._after_execute(oxy_response)
 
-            # Post-process
+        # Post-process
+        if pipeline.is_post_process:
             oxy_response = await self._post_process(oxy_response)
-            await self._post_log(oxy_response)
-
-            if self.mas:
-
-                async def _post_save_data_task(oxy_response):
-                    await event.wait()
-                    await self._post_save_data(oxy_response)
-
-                post_save_data_task = asyncio.create_task(
-                    _post_save_data_task(oxy_response)
-                )
-                post_save_data_task.add_done_callback(self.mas.background_tasks.discard)
-                self.mas.background_tasks.add(post_save_data_task)
-            else:
-                logger.warning(
-                    "Temporary invocation without storing data.",
-                    extra={
-                        "trace_id": oxy_request.current_trace_id,
-                        "node_id": oxy_request.node_id,
-                    },
-                )
+        await self._post_log(oxy_response)
+        mark = _add_timing(timings, "post_process", mark)
+
+        # Saved before the output is formatted for the caller, with the
+        # phases timed so far
+        oxy_response.extra["timings"] = timings
+        _set_total_timing(timings, lifecycle_start)
+        if pipeline.is_save_data and persistence_queue is not None:
+            await self._post_save_data(oxy_response)
+        elif pipeline.is_save_data and self.mas:
+
+            async def _post_save_data_task(oxy_response):
+                await event.wait()
+                await self._post_save_data(oxy_response)
+
+            post_save_data_task = asyncio.create_task(
+                _post_save_data_task(oxy_response)
+            )
+            post_save_data_task.add_done_callback(self.mas.background_tasks.discard)
+            self.mas.background_tasks.add(post_save_data_task)
+        elif pipeline.is_save_data:
+            logger.warning(
+                "Temporary invocation without storing data.",
+                extra={
+                    "trace_id": oxy_request.current_trace_id,
+                    "node_id": oxy_request.node_id,
+                },
+            )
 
+        if pipeline.is_format_output:
             oxy_response = await self._format_output(oxy_response)
+        mark = _add_timing(timings, "post_process", mark)
+        if pipeline.is_post_send_message:
             await self._post_send_message(oxy_response)
+        _add_timing(timings, "send", mark)
+        oxy_response.extra["timings"] = timings
+        _set_total_timing(timings, lifecycle_start)
 
-            return oxy_response
+        return oxy_response
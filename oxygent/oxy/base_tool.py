@@ -5,8 +5,11 @@ tools in the OxyGent system. Tools are specialized Oxy instances that typically
 permissions and have shorter timeout periods.
 """
 
+from typing import Optional
+
 from pydantic import Field
 
+from ..result_cache import ResultCache
 from ..schemas import OxyRequest, OxyResponse
 from .base_oxy import Oxy
 
@@ -19,6 +22,8 @@ class BaseTool(Oxy):
             this tool. Defaults to True for security.
         category (str): Tool category identifier. Always "tool".
         timeout (float): Execution timeout in seconds. Defaults to 60 seconds.
+        cache_ttl (float): Seconds a completed result is reused for identical
+            arguments. 0 disables the result cache.
     """
 
     is_permission_required: bool = Field(
@@ -27,5 +32,47 @@ class BaseTool(Oxy):
     category: str = Field("tool", description="Tool category identifier")
     timeout: float = Field(60, description="Timeout in seconds.")
 
+    cache_ttl: float = Field(
+        0, description="Seconds to reuse completed results, 0 disables the cache"
+    )
+    cache_max_entries: int = Field(
+        1024, description="Results kept in process before LRU eviction"
+    )
+    cache_max_bytes: int = Field(
+        16 * 1024 * 1024, description="Approximate bytes of results kept in process"
+    )
+    is_cache_shared: bool = Field(
+        False, description="Whether results are also shared through the MAS redis"
+    )
+
+    def get_result_cache(self) -> Optional[ResultCache]:
+        """Return the result cache of this tool, or None when it is disabled."""
+        if self.cache_ttl <= 0:
+            return None
+        cache = getattr(self, "_result_cache", None)
+        if cache is None:
+            cache = ResultCache(
+                ttl=self.cache_ttl,
+                max_entries=self.cache_max_entries,
+                max_bytes=self.cache_max_bytes,
+            )
+            self._result_cache = cache
+        cache.ttl = self.cache_ttl
+        cache.redis_client = (
+            self.mas.redis_client if self.is_cache_shared and self.mas else None
+        )
+        return cache
+
+    async def _execute_once(self, oxy_request: OxyRequest) -> OxyResponse:
+        cache = self.get_result_cache()
+        if cache is None:
+            return await super()._execute_once(oxy_request)
+        key = cache.get_key(self.name, oxy_request.arguments)
+        oxy_response = await cache.get(key)
+        if oxy_response is None:
+            oxy_response = await super()._execute_once(oxy_request)
+            await cache.set(key, oxy_response)
+        return oxy_response
+
     async def _execute(self, oxy_request: OxyRequest) -> OxyResponse:
         raise NotImplementedError("This method is not yet implemented")
@@ -57,6 +57,8 @@ class FunctionTool(BaseTool):
         sig = signature(func)
         schema = {"properties": {}, "required": []}
         needs_oxy_request = False
+        # (param_name, is_oxy_request) pairs, resolved once instead of per call
+        self._param_binding = []
 
         for name, param in sig.parameters.items():
             param_type = param.annotation
@@ -67,7 +69,9 @@ class FunctionTool(BaseTool):
                     and param_type.__name__ == "OxyRequest"
                 ):
                     needs_oxy_request = True
+                    self._param_binding.append((name, True))
                     continue
+            self._param_binding.append((name, False))
             # Get the type of parameter
             param_type = param.annotation
             # Handle the case where the type is not specified
@@ -93,23 +97,12 @@ class FunctionTool(BaseTool):
         """Execute the wrapped function with provided arguments."""
         try:
             func_kwargs = {}
-
-            sig = signature(self.func_process)
-
-            for param_name, param in sig.parameters.items():
-                if param.annotation != Parameter.empty:
-                    param_type = param.annotation
-                    type_name = getattr(param_type, "__name__", str(param_type))
-
-                    if type_name == "OxyRequest" or (
-                        hasattr(param_type, "__name__")
-                        and param_type.__name__ == "OxyRequest"
-                    ):
-                        func_kwargs[param_name] = oxy_request
-                    elif param_name in oxy_request.arguments:
-                        func_kwargs[param_name] = oxy_request.arguments[param_name]
-                elif param_name in oxy_request.arguments:
-                    func_kwargs[param_name] = oxy_request.arguments[param_name]
+            arguments = oxy_request.arguments
+            for param_name, is_oxy_request in self._param_binding:
+                if is_oxy_request:
+                    func_kwargs[param_name] = oxy_request
+                elif param_name in arguments:
+                    func_kwargs[param_name] = arguments[param_name]
 
             result = await self.func_process(**func_kwargs)
             return OxyResponse(state=OxyState.COMPLETED, output=result)
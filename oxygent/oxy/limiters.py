@@ -0,0 +1,364 @@
+"""Concurrency limiters for Oxy executions.
+
+Every Oxy runs its calls through a limiter, which decides how many of them
+may be in flight at once and queues the rest:
+
+- ``StaticLimiter``: a fixed limit, the ``semaphore`` of the Oxy (default).
+- ``AIMDLimiter``: additive increase while calls succeed at full usage,
+  multiplicative decrease on errors, timeouts and slow calls.
+- ``GradientLimiter``: follows the ratio between the long-term and the recent
+  latency, shrinking the limit as soon as the callee starts queueing.
+
+All limiters expose ``limit``, ``in_flight`` and ``queue_depth``. Waiting
+callers are served by priority class (see :class:`PriorityScheduler`).
+"""
+
+import asyncio
+import logging
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+
+from ..config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class LimiterSlot:
+    """One acquired slot; the caller marks it dropped when the call failed."""
+
+    __slots__ = ("start", "is_dropped")
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.is_dropped = False
+
+
+class _SlotContext:
+    def __init__(self, limiter, priority):
+        self.limiter = limiter
+        self.priority = priority
+        self.slot = None
+
+    async def __aenter__(self):
+        await self.limiter.acquire(self.priority)
+        self.slot = LimiterSlot()
+        return self.slot
+
+    async def __aexit__(self, exc_type, exc, tb):
+        # Cancellations mostly come from the caller's timeout
+        is_dropped = self.slot.is_dropped or exc_type is not None
+        latency = time.perf_counter() - self.slot.start
+        self.limiter.release(latency, is_dropped)
+        return False
+
+
+class PriorityScheduler:
+    """Waiting room of a limiter, with one FIFO queue per priority class.
+
+    The next class is chosen by ``Config.get_scheduling_policy()``:
+
+    - ``weighted``: smooth weighted round-robin between the waiting classes,
+      so low classes keep a share of the slots proportional to their weight.
+    - ``strict``: always the waiting class with the highest weight.
+
+    Weights come from ``Config.get_scheduling_weights()``, classes without a
+    weight get the weight of ``default``.
+    """
+
+    def __init__(self):
+        self.queues = {}
+        self.credits = {}
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def depths(self) -> dict:
+        return {priority: len(queue) for priority, queue in self.queues.items()}
+
+    def push(self, priority, waiter):
+        self.queues.setdefault(priority, deque()).append(waiter)
+        self.size += 1
+
+    def remove(self, waiter):
+        for priority, queue in self.queues.items():
+            if waiter in queue:
+                queue.remove(waiter)
+                self.size -= 1
+                if not queue:
+                    self._drop(priority)
+                return
+
+    def pop(self):
+        """Return the next live waiter, or None if nobody waits."""
+        while self.size:
+            priority = self._next_priority()
+            queue = self.queues[priority]
+            waiter = queue.popleft()
+            self.size -= 1
+            if not queue:
+                self._drop(priority)
+            if not waiter.done():
+                return waiter
+        return None
+
+    def _drop(self, priority):
+        del self.queues[priority]
+        self.credits.pop(priority, None)
+
+    def _next_priority(self):
+        weights = Config.get_scheduling_weights()
+        default_weight = weights.get("default", 1)
+
+        def get_weight(priority):
+            return weights.get(priority, default_weight)
+
+        if len(self.queues) == 1:
+            return next(iter(self.queues))
+        if Config.get_scheduling_policy() == "strict":
+            return max(self.queues, key=get_weight)
+        total, best = 0, None
+        for priority in self.queues:
+            weight = get_weight(priority)
+            self.credits[priority] = self.credits.get(priority, 0) + weight
+            total += weight
+            if best is None or self.credits[priority] > self.credits[best]:
+                best = priority
+        self.credits[best] -= total
+        return best
+
+
+class BaseLimiter(ABC):
+    """Base class of concurrency limiters.
+
+    Adaptive subclasses only decide the ``limit`` from finished calls. Callers
+    beyond the limit wait in a :class:`PriorityScheduler`, and a released slot
+    is handed over to the waiter it picks.
+
+    Example:
+        >>> async with limiter.slot(oxy_request.priority) as slot:
+        ...     oxy_response = await call()
+        ...     slot.is_dropped = oxy_response.state is OxyState.FAILED
+    """
+
+    def __init__(self):
+        self.in_flight = 0
+        self._waiters = PriorityScheduler()
+
+    @property
+    @abstractmethod
+    def limit(self) -> int:
+        pass
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    def slot(self, priority="default"):
+        return _SlotContext(self, priority)
+
+    def stats(self) -> dict:
+        return {
+            "strategy": self.__class__.__name__,
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "queue_depth_by_priority": self._waiters.depths(),
+        }
+
+    async def acquire(self, priority="default"):
+        if not self._waiters and self._has_capacity():
+            await self._take()
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.push(priority, waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just before the cancellation
+                self._give_back()
+            else:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self, latency: float, is_dropped: bool):
+        self.on_sample(latency, is_dropped)
+        self._give_back()
+
+    def on_sample(self, latency: float, is_dropped: bool):
+        """Adapt the limit to the outcome of a finished call."""
+        pass
+
+    def _has_capacity(self) -> bool:
+        return self.in_flight < self.limit
+
+    async def _take(self):
+        self.in_flight += 1
+
+    def _give_back(self):
+        self.in_flight -= 1
+        while self._has_capacity():
+            waiter = self._waiters.pop()
+            if waiter is None:
+                break
+            self.in_flight += 1
+            waiter.set_result(None)
+
+
+class StaticLimiter(BaseLimiter):
+    """Fixed concurrency limit backed by an ``asyncio.Semaphore``.
+
+    Queued callers never wait on the semaphore itself: a released slot is
+    handed over to the next waiter without going back to the semaphore.
+    """
+
+    def __init__(self, semaphore: asyncio.Semaphore, limit: int):
+        super().__init__()
+        self.semaphore = semaphore
+        self._limit = limit
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    def _has_capacity(self) -> bool:
+        return not self.semaphore.locked()
+
+    async def _take(self):
+        await self.semaphore.acquire()
+        self.in_flight += 1
+
+    def _give_back(self):
+        waiter = self._waiters.pop()
+        if waiter is None:
+            self.in_flight -= 1
+            self.semaphore.release()
+        else:
+            waiter.set_result(None)
+
+
+class AIMDLimiter(BaseLimiter):
+    """Additive-increase / multiplicative-decrease limit.
+
+    Args:
+        initial_limit: Limit before any call finished.
+        min_limit / max_limit: Bounds of the limit.
+        backoff_ratio: Factor applied to the limit on a dropped call.
+        latency_threshold: Calls slower than this (seconds) count as dropped.
+            ``None`` only counts errors and timeouts.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 16,
+        min_limit: int = 1,
+        max_limit: int = 256,
+        backoff_ratio: float = 0.9,
+        latency_threshold: float = None,
+    ):
+        super().__init__()
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff_ratio = backoff_ratio
+        self.latency_threshold = latency_threshold
+        self._limit = float(max(min_limit, min(initial_limit, max_limit)))
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def on_sample(self, latency: float, is_dropped: bool):
+        if self.latency_threshold is not None and latency > self.latency_threshold:
+            is_dropped = True
+        if is_dropped:
+            self._limit = max(self.min_limit, self._limit * self.backoff_ratio)
+        elif self.in_flight * 2 >= self.limit:
+            # Only grow when the current limit is actually used. The finished
+            # call is still counted in in_flight, its slot is given back next
+            self._limit = min(self.max_limit, self._limit + 1)
+
+
+class GradientLimiter(BaseLimiter):
+    """Latency-gradient limit.
+
+    The limit is scaled by ``long_latency / short_latency``, so it shrinks as
+    soon as recent calls get slower than usual, and grows by a queue
+    allowance of ``sqrt(limit)`` while latency is stable.
+
+    Args:
+        initial_limit: Limit before any call finished.
+        min_limit / max_limit: Bounds of the limit.
+        smoothing: Weight of a new estimate in the limit.
+        short_window / long_window: Number of samples of both latency averages.
+        tolerance: Ratio of latency increase tolerated before shrinking.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 16,
+        min_limit: int = 1,
+        max_limit: int = 256,
+        smoothing: float = 0.2,
+        short_window: int = 10,
+        long_window: int = 600,
+        tolerance: float = 1.5,
+    ):
+        super().__init__()
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.smoothing = smoothing
+        self.short_alpha = 2 / (short_window + 1)
+        self.long_alpha = 2 / (long_window + 1)
+        self.tolerance = tolerance
+        self.short_latency = None
+        self.long_latency = None
+        self._limit = float(max(min_limit, min(initial_limit, max_limit)))
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def on_sample(self, latency: float, is_dropped: bool):
+        if is_dropped:
+            self._limit = max(self.min_limit, self._limit / 2)
+            return
+        if self.short_latency is None:
+            self.short_latency = self.long_latency = latency
+            return
+        self.short_latency += self.short_alpha * (latency - self.short_latency)
+        self.long_latency += self.long_alpha * (latency - self.long_latency)
+        if self.short_latency <= 0:
+            return
+        gradient = max(
+            0.5, min(1.0, self.tolerance * self.long_latency / self.short_latency)
+        )
+        new_limit = self._limit * gradient + math.sqrt(self._limit)
+        new_limit = (1 - self.smoothing) * self._limit + self.smoothing * new_limit
+        self._limit = max(self.min_limit, min(self.max_limit, new_limit))
+
+
+LIMITER_STRATEGIES = {
+    "static": StaticLimiter,
+    "aimd": AIMDLimiter,
+    "gradient": GradientLimiter,
+}
+
+
+def create_limiter(strategy: str, limit: int, **params) -> BaseLimiter:
+    """Create the limiter registered as ``strategy`` in ``LIMITER_STRATEGIES``.
+
+    ``limit`` is the ``semaphore`` of the Oxy: the fixed limit of the static
+    strategy, the initial limit of the adaptive ones.
+    """
+    if strategy not in LIMITER_STRATEGIES:
+        raise ValueError(
+            f"Unknown limiter strategy {strategy}, "
+            f"expected one of {list(LIMITER_STRATEGIES)}"
+        )
+    if strategy == "static":
+        return StaticLimiter(asyncio.Semaphore(limit), limit)
+    params.setdefault("initial_limit", limit)
+    return LIMITER_STRATEGIES[strategy](**params)
@@ -1,7 +1,9 @@
 from .http_llm import HttpLLM
 from .openai_llm import OpenAILLM
+from .router_llm import RouterLLM
 
 __all__ = [
     "HttpLLM",
     "OpenAILLM",
+    "RouterLLM",
 ]
@@ -5,14 +5,22 @@ system. It handles multimodal input processing, think message extraction, and pr
 consistent interface for different LLM providers.
 """
 
+import asyncio
 import copy
 import json
 import logging
-from typing import Optional
+import time
+from collections import deque
+from typing import Callable, Optional
 
 from pydantic import Field
 
+from ... import metrics
+from ...config import Config
+from ...llm_cache import get_sqlite_store, is_deterministic
+from ...result_cache import ResultCache
 from ...schemas import OxyRequest, OxyResponse
+from ...tokenizer import TokenCounter, load_tiktoken_encoding
 from ...utils.common_utils import (
     extract_first_json,
     file_to_base64,
@@ -42,6 +50,11 @@ class BaseLLM(Oxy):
         is_convert_url_to_base64: Whether to convert media URLs to base64.
         max_image_pixels: Maximum pixel count for image processing.
         max_video_size: Maximum size in bytes for video processing.
+        is_cache_response: Whether identical deterministic calls reuse a
+            cached response.
+        context_window: Context size of the model in tokens, 0 if unknown.
+        func_tokenize: Tokenizer of the model, counting prompt tokens.
+        is_hedge_request: Whether a call slower than usual is duplicated.
     """
 
     category: str = Field("llm", description="")
@@ -76,6 +89,220 @@ class BaseLLM(Oxy):
         description="Maximum non-media file size (bytes) for base64 embedding.",
     )
 
+    is_cache_response: bool = Field(
+        False, description="Whether identical deterministic calls reuse a response"
+    )
+    is_cache_forced: bool = Field(
+        False, description="Whether streaming and sampled calls are cached too"
+    )
+    is_cache_persistent: bool = Field(
+        True, description="Whether responses are also kept in SQLite on disk"
+    )
+    cache_ttl: float = Field(
+        7 * 24 * 3600, description="Seconds a cached response stays valid"
+    )
+    cache_max_entries: int = Field(
+        1024, description="Responses kept in process before LRU eviction"
+    )
+    cache_max_bytes: int = Field(
+        16 * 1024 * 1024, description="Approximate bytes of responses kept in process"
+    )
+
+    context_window: int = Field(
+        0, description="Context size of the model in tokens, 0 if unknown"
+    )
+    func_tokenize: Optional[Callable] = Field(
+        None,
+        exclude=True,
+        description="Function from a text to its tokens or their count, "
+        "tiktoken or an approximation by default",
+    )
+
+    is_hedge_request: bool = Field(
+        False,
+        description="Whether a call slower than usual is sent again, "
+        "the first success winning",
+    )
+    hedge_percentile: float = Field(
+        0.95, description="Latency percentile after which a call is hedged"
+    )
+    hedge_min_delay: float = Field(
+        1.0, description="Seconds a call runs at least before it is hedged"
+    )
+    hedge_budget: float = Field(
+        0.05, description="Maximum ratio of hedged calls among recent calls"
+    )
+    hedge_window: int = Field(
+        200, description="Recent calls the latency percentile and budget cover"
+    )
+    hedge_min_samples: int = Field(
+        20, description="Calls measured before the first hedge"
+    )
+
+    async def init(self):
+        await super().init()
+        if self.func_tokenize is None:
+            # Not on the first request: the encoding may be downloaded
+            await load_tiktoken_encoding(getattr(self, "model_name", None) or "")
+
+    def get_token_counter(self) -> TokenCounter:
+        """Return the token counter of this LLM, created on first use."""
+        counter = getattr(self, "_token_counter", None)
+        if counter is None:
+            counter = TokenCounter(
+                func_tokenize=self.func_tokenize,
+                model_name=getattr(self, "model_name", None) or "",
+            )
+            self._token_counter = counter
+        return counter
+
+    def get_prompt_budget(self) -> int:
+        """Tokens a prompt may take: the context window minus the tokens
+        reserved for the completion (``max_tokens``), 0 when unknown."""
+        if not self.context_window:
+            return 0
+        max_tokens = self.llm_params.get(
+            "max_tokens", Config.get_llm_config().get("max_tokens", 0)
+        )
+        return max(self.context_window - int(max_tokens or 0), 0)
+
+    def get_response_cache(self) -> Optional[ResultCache]:
+        """Return the response cache of this LLM, or None when it is disabled."""
+        if not self.is_cache_response:
+            return None
+        cache = getattr(self, "_response_cache", None)
+        if cache is None:
+            cache = ResultCache(
+                ttl=self.cache_ttl,
+                max_entries=self.cache_max_entries,
+                max_bytes=self.cache_max_bytes,
+                shared_tier="disk",
+            )
+            self._response_cache = cache
+        cache.ttl = self.cache_ttl
+        cache.redis_client = get_sqlite_store() if self.is_cache_persistent else None
+        return cache
+
+    def _get_cache_key(self, oxy_request: OxyRequest) -> Optional[str]:
+        """Return the cache key of a call, None when it must reach the model.
+
+        The key covers the model, the messages and the parameters the call is
+        sent with: the LLM config, ``llm_params`` and the request arguments.
+        """
+        params = {
+            k: v
+            for k, v in Config.get_llm_config().items()
+            if k not in {"cls", "base_url", "api_key", "name", "model_name"}
+        }
+        params.update(self.llm_params)
+        effective_params = dict(params)
+        effective_params.update(
+            {k: v for k, v in oxy_request.arguments.items() if k != "messages"}
+        )
+        if not self.is_cache_forced and not is_deterministic(effective_params):
+            return None
+        model = getattr(self, "model_name", None) or self.name
+        return ResultCache.get_key(
+            model,
+            {"params": params, "arguments": oxy_request.arguments},
+            namespace="llm_cache",
+        )
+
+    async def _execute_once(self, oxy_request: OxyRequest) -> OxyResponse:
+        cache = self.get_response_cache()
+        key = self._get_cache_key(oxy_request) if cache is not None else None
+        if key is None:
+            return await super()._execute_once(oxy_request)
+        oxy_response = await cache.get(key)
+        if oxy_response is not None:
+            oxy_response.extra["cache_key"] = key
+            return oxy_response
+        oxy_response = await super()._execute_once(oxy_request)
+        await cache.set(key, oxy_response)
+        return oxy_response
+
+    def _get_hedge_delay(self) -> Optional[float]:
+        """Seconds after which a call is hedged, None when it must not be.
+
+        The delay is the ``hedge_percentile`` of recent latencies, and a
+        hedge is only sent while hedged calls stay within ``hedge_budget``
+        of the recent calls.
+        """
+        latencies = self._hedge_latencies
+        if len(latencies) < self.hedge_min_samples:
+            return None
+        hedged = self._hedged_calls
+        if sum(hedged) + 1 > self.hedge_budget * (len(hedged) + 1):
+            return None
+        ordered = sorted(latencies)
+        percentile = ordered[int(self.hedge_percentile * (len(ordered) - 1))]
+        return max(percentile, self.hedge_min_delay)
+
+    def _is_stream(self, oxy_request: OxyRequest) -> bool:
+        for params in (oxy_request.arguments, self.llm_params):
+            if "stream" in params:
+                return bool(params["stream"])
+        return bool(Config.get_llm_config().get("stream", False))
+
+    async def _run_once(self, oxy_request: OxyRequest) -> OxyResponse:
+        """Run the call, hedged when ``is_hedge_request`` is set.
+
+        A call still running after the hedge delay is sent again (RouterLLM
+        sends it to another endpoint). The first success wins and the other
+        call is cancelled. Streaming calls are never hedged, their deltas
+        already reach the user.
+        """
+        if not self.is_hedge_request or self._is_stream(oxy_request):
+            return await super()._run_once(oxy_request)
+        window = self.hedge_window
+        if getattr(self, "_hedge_latencies", None) is None or (
+            self._hedge_latencies.maxlen != window
+        ):
+            self._hedge_latencies = deque(maxlen=window)
+            self._hedged_calls = deque(maxlen=window)
+
+        delay = self._get_hedge_delay()
+        start = time.perf_counter()
+        primary = asyncio.create_task(super()._run_once(oxy_request))
+        tasks = [primary]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            self._hedged_calls.append(not done)
+            if not done:
+                tasks.append(asyncio.create_task(super()._run_once(oxy_request)))
+            winner, error = None, None
+            pending = set(tasks)
+            while pending and winner is None:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in tasks:
+                    if task in done and winner is None:
+                        if task.exception() is None:
+                            winner = task
+                        elif task is primary or error is None:
+                            error = task.exception()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        if winner is None:
+            raise error
+        # Latency of the primary call, or a lower bound when it lost
+        self._hedge_latencies.append(time.perf_counter() - start)
+        oxy_response = winner.result()
+        if len(tasks) > 1:
+            is_won = winner is not primary
+            metrics.llm_hedges.inc(self.name, "won" if is_won else "lost")
+            oxy_response.extra["hedge"] = {
+                "delay": round(delay, 3),
+                "sent": 1,
+                "won": is_won,
+            }
+        return oxy_response
+
     async def _get_messages(self, oxy_request: OxyRequest):
         """Preprocess messages for multimoding input."""
         # ---------- if "messages" ----------
@@ -7,6 +7,7 @@ providers that follow OpenAI-compatible API standards.
 
 import json
 import logging
+from typing import Optional
 
 import httpx
 
@@ -23,8 +24,33 @@ class HttpLLM(RemoteLLM):
     This class provides a concrete implementation of RemoteLLM for communicating
     with remote LLM APIs over HTTP. It handles API authentication, request
     formatting, and response parsing for OpenAI-compatible APIs.
+
+    Each instance keeps one pooled ``httpx.AsyncClient``, created in ``init()``
+    and closed by ``cleanup()``, so calls reuse kept-alive connections instead
+    of paying a TCP/TLS handshake each.
     """
 
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def init(self):
+        await super().init()
+        self._get_client()
+
+    async def cleanup(self):
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.aclose()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the pooled client, created on first use."""
+        if self._client is None or getattr(self._client, "is_closed", False):
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout, **self._get_http_client_kwargs()
+            )
+        return self._client
+
     async def _execute(self, oxy_request: OxyRequest) -> OxyResponse:
         """Execute an HTTP request to the remote LLM API.
 
@@ -102,66 +128,91 @@ class HttpLLM(RemoteLLM):
 
         if payload.get("stream", False) and (use_openai or not is_gemini):
             result_parts: list[str] = []
-            async with httpx.AsyncClient(timeout=None) as client:
-                async with client.stream(
-                    "POST", url, headers=headers, json=payload
-                ) as resp:
-                    async for line in resp.aiter_lines():
-                        if not line:
-                            continue
-                        if line.startswith("data:"):
-                            line = line[5:].strip()
-                        if line.strip() == "[DONE]":
-                            break
-                        try:
-                            chunk = json.loads(line)
-                        except json.JSONDecodeError:
-                            continue
-                        except Exception as e:
-                            logger.error(
-                                e,
-                                extra={
-                                    "trace_id": oxy_request.current_trace_id,
-                                    "node_id": oxy_request.node_id,
-                                },
-                            )
-                        if use_openai:
-                            delta = chunk["choices"][0]["delta"].get(
-                                "content", ""
-                            ) or chunk["choices"][0]["delta"].get(
-                                "reasoning_content", ""
-                            )
-                        else:
-                            delta = chunk.get("message", {}).get(
-                                "content", ""
-                            ) or chunk.get("message", {}).get("reasoning_content", "")
-                        if delta:
-                            result_parts.append(delta)
-                            await oxy_request.send_message(
-                                {"type": "stream", "content": {"delta": delta}}
-                            )
+            client = self._get_client()
+            async with client.stream(
+                "POST", url, headers=headers, json=payload, timeout=None
+            ) as resp:
+                async for line in resp.aiter_lines():
+                    if not line:
+                        continue
+                    if line.startswith("data:"):
+                        line = line[5:].strip()
+                    if line.strip() == "[DONE]":
+                        break
+                    try:
+                        chunk = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    except Exception as e:
+                        logger.error(
+                            e,
+                            extra={
+                                "trace_id": oxy_request.current_trace_id,
+                                "node_id": oxy_request.node_id,
+                            },
+                        )
+                    if use_openai:
+                        delta = chunk["choices"][0]["delta"].get(
+                            "content", ""
+                        ) or chunk["choices"][0]["delta"].get("reasoning_content", "")
+                    else:
+                        delta = chunk.get("message", {}).get(
+                            "content", ""
+                        ) or chunk.get("message", {}).get("reasoning_content", "")
+                    if delta:
+                        result_parts.append(delta)
+                        await oxy_request.send_message(
+                            {"type": "stream", "content": {"delta": delta}}
+                        )
             result = "".join(result_parts)
             return OxyResponse(state=OxyState.COMPLETED, output=result)
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            http_response = await client.post(url, headers=headers, json=payload)
-            http_response.raise_for_status()
-            data = http_response.json()
-            if "error" in data:
-                error_message = data["error"].get("message", "Unknown error")
-                raise ValueError(f"LLM API error: {error_message}")
-            if is_gemini:
-                result = (
-                    data["candidates"][0]["content"]["parts"][0].get("text", "")
-                    if data.get("candidates")
-                    else ""
-                )
-            elif use_openai:
-                response_message = data["choices"][0]["message"]
-                result = response_message.get("content") or response_message.get(
-                    "reasoning_content"
-                )
-            else:  # ollama
-                result = data["message"]["content"]
-
-            return OxyResponse(state=OxyState.COMPLETED, output=result)
+        client = self._get_client()
+        http_response = await client.post(url, headers=headers, json=payload)
+        http_response.raise_for_status()
+        data = http_response.json()
+        if "error" in data:
+            error_message = data["error"].get("message", "Unknown error")
+            raise ValueError(f"LLM API error: {error_message}")
+        if is_gemini:
+            result = (
+                data["candidates"][0]["content"]["parts"][0].get("text", "")
+                if data.get("candidates")
+                else ""
+            )
+        elif use_openai:
+            response_message = data["choices"][0]["message"]
+            result = response_message.get("content") or response_message.get(
+                "reasoning_content"
+            )
+        else:  # ollama
+            result = data["message"]["content"]
+
+        usage = self._get_usage(data)
+        return OxyResponse(
+            state=OxyState.COMPLETED,
+            output=result,
+            extra={"usage": usage} if usage else {},
+        )
+
+    @staticmethod
+    def _get_usage(data: dict) -> dict:
+        """Return the token counts of a response, in the OpenAI format."""
+        if isinstance(data.get("usage"), dict):  # OpenAI-compatible
+            return data["usage"]
+        if isinstance(data.get("usageMetadata"), dict):  # Gemini
+            metadata = data["usageMetadata"]
+            return {
+                "prompt_tokens": metadata.get("promptTokenCount", 0),
+                "completion_tokens": metadata.get("candidatesTokenCount", 0),
+                "total_tokens": metadata.get("totalTokenCount", 0),
+            }
+        if "prompt_eval_count" in data or "eval_count" in data:  # Ollama
+            prompt_tokens = data.get("prompt_eval_count", 0)
+            completion_tokens = data.get("eval_count", 0)
+            return {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            }
+        return {}
@@ -6,8 +6,9 @@ supports all OpenAI models and compatible APIs.
 """
 
 import logging
+from typing import Optional
 
-from openai import AsyncOpenAI
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
 
 from ...config import Config
 from ...schemas import OxyRequest, OxyResponse, OxyState
@@ -22,8 +23,39 @@ class OpenAILLM(RemoteLLM):
     This class provides a concrete implementation of RemoteLLM specifically designed
     for OpenAI's language models. It uses the official AsyncOpenAI client for
     optimal performance and compatibility with OpenAI's API standards.
+
+    One AsyncOpenAI client is kept per instance, created in ``init()`` and
+    closed by ``cleanup()``. It uses the Oxy ``timeout`` and no retries of its
+    own, the Oxy ``retries`` already covering failed calls.
     """
 
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._client: Optional[AsyncOpenAI] = None
+
+    async def init(self):
+        await super().init()
+        self._get_client()
+
+    async def cleanup(self):
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.close()
+
+    def _get_client(self) -> AsyncOpenAI:
+        """Return the client of this LLM, created on first use."""
+        if self._client is None or self._client.is_closed():
+            self._client = AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=self.base_url,
+                timeout=self.timeout,
+                max_retries=0,
+                http_client=DefaultAsyncHttpxClient(
+                    timeout=self.timeout, **self._get_http_client_kwargs()
+                ),
+            )
+        return self._client
+
     async def _execute(self, oxy_request: OxyRequest) -> OxyResponse:
         """Execute a request using the OpenAI API.
 
@@ -63,11 +95,7 @@ class OpenAILLM(RemoteLLM):
                 continue
             payload[k] = v
 
-        client = AsyncOpenAI(
-            api_key=self.api_key,
-            base_url=self.base_url,
-        )
-        completion = await client.chat.completions.create(**payload)
+        completion = await self._get_client().chat.completions.create(**payload)
         if payload["stream"]:
             answer = ""
             think_start = True
@@ -97,6 +125,9 @@ class OpenAILLM(RemoteLLM):
                     )
             return OxyResponse(state=OxyState.COMPLETED, output=answer)
         else:
+            usage = getattr(completion, "usage", None)
             return OxyResponse(
-                state=OxyState.COMPLETED, output=completion.choices[0].message.content
+                state=OxyState.COMPLETED,
+                output=completion.choices[0].message.content,
+                extra={"usage": usage.model_dump()} if usage else {},
             )
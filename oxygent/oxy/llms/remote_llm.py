@@ -1,10 +1,14 @@
+import logging
 from typing import Optional
 
+import httpx
 from pydantic import Field, field_validator
 
 from ...schemas import OxyRequest, OxyResponse
 from .base_llm import BaseLLM
 
+logger = logging.getLogger(__name__)
+
 
 class RemoteLLM(BaseLLM):
     """Large Language Model implementation.
@@ -17,11 +21,25 @@ class RemoteLLM(BaseLLM):
         api_key: The API key for authentication with the LLM service.
         base_url: The base URL endpoint for the LLM API.
         model_name: The specific model name to use for requests.
+        max_connections: Maximum concurrent connections of the client pool.
+        max_keepalive_connections: Idle connections kept alive in the pool.
+        keepalive_expiry: Seconds an idle connection is kept alive.
+        is_http2: Whether to negotiate HTTP/2, needs the h2 package.
     """
 
     api_key: Optional[str] = Field(default=None)
     base_url: Optional[str] = Field("")
     model_name: Optional[str] = Field("")
+    max_connections: Optional[int] = Field(
+        100, description="Maximum concurrent connections of the client pool"
+    )
+    max_keepalive_connections: Optional[int] = Field(
+        20, description="Idle connections kept alive in the pool"
+    )
+    keepalive_expiry: Optional[float] = Field(
+        30.0, description="Seconds an idle connection is kept alive"
+    )
+    is_http2: bool = Field(False, description="Whether to negotiate HTTP/2")
 
     @field_validator("base_url", "model_name")
     @classmethod
@@ -43,5 +61,26 @@ class RemoteLLM(BaseLLM):
 
         return value
 
+    def _get_http_client_kwargs(self) -> dict:
+        """Return the pool settings of an ``httpx.AsyncClient`` for this LLM."""
+        http2 = self.is_http2
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning(
+                    f"{self.name}: HTTP/2 needs the h2 package "
+                    "(pip install httpx[http2]), using HTTP/1.1."
+                )
+                http2 = False
+        return {
+            "limits": httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+            "http2": http2,
+        }
+
     async def _execute(self, oxy_request: OxyRequest) -> OxyResponse:
         raise NotImplementedError("This method is not yet implemented")
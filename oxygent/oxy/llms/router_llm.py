@@ -0,0 +1,273 @@
+"""Router over several endpoints serving the same model.
+
+This module provides the RouterLLM class, which holds a pool of
+OpenAI-compatible endpoints (gateways or replicas of one model) and
+dispatches each call to one of them:
+
+- the endpoint with the fewest outstanding requests, or with the best
+  recent latency weighted by its load (``strategy="latency"``);
+- an endpoint that errors or times out ``failure_threshold`` times in a row
+  is ejected for ``cooldown`` seconds, then gets a single trial call;
+- a failed call is retried at once on another endpoint, instead of sleeping
+  ``delay`` and hitting the same one. Each attempt gets a share of the time
+  left, so a hanging endpoint times out in time to fail over.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Literal, Optional
+
+import httpx
+from pydantic import Field
+
+from ... import metrics
+from ...schemas import OxyRequest, OxyResponse
+from .base_llm import BaseLLM
+from .http_llm import HttpLLM
+
+logger = logging.getLogger(__name__)
+
+
+def is_endpoint_fault(e: Exception) -> bool:
+    """Whether another endpoint may succeed where this one failed.
+
+    Client errors (4xx except timeouts and rate limits) would fail the same
+    way on every replica.
+    """
+    if isinstance(e, httpx.HTTPStatusError):
+        status_code = e.response.status_code
+        return not (400 <= status_code < 500) or status_code in (408, 429)
+    return True
+
+
+class Endpoint:
+    """An endpoint of a RouterLLM and its statistics."""
+
+    def __init__(self, name: str, llm: HttpLLM):
+        self.name = name
+        self.llm = llm
+        self.outstanding = 0
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.ejections = 0
+        # Moving average of the call latency in seconds, None before a call
+        self.latency: Optional[float] = None
+        self.ejected_until = 0.0
+        self.last_error = ""
+
+    def is_available(self, now: float) -> bool:
+        return self.ejected_until <= now
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "outstanding": self.outstanding,
+            "requests": self.requests,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "ejections": self.ejections,
+            "latency": self.latency,
+            "cooldown_remaining": max(0.0, self.ejected_until - time.monotonic()),
+            "last_error": self.last_error,
+        }
+
+
+class RouterLLM(BaseLLM):
+    """LLM dispatching calls over a pool of endpoints of the same model.
+
+    Each endpoint is a dict of ``HttpLLM`` fields, merged over the
+    ``api_key``, ``model_name``, ``timeout`` and ``llm_params`` of the
+    router. An optional ``name`` labels it in the stats and metrics,
+    ``base_url`` is used otherwise.
+
+    Attributes:
+        endpoints: The endpoints of the pool.
+        strategy: ``least_outstanding`` or ``latency``.
+        failure_threshold: Consecutive failures ejecting an endpoint.
+        cooldown: Seconds an ejected endpoint receives no calls.
+        max_attempts: Endpoints tried per attempt, 0 for all of them.
+
+    Example:
+        >>> oxy.RouterLLM(
+        ...     name="default_llm",
+        ...     api_key=os.getenv("DEFAULT_LLM_API_KEY"),
+        ...     model_name="qwen-72b",
+        ...     endpoints=[
+        ...         {"base_url": "http://gpu-1:8000/v1"},
+        ...         {"base_url": "http://gpu-2:8000/v1"},
+        ...     ],
+        ... )
+    """
+
+    endpoints: list = Field(
+        default_factory=list, description="HttpLLM fields of each endpoint"
+    )
+    api_key: Optional[str] = Field(None, description="Default API key")
+    model_name: Optional[str] = Field("", description="Default model name")
+    strategy: Literal["least_outstanding", "latency"] = Field(
+        "least_outstanding",
+        description="Fewest outstanding requests, or best latency times load",
+    )
+    failure_threshold: int = Field(
+        1, description="Consecutive failures after which an endpoint is ejected"
+    )
+    cooldown: float = Field(
+        30.0, description="Seconds an ejected endpoint receives no calls"
+    )
+    latency_decay: float = Field(
+        0.3, description="Weight of the last call in the latency moving average"
+    )
+    max_attempts: int = Field(
+        0, description="Endpoints tried per attempt, 0 for all of them"
+    )
+    retries: int = Field(1, description="Failover to other endpoints comes first")
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        if not self.endpoints:
+            raise ValueError(f"RouterLLM {self.name} needs at least one endpoint")
+        self._endpoints = []
+        for config in self.endpoints:
+            config = dict(config)
+            endpoint_name = config.pop("name", None) or config.get("base_url", "")
+            llm_kwargs = {
+                "api_key": self.api_key,
+                "model_name": self.model_name,
+                "timeout": self.timeout,
+                "llm_params": self.llm_params,
+                "is_multimodal_supported": self.is_multimodal_supported,
+                "is_convert_url_to_base64": self.is_convert_url_to_base64,
+                "is_send_think": self.is_send_think,
+            }
+            llm_kwargs.update(config)
+            llm = HttpLLM(name=f"{self.name}@{endpoint_name}", **llm_kwargs)
+            self._endpoints.append(Endpoint(endpoint_name, llm))
+        self._turn = 0
+
+    def set_mas(self, mas):
+        super().set_mas(mas)
+        for endpoint in self._endpoints:
+            endpoint.llm.set_mas(mas)
+
+    async def init(self):
+        await super().init()
+        for endpoint in self._endpoints:
+            await endpoint.llm.init()
+
+    async def cleanup(self):
+        for endpoint in self._endpoints:
+            await endpoint.llm.cleanup()
+
+    def get_endpoint_stats(self) -> list:
+        """Return the statistics of every endpoint."""
+        return [endpoint.to_dict() for endpoint in self._endpoints]
+
+    def _select(self, tried: list) -> Endpoint:
+        """Return the best endpoint not tried yet for this call."""
+        now = time.monotonic()
+        untried = [e for e in self._endpoints if all(e is not t for t in tried)]
+        candidates = [e for e in untried if e.is_available(now)]
+        if not candidates:
+            # Every endpoint left is cooling down: try the one back soonest
+            candidates = [min(untried, key=lambda e: e.ejected_until)]
+
+        # Ties go round-robin, starting one endpoint further at each call
+        self._turn += 1
+        size = len(self._endpoints)
+        rank = {id(e): (i - self._turn) % size for i, e in enumerate(self._endpoints)}
+        if self.strategy == "latency":
+            return min(
+                candidates,
+                key=lambda e: ((e.latency or 0.0) * (e.outstanding + 1), rank[id(e)]),
+            )
+        return min(candidates, key=lambda e: (e.outstanding, rank[id(e)]))
+
+    def _set_outstanding(self, endpoint: Endpoint, delta: int):
+        endpoint.outstanding += delta
+        metrics.llm_endpoint_outstanding.set(
+            endpoint.outstanding, self.name, endpoint.name
+        )
+
+    def _record_success(self, endpoint: Endpoint, seconds: float):
+        endpoint.requests += 1
+        endpoint.consecutive_failures = 0
+        if endpoint.latency is None:
+            endpoint.latency = seconds
+        else:
+            endpoint.latency += self.latency_decay * (seconds - endpoint.latency)
+        metrics.llm_endpoint_requests.inc(self.name, endpoint.name, "ok")
+        metrics.llm_endpoint_duration.observe(seconds, self.name, endpoint.name)
+
+    def _record_failure(self, endpoint: Endpoint, e: Exception):
+        endpoint.requests += 1
+        endpoint.failures += 1
+        endpoint.consecutive_failures += 1
+        endpoint.last_error = f"{type(e).__name__}: {e}"[:500]
+        metrics.llm_endpoint_requests.inc(self.name, endpoint.name, "error")
+        if endpoint.consecutive_failures >= self.failure_threshold:
+            endpoint.ejected_until = time.monotonic() + self.cooldown
+            endpoint.ejections += 1
+            metrics.llm_endpoint_ejections.inc(self.name, endpoint.name)
+            logger.warning(
+                f"{self.name}: endpoint {endpoint.name} ejected for "
+                f"{self.cooldown}s after {endpoint.consecutive_failures} failures"
+            )
+
+    async def _call(
+        self, endpoint: Endpoint, oxy_request: OxyRequest, timeout: float
+    ):
+        self._set_outstanding(endpoint, 1)
+        start = time.perf_counter()
+        try:
+            oxy_response = await asyncio.wait_for(
+                endpoint.llm._execute(oxy_request), timeout=timeout
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if is_endpoint_fault(e):
+                self._record_failure(endpoint, e)
+            raise
+        finally:
+            self._set_outstanding(endpoint, -1)
+        self._record_success(endpoint, time.perf_counter() - start)
+        oxy_response.extra["endpoint"] = endpoint.name
+        return oxy_response
+
+    async def _execute(self, oxy_request: OxyRequest) -> OxyResponse:
+        """Send the call to the best endpoint, failing over to the others.
+
+        Streaming calls fail over too, so a replica failing mid-stream means
+        the deltas sent so far are followed by the full answer of another.
+
+        The time left for the call (``timeout``, or less before the request
+        deadline) is shared among the endpoints still to try, so a timed out
+        endpoint is recorded as failed and the next one still has time.
+        """
+        size = len(self._endpoints)
+        attempts = min(self.max_attempts, size) if self.max_attempts else size
+        budget = self.timeout
+        remaining = oxy_request.get_remaining_time()
+        if remaining is not None:
+            budget = min(budget, remaining)
+        end = time.monotonic() + budget
+        tried = []
+        while True:
+            endpoint = self._select(tried)
+            tried.append(endpoint)
+            timeout = max(0.0, end - time.monotonic()) / (attempts - len(tried) + 1)
+            try:
+                return await self._call(endpoint, oxy_request, timeout)
+            except Exception as e:
+                if not is_endpoint_fault(e) or len(tried) >= attempts:
+                    raise
+                logger.warning(
+                    f"{self.name}: endpoint {endpoint.name} failed ({e}), "
+                    "trying another one",
+                    extra={
+                        "trace_id": oxy_request.current_trace_id,
+                        "node_id": oxy_request.node_id,
+                    },
+                )
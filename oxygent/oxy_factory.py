@@ -8,6 +8,7 @@ from .oxy import (
     MCPTool,
     OpenAILLM,
     ReActAgent,
+    RouterLLM,
     SSEMCPClient,
     StdioMCPClient,
     Workflow,
@@ -23,6 +24,7 @@ class OxyFactory:
         "HttpTool": HttpTool,
         "HttpLLM": HttpLLM,
         "OpenAILLM": OpenAILLM,
+        "RouterLLM": RouterLLM,
         "MCPTool": MCPTool,
         "StdioMCPClient": StdioMCPClient,
         "SSEMCPClient": SSEMCPClient,
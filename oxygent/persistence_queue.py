@@ -0,0 +1,239 @@
+"""Write-behind persistence of node, trace and history records.
+
+A :class:`PersistenceQueue` sits between the Oxys and the MAS ``es_client``.
+Records are put into a bounded in-process queue and written by a single
+flusher task through ``es_client.bulk``, either when ``max_batch_size``
+records are pending or every ``flush_interval`` seconds:
+
+- records are keyed by index and document id, so the pre-save and post-save
+  of a node still pending are coalesced into one document;
+- when the queue is full, ``put`` waits for the next flush (``block``) or
+  drops the new record (``drop``);
+- ``stats`` exposes the queue lag and the flush latency.
+
+Records are not readable until flushed, so ``MAS.chat_with_agent`` flushes
+the queue before a request continuing a trace reads its history.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW_POLICIES = ("block", "drop")
+
+
+class PersistenceQueue:
+    """Bounded write-behind queue in front of an ES client.
+
+    Example:
+        >>> queue = PersistenceQueue(es_client, flush_interval=0.5)
+        >>> await queue.put("app_node", node_id, pre_save_body)
+        >>> await queue.put("app_node", node_id, post_save_body, is_update=True)
+        >>> await queue.close()  # flushes what is left
+    """
+
+    def __init__(
+        self,
+        es_client,
+        max_queue_size=10000,
+        max_batch_size=500,
+        flush_interval=1.0,
+        overflow_policy="block",
+    ):
+        """Create an empty queue, its flusher starts with the first record.
+
+        Args:
+            es_client: Client with a ``bulk(actions)`` method (see ``BaseEs``).
+            max_queue_size (int): Records pending before the overflow policy
+                applies. Coalesced records do not take more room.
+            max_batch_size (int): Records written by one bulk request.
+            flush_interval (float): Seconds a record may wait for a full batch.
+            overflow_policy (str): "block" or "drop".
+        """
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Unknown overflow policy {overflow_policy}, "
+                f"expected one of {list(OVERFLOW_POLICIES)}"
+            )
+        self.es_client = es_client
+        self.max_queue_size = max_queue_size
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.overflow_policy = overflow_policy
+        # (index_name, doc_id) -> [op_type, body, enqueue_time]
+        self.pending: OrderedDict = OrderedDict()
+        self.enqueued = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.flushed = 0
+        self.failed = 0
+        self.flushes = 0
+        self.total_flush_latency = 0.0
+        self.last_flush_latency = 0.0
+        self.max_flush_latency = 0.0
+        self.max_queue_lag = 0.0
+        self._task = None
+        self._is_closed = False
+        self._wakeup = asyncio.Event()
+        self._has_space = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+
+    @property
+    def queue_lag(self) -> float:
+        """Seconds the oldest pending record has been waiting."""
+        if not self.pending:
+            return 0.0
+        return time.perf_counter() - next(iter(self.pending.values()))[2]
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self.pending),
+            "max_queue_size": self.max_queue_size,
+            "enqueued": self.enqueued,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "flushed": self.flushed,
+            "failed": self.failed,
+            "flushes": self.flushes,
+            "queue_lag": self.queue_lag,
+            "max_queue_lag": self.max_queue_lag,
+            "last_flush_latency": self.last_flush_latency,
+            "avg_flush_latency": self.total_flush_latency / self.flushes
+            if self.flushes
+            else 0.0,
+            "max_flush_latency": self.max_flush_latency,
+        }
+
+    async def put(self, index_name, doc_id, body, is_update=False):
+        """Queue an ``index`` of ``body``, or an ``update`` merged into it.
+
+        Returns:
+            bool: False when the record was dropped by the overflow policy.
+        """
+        if self._is_closed:
+            raise RuntimeError("Persistence queue is closed")
+        self._ensure_started()
+        key = (index_name, doc_id)
+        while key not in self.pending and len(self.pending) >= self.max_queue_size:
+            if self.overflow_policy == "drop":
+                self.dropped += 1
+                logger.warning(f"Persistence queue full, {index_name} record dropped")
+                return False
+            self._has_space.clear()
+            self._wakeup.set()
+            await self._has_space.wait()
+
+        entry = self.pending.get(key)
+        if entry is None:
+            self.pending[key] = [
+                "update" if is_update else "index",
+                dict(body),
+                time.perf_counter(),
+            ]
+            self.enqueued += 1
+        elif is_update:
+            entry[1].update(body)
+            self.coalesced += 1
+        else:
+            entry[0], entry[1] = "index", dict(body)
+            self.coalesced += 1
+        if len(self.pending) >= self.max_batch_size:
+            self._wakeup.set()
+        return True
+
+    async def flush(self):
+        """Write every pending record now."""
+        while self.pending:
+            await self._flush_batch()
+
+    async def close(self):
+        """Stop accepting records, flush what is pending and stop the flusher."""
+        self._is_closed = True
+        self._wakeup.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        await self.flush()
+
+    def _ensure_started(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while not self._is_closed:
+            if len(self.pending) < self.max_batch_size:
+                try:
+                    await asyncio.wait_for(
+                        self._wakeup.wait(), timeout=self.flush_interval
+                    )
+                except asyncio.TimeoutError:
+                    pass
+            self._wakeup.clear()
+            try:
+                await self._flush_batch()
+            except Exception as e:
+                logger.error(f"Persistence queue flush error: {e}")
+
+    async def _flush_batch(self):
+        # One batch at a time, so two writes of a document never overtake
+        async with self._flush_lock:
+            if not self.pending:
+                self._has_space.set()
+                return
+            now = time.perf_counter()
+            self.max_queue_lag = max(
+                self.max_queue_lag, now - next(iter(self.pending.values()))[2]
+            )
+            actions = []
+            while self.pending and len(actions) < self.max_batch_size:
+                (index_name, doc_id), (op_type, body, _) = self.pending.popitem(
+                    last=False
+                )
+                actions.append(
+                    {
+                        "op_type": op_type,
+                        "index_name": index_name,
+                        "doc_id": doc_id,
+                        "body": body,
+                    }
+                )
+            self._has_space.set()
+
+            start = time.perf_counter()
+            try:
+                result = await self.es_client.bulk(actions)
+            except Exception as e:
+                # Counted as failed below, like a bulk that returned nothing
+                logger.error(f"Persistence queue bulk error: {e}")
+                result = None
+            latency = time.perf_counter() - start
+
+            self.flushes += 1
+            self.total_flush_latency += latency
+            self.last_flush_latency = latency
+            self.max_flush_latency = max(self.max_flush_latency, latency)
+            failed = self._count_failed(result, len(actions))
+            self.failed += failed
+            self.flushed += len(actions) - failed
+            if failed:
+                logger.warning(f"Persistence queue: {failed} records not saved.")
+
+    @staticmethod
+    def _count_failed(result, size):
+        """Count the failed actions of a bulk response, ``None`` means all."""
+        if not isinstance(result, dict):
+            return size
+        if not result.get("errors"):
+            return 0
+        failed = 0
+        for item in result.get("items", []):
+            if item is None:
+                failed += 1
+            elif isinstance(item, dict) and any(
+                isinstance(v, dict) and v.get("error") for v in item.values()
+            ):
+                failed += 1
+        return failed or size
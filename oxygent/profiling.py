@@ -0,0 +1,135 @@
+"""On-demand sampling profiler of a single trace.
+
+A request sent with ``profile=true`` runs under a :class:`TraceProfiler`:
+
+- a daemon thread samples the stack of the event loop thread every
+  ``interval`` seconds, through ``sys._current_frames``;
+- a sample is kept only when the running asyncio task works for the
+  profiled trace. ``Oxy.execute`` adds the tasks of the trace, so
+  concurrent requests do not show up in its profile;
+- the samples are written in the collapsed-stack format (one
+  ``frame;frame;frame count`` line per stack, readable by flamegraph.pl or
+  speedscope) to ``{cache_dir}/profiles/{trace_id}.collapsed``.
+
+Without a profiled request, the only cost on the hot path is a check of an
+empty dict in ``Oxy.execute``.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import weakref
+from collections import Counter
+
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+# trace_id -> TraceProfiler of the traces being profiled
+active_profilers = {}
+
+
+def get_profile_path(trace_id: str) -> str:
+    return os.path.join(
+        Config.get_cache_save_dir(), "profiles", f"{trace_id}.collapsed"
+    )
+
+
+def watch_current_task(trace_id: str):
+    """Attribute the samples of the current task to ``trace_id`` if it is
+    profiled."""
+    if not active_profilers:
+        return
+    profiler = active_profilers.get(trace_id)
+    if profiler is not None:
+        profiler.tasks.add(asyncio.current_task())
+
+
+def _get_frame_name(code) -> str:
+    return (
+        f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+    )
+
+
+class TraceProfiler:
+    """Sample the event loop thread while the tasks of one trace run.
+
+    Example:
+        >>> async with TraceProfiler(trace_id):
+        ...     await oxy_request.start()
+        >>> # -> {cache_dir}/profiles/{trace_id}.collapsed
+    """
+
+    def __init__(self, trace_id, interval=None, max_stack_depth=None):
+        """Create a profiler, sampling starts on ``__aenter__``.
+
+        Args:
+            trace_id (str): Trace whose tasks are profiled.
+            interval (float): Seconds between two samples.
+            max_stack_depth (int): Innermost frames kept per sample.
+        """
+        self.trace_id = trace_id
+        self.interval = interval or Config.get_profiling_interval()
+        self.max_stack_depth = max_stack_depth or Config.get_profiling_max_stack_depth()
+        self.path = get_profile_path(trace_id)
+        self.tasks = weakref.WeakSet()
+        self.stacks = Counter()
+        self.samples = 0
+        self.skipped = 0
+        self._loop = None
+        self._thread_id = None
+        self._thread = None
+        self._stop = threading.Event()
+
+    async def __aenter__(self):
+        if self.trace_id in active_profilers:
+            raise RuntimeError(f"Trace {self.trace_id} is already profiled")
+        self._loop = asyncio.get_running_loop()
+        self._thread_id = threading.get_ident()
+        self.tasks.add(asyncio.current_task())
+        active_profilers[self.trace_id] = self
+        self._thread = threading.Thread(
+            target=self._run, name=f"profiler-{self.trace_id}", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self._stop.set()
+        active_profilers.pop(self.trace_id, None)
+        await asyncio.to_thread(self._thread.join)
+        try:
+            await asyncio.to_thread(self._write)
+            logger.info(
+                f"Profile of trace {self.trace_id} saved to {self.path} "
+                f"({self.samples} samples)",
+                extra={"trace_id": self.trace_id},
+            )
+        except OSError as e:
+            logger.warning(f"Profile of trace {self.trace_id} not saved: {e}")
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def _sample(self):
+        task = asyncio.current_task(self._loop)
+        if task is None or task not in self.tasks:
+            self.skipped += 1
+            return
+        frame = sys._current_frames().get(self._thread_id)
+        names = []
+        while frame is not None and len(names) < self.max_stack_depth:
+            names.append(_get_frame_name(frame.f_code))
+            frame = frame.f_back
+        if names:
+            self.stacks[";".join(reversed(names))] += 1
+            self.samples += 1
+
+    def _write(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
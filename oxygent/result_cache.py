@@ -0,0 +1,150 @@
+"""Result cache for idempotent tools.
+
+A :class:`ResultCache` maps a callee and its normalised arguments to the
+output of a completed call. It keeps an in-process LRU tier bounded by entry
+count and approximate size, and can optionally share results through the MAS
+``redis_client`` so that other workers reuse them, or keep them in any other
+store with the same ``get``/``set`` methods (see ``llm_cache.SqliteStore``).
+"""
+
+import copy
+import json
+import logging
+import time
+from collections import OrderedDict
+
+from .config import Config
+from .schemas import OxyResponse, OxyState
+from .utils.common_utils import to_json
+from .utils.fingerprint_utils import get_arguments_fingerprint
+
+logger = logging.getLogger(__name__)
+
+
+class ResultCache:
+    """TTL + LRU cache of completed tool outputs.
+
+    Example:
+        >>> cache = ResultCache(ttl=60, max_entries=1024)
+        >>> key = cache.get_key("get_time", {"tz": "UTC"})
+        >>> await cache.set(key, oxy_response)
+        >>> cached_response = await cache.get(key)
+    """
+
+    def __init__(
+        self,
+        ttl,
+        max_entries=1024,
+        max_bytes=16 * 1024 * 1024,
+        redis_client=None,
+        shared_tier="redis",
+    ):
+        """Create an empty cache.
+
+        Args:
+            ttl (float): Seconds an entry stays valid.
+            max_entries (int): Entries kept in process before LRU eviction.
+            max_bytes (int): Approximate bytes of outputs kept in process.
+            redis_client: Optional shared tier with ``get``/``set`` (e.g. the
+                MAS ``redis_client``). Its errors are logged, never raised.
+            shared_tier (str): Name of that tier in ``extra["cache_hit"]``.
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.redis_client = redis_client
+        self.shared_tier = shared_tier
+        # key -> (expire_at, size, output, extra)
+        self.data: OrderedDict = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def get_key(callee, arguments, namespace="result_cache"):
+        fingerprint = get_arguments_fingerprint(arguments)
+        return f"{Config.get_app_name()}:{namespace}:{callee}:{fingerprint}"
+
+    def stats(self):
+        return {
+            "entries": len(self.data),
+            "bytes": self.size,
+            "hits": self.hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def clear(self):
+        self.data.clear()
+        self.size = 0
+
+    async def get(self, key):
+        """Return a fresh ``OxyResponse`` for a cached key, or ``None``."""
+        entry = self.data.get(key)
+        if entry is not None:
+            expire_at, _, output, extra = entry
+            if expire_at > time.time():
+                self.data.move_to_end(key)
+                self.hits += 1
+                return self._to_response(output, extra, "memory")
+            self._pop(key)
+
+        if self.redis_client is not None:
+            try:
+                value = await self.redis_client.get(key)
+            except Exception as e:
+                logger.warning(f"Result cache {self.shared_tier} get failed: {e}")
+                value = None
+            if value:
+                payload = json.loads(value)
+                self._put(key, payload["output"], payload["extra"], len(value))
+                self.redis_hits += 1
+                return self._to_response(
+                    payload["output"], payload["extra"], self.shared_tier
+                )
+
+        self.misses += 1
+        return None
+
+    async def set(self, key, oxy_response: OxyResponse):
+        """Store the output of a completed response; other states are ignored."""
+        if oxy_response.state is not OxyState.COMPLETED:
+            return
+        value = to_json({"output": oxy_response.output, "extra": oxy_response.extra})
+        self._put(
+            key,
+            copy.deepcopy(oxy_response.output),
+            copy.deepcopy(oxy_response.extra),
+            len(value),
+        )
+        if self.redis_client is not None:
+            try:
+                await self.redis_client.set(key, value, ex=max(1, int(self.ttl)))
+            except Exception as e:
+                logger.warning(f"Result cache {self.shared_tier} set failed: {e}")
+
+    def _put(self, key, output, extra, size):
+        if size > self.max_bytes:
+            return
+        self._pop(key)
+        self.data[key] = (time.time() + self.ttl, size, output, extra)
+        self.size += size
+        while len(self.data) > self.max_entries or self.size > self.max_bytes:
+            self._pop(next(iter(self.data)))
+            self.evictions += 1
+
+    def _pop(self, key):
+        entry = self.data.pop(key, None)
+        if entry is not None:
+            self.size -= entry[1]
+
+    @staticmethod
+    def _to_response(output, extra, tier):
+        extra = copy.deepcopy(extra)
+        extra["cache_hit"] = tier
+        return OxyResponse(
+            state=OxyState.COMPLETED, output=copy.deepcopy(output), extra=extra
+        )
@@ -5,6 +5,8 @@ FastAPI routing layer for the OxyGent MAS service.
 This module exposes several HTTP endpoints that support:
     * Health checks and root redirection
     * Retrieval of node‐level execution details stored in Elasticsearch
+    * Prometheus metrics of the running service
+    * Sampled profiles of the traces requested with ``profile=true``
     * Proxying user requests to an LLM provider through the OxyGent agent stack
     * Lightweight persistence for scripted calls (save / list / load)
 
@@ -26,14 +28,17 @@ import traceback
 from datetime import datetime
 
 import aiofiles
+import aiofiles.os
 from fastapi import APIRouter, File, UploadFile
-from fastapi.responses import RedirectResponse
+from fastapi.responses import PlainTextResponse, RedirectResponse
 from pydantic import BaseModel
 
 from .config import Config
 from .databases.db_es import JesEs, LocalEs
 from .db_factory import DBFactory
+from .metrics import registry
 from .oxy_factory import OxyFactory
+from .profiling import get_profile_path
 from .schemas import OxyRequest, WebResponse
 from .utils.data_utils import add_post_and_child_node_ids
 
@@ -65,6 +70,37 @@ def check_alive():
     return {"alive": 1}
 
 
+@router.get("/metrics")
+async def get_metrics():
+    """Expose the in-process metrics in the Prometheus text format.
+
+    Returns:
+        PlainTextResponse: Oxy call counts, latencies, retries and concurrency,
+        MAS task backlogs and DB client latencies.
+    """
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+
+@router.get("/profile")
+async def get_profile(trace_id: str):
+    """Return the sampled profile of a trace requested with ``profile=true``.
+
+    Args:
+        trace_id: Identifier of the profiled trace.
+
+    Returns:
+        PlainTextResponse: Collapsed stacks (``frame;frame count`` per line),
+        readable by flamegraph.pl or speedscope, or a 404 ``WebResponse``.
+    """
+    path = get_profile_path(trace_id)
+    if not re.fullmatch(r"[\w-]+", trace_id) or not (
+        await aiofiles.os.path.exists(path)
+    ):
+        return WebResponse(code=404, message="profile not found").to_dict()
+    async with aiofiles.open(path, "r", encoding="utf-8") as f:
+        return PlainTextResponse(await f.read())
+
+
 @router.post("/upload")
 async def upload_file(file: UploadFile = File(...)):
     # Generate the unique file name
@@ -228,11 +264,15 @@ async def get_task_info(item_id: str):
             and data["_source"]["pre_node_ids"][0] == ""
         ):
             data["_source"]["pre_node_ids"] = []
+        # Phase durations (ms) for the waterfall, absent on older records
+        data["_source"].setdefault("timings", {})
         nodes.append(data["_source"])
     for index, node in enumerate(nodes):
         node["index"] = index
     add_post_and_child_node_ids(nodes)
     task_data = {"nodes": nodes, "trace_id": trace_id}
+    if os.path.exists(get_profile_path(trace_id)):
+        task_data["profile_url"] = f"./profile?trace_id={trace_id}"
     return WebResponse(data=task_data).to_dict()
 
 
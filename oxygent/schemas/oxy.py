@@ -12,14 +12,16 @@ NOTE: The variables difined in this file have meanings as:
 import asyncio
 import copy
 import logging
+import time
 import traceback
 from enum import Enum, auto
 from typing import Any, List, Optional, Union
 
 import shortuuid
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 from ..config import Config
+from ..utils.fingerprint_utils import get_arguments_fingerprint
 
 logger = logging.getLogger(__name__)
 
@@ -95,6 +97,21 @@ class OxyRequest(BaseModel):
     arguments: dict = Field(default_factory=dict)
 
     is_save_history: bool = Field(True, description="whether history is saved")
+    deadline: Optional[float] = Field(
+        None,
+        description="Absolute UNIX time by which the request must finish, "
+        "inherited by child calls",
+    )
+    priority: str = Field(
+        "default",
+        description="Scheduling class of the request (e.g. interactive, batch), "
+        "inherited by child calls",
+    )
+    trace_parent: str = Field(
+        "",
+        description="W3C traceparent of the remote node that called this MAS, "
+        "inherited by child calls",
+    )
 
     shared_data: dict = Field(
         default_factory=dict, description="public data in the scope of a single request"
@@ -105,6 +122,9 @@ class OxyRequest(BaseModel):
     parallel_id: Optional[str] = Field("", description="")
     parallel_dict: Optional[dict] = Field(default_factory=dict, description="")
 
+    # Arguments as received by the callee, fingerprinted on first read
+    _input_snapshot: Optional[dict] = PrivateAttr(None)
+
     @property
     def session_name(self) -> str:  # We use a easy method to create session name
         return self.caller + "__" + self.callee
@@ -132,10 +152,40 @@ class OxyRequest(BaseModel):
                 fields[k] = copy.deepcopy(fields[k], memo)
         return self.__class__(**fields)
 
+    def _derive(self, overridden=()) -> "OxyRequest":
+        """Return a structurally shared copy of the request.
+
+        Scalars, ``mas`` and ``shared_data`` are shared as before. Containers
+        that the child mutates in place get a fresh top level (``arguments``,
+        ``call_stack``, ``node_id_stack`` ...), while the values inside them,
+        e.g. ``short_memory`` or ``tools_description``, stay shared with the
+        parent. Fields listed in ``overridden`` are not copied at all because
+        the caller is about to replace them.
+        """
+        new_instance = self.model_copy()
+        new_instance.parallel_id = ""
+        new_instance.latest_node_ids = []
+        copy_on_write = {
+            "arguments": dict,
+            "call_stack": list,
+            "node_id_stack": list,
+            "root_trace_ids": list,
+            "group_data": dict,
+            "parallel_dict": copy.deepcopy,
+        }
+        for key, copy_func in copy_on_write.items():
+            if key not in overridden:
+                setattr(new_instance, key, copy_func(getattr(self, key)))
+        return new_instance
+
     def clone_with(self, **kwargs) -> "OxyRequest":
-        """Return a deep copy with selected fields overridden.
+        """Return a copy with selected fields overridden.
 
-        This method is *side effect free*: the original request is untouched.
+        This method is *side effect free* for the original request: the child
+        owns its own top-level containers, while large argument payloads are
+        shared with the parent instead of being deep-copied. Payload values
+        should therefore be replaced rather than mutated in place. Use
+        ``copy.deepcopy(req)`` when a fully isolated copy is required.
 
         Examples
         --------
@@ -144,10 +194,12 @@ class OxyRequest(BaseModel):
         ...     arguments={"query": "python asyncio"}
         ... )
         """
-        new_instance = copy.deepcopy(self)
+        new_instance = self._derive(overridden=kwargs.keys())
         # Update defined attributes
         for key, value in kwargs.items():
             if hasattr(new_instance, key):
+                if key == "arguments":
+                    value = dict(value)
                 setattr(new_instance, key, value)
             else:
                 raise AttributeError(
@@ -155,6 +207,20 @@ class OxyRequest(BaseModel):
                 )
         return new_instance
 
+    def set_timeout(self, timeout: float):
+        """Set the deadline of the request ``timeout`` seconds from now.
+
+        The deadline is wall-clock time, so that a client can send it in the
+        request payload. A change of the system clock moves it too.
+        """
+        self.deadline = time.time() + timeout
+
+    def get_remaining_time(self) -> Optional[float]:
+        """Return the seconds left before the deadline, None without one."""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.time())
+
     async def retry_execute(self, oxy, oxy_request=None) -> "OxyResponse":
         """Execute an oxy with automatic retries.
 
@@ -282,10 +348,27 @@ class OxyRequest(BaseModel):
             oxy_request.arguments["agent_name"] = caller_oxy.name
             oxy_request.arguments["top_k"] = caller_oxy.top_k_tools
             oxy_request.arguments["vearch_client"] = self.mas.vearch_client
+        # Bound the call by the remaining budget of the whole request
+        timeout = oxy.timeout
+        remaining = oxy_request.get_remaining_time()
+        if remaining is not None:
+            if remaining <= 0:
+                logger.warning(
+                    f"Deadline reached before {caller_oxy.name} -> {oxy.name}",
+                    extra={
+                        "trace_id": oxy_request.current_trace_id,
+                        "node_id": oxy_request.node_id,
+                    },
+                )
+                return OxyResponse(
+                    state=OxyState.FAILED,
+                    output=f"Executing tool {oxy.name} timed out: deadline reached",
+                )
+            timeout = min(timeout, remaining)
         # Execute the oxy
         try:
             oxy_response = await asyncio.wait_for(
-                oxy.execute(oxy_request), timeout=oxy.timeout
+                oxy.execute(oxy_request), timeout=timeout
             )
             # Process special parameters in response
             if oxy_name == "retrieve_tools":
@@ -331,7 +414,22 @@ class OxyRequest(BaseModel):
         # return await self.retry_execute(oxy, oxy_request)
 
     async def start(self) -> "OxyResponse":
-        return await self.get_oxy(self.callee).execute(self)
+        oxy = self.get_oxy(self.callee)
+        remaining = self.get_remaining_time()
+        if remaining is None:
+            return await oxy.execute(self)
+        try:
+            return await asyncio.wait_for(oxy.execute(self), timeout=remaining)
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"Request to {oxy.name} reached its deadline",
+                extra={"trace_id": self.current_trace_id, "node_id": self.node_id},
+            )
+            return OxyResponse(
+                state=OxyState.FAILED,
+                output=f"Executing {oxy.name} timed out: deadline reached",
+                oxy_request=self,
+            )
 
     async def send_message(self, message):
         if self.mas and message:
@@ -393,6 +491,27 @@ class OxyRequest(BaseModel):
         var_short_memory = "master_short_memory" if master_level else "short_memory"
         return self.arguments.get(var_short_memory, [])
 
+    def snapshot_input(self):
+        """Record the current arguments as the input of this node.
+
+        The snapshot is shallow, so nested containers (memory, messages) that
+        the execution may change in place are fingerprinted now. Arguments
+        made of scalars only are fingerprinted on the first call to
+        :meth:`get_input_md5`, which most executions never make.
+        """
+        self._input_snapshot = dict(self.arguments)
+        self.input_md5 = ""
+        if any(
+            isinstance(v, (list, dict, tuple, set))
+            for v in self._input_snapshot.values()
+        ):
+            self.get_input_md5()
+
+    def get_input_md5(self) -> str:
+        if not self.input_md5 and self._input_snapshot is not None:
+            self.input_md5 = get_arguments_fingerprint(self._input_snapshot)
+        return self.input_md5
+
     def get_request_id(self) -> str:
         """Return the current request_id."""
         return self.request_id
@@ -0,0 +1,248 @@
+"""Semantic cache of agent and LLM answers.
+
+An Oxy with a ``semantic_cache`` answers a paraphrase of a previous query
+with the previous answer:
+
+- the query (``arguments["query"]``, or the last message of an LLM call) is
+  embedded with the embedding stack of :mod:`embedding_cache`;
+- entries are scoped by a context key: the Oxy name, its permitted tools,
+  its ``semantic_cache_context`` and, for LLM calls, the exact messages that
+  precede the last one. Only entries of the same context are searched;
+- the nearest entry is returned when its cosine similarity reaches
+  ``threshold`` and it has not expired or been invalidated.
+
+Lookups and the latency saved by hits are reported on ``/metrics``.
+"""
+
+import copy
+import logging
+import time
+from typing import Callable, Optional
+
+import numpy as np
+
+from . import metrics
+from .embedding_cache import EmbeddingCache
+from .schemas import OxyRequest, OxyResponse, OxyState
+from .utils.fingerprint_utils import get_fingerprint
+
+logger = logging.getLogger(__name__)
+
+
+def get_query_text(oxy_request: OxyRequest) -> tuple:
+    """Return the text to embed for a call, and the messages it follows."""
+    messages = oxy_request.arguments.get("messages")
+    if isinstance(messages, list) and messages:
+        content = messages[-1].get("content", "")
+        if isinstance(content, list):
+            content = " ".join(
+                part.get("text", "") for part in content if isinstance(part, dict)
+            )
+        return str(content), messages[:-1]
+    query = oxy_request.arguments.get("query", "")
+    if isinstance(query, list):
+        query = " ".join(
+            part.get("text", "") for part in query if isinstance(part, dict)
+        )
+    return str(query), []
+
+
+class SemanticCache:
+    """In-process vector index of previous answers.
+
+    Example:
+        >>> cache = SemanticCache(threshold=0.9, ttl=3600)
+        >>> oxy.ReActAgent(name="faq_agent", ..., semantic_cache=cache)
+        >>> cache.invalidate(lambda entry: "price" in entry["query"])
+    """
+
+    def __init__(
+        self,
+        threshold=0.92,
+        ttl=3600,
+        max_entries=4096,
+        embed: Optional[Callable] = None,
+        validator: Optional[Callable] = None,
+    ):
+        """Create an empty cache.
+
+        Args:
+            threshold (float): Minimum cosine similarity of a hit.
+            ttl (float): Seconds an answer stays valid.
+            max_entries (int): Answers kept before the oldest ones are evicted.
+            embed: Async function from a text to its vector, the
+                ``EmbeddingCache`` of the vearch config by default.
+            validator: Optional function called with a hit entry; returning
+                False invalidates the entry and makes the lookup a miss.
+        """
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.embed = embed
+        self.validator = validator
+        # context key -> list of entries {query, output, extra, vector, ...}
+        self.entries: dict = {}
+        # context key -> matrix of the entry vectors, rebuilt after a change
+        self._matrices: dict = {}
+        self._embedding_cache = None
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+
+    def get_context_key(self, oxy, oxy_request: OxyRequest) -> tuple:
+        """Return the text to embed and the context key of a call."""
+        text, previous_messages = get_query_text(oxy_request)
+        context_key = get_fingerprint(
+            {
+                "oxy": oxy.name,
+                "tools": sorted(oxy.permitted_tool_name_list),
+                "context": oxy.semantic_cache_context,
+                "messages": previous_messages,
+            }
+        )
+        return text, context_key
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": sum(len(entries) for entries in self.entries.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "saved_seconds": self.saved_seconds,
+        }
+
+    def clear(self):
+        self.entries.clear()
+        self._matrices.clear()
+
+    def invalidate(self, predicate: Optional[Callable] = None, context_key=None):
+        """Drop the entries matching ``predicate`` and/or ``context_key``.
+
+        Returns:
+            int: Number of entries dropped.
+        """
+        dropped = 0
+        for key in list(self.entries):
+            if context_key is not None and key != context_key:
+                continue
+            kept = [
+                e
+                for e in self.entries[key]
+                if predicate is not None and not predicate(e)
+            ]
+            dropped += len(self.entries[key]) - len(kept)
+            self._set_entries(key, kept)
+        return dropped
+
+    async def lookup(self, text, context_key, oxy_name="") -> Optional[OxyResponse]:
+        """Return the cached answer nearest to ``text``, or None."""
+        entries = self.entries.get(context_key)
+        vector = await self._embed(text) if entries else None
+        if vector is None:
+            return self._record_miss(oxy_name)
+
+        matrix = self._matrices.get(context_key)
+        if matrix is None:
+            matrix = self._matrices[context_key] = np.stack(
+                [e["vector"] for e in entries]
+            )
+        similarities = matrix @ vector
+        now = time.time()
+        hit, stale = None, []
+        for index in np.argsort(-similarities):
+            if similarities[index] < self.threshold:
+                break
+            entry = entries[index]
+            if entry["expire_at"] <= now or (
+                self.validator is not None and not self.validator(entry)
+            ):
+                stale.append(entry)
+                continue
+            hit = entry, float(similarities[index])
+            break
+        if stale:
+            self.invalidate(lambda e: any(e is s for s in stale), context_key)
+        if hit is None:
+            return self._record_miss(oxy_name)
+
+        entry, similarity = hit
+        self.hits += 1
+        self.saved_seconds += entry["latency"]
+        metrics.semantic_cache_lookups.inc(oxy_name, "hit")
+        metrics.semantic_cache_saved_seconds.inc(oxy_name, amount=entry["latency"])
+        extra = copy.deepcopy(entry["extra"])
+        extra.update(
+            {
+                "cache_hit": "semantic",
+                "cache_similarity": round(similarity, 4),
+                "cache_query": entry["query"],
+            }
+        )
+        return OxyResponse(
+            state=OxyState.COMPLETED,
+            output=copy.deepcopy(entry["output"]),
+            extra=extra,
+        )
+
+    async def add(self, text, context_key, oxy_response: OxyResponse, latency=0.0):
+        """Store the answer of a completed call; other states are ignored."""
+        if oxy_response.state is not OxyState.COMPLETED or not text:
+            return
+        vector = await self._embed(text)
+        if vector is None:
+            return
+        entries = self.entries.get(context_key, [])
+        entries.append(
+            {
+                "query": text,
+                "output": copy.deepcopy(oxy_response.output),
+                "extra": copy.deepcopy(
+                    {k: v for k, v in oxy_response.extra.items() if k != "timings"}
+                ),
+                "vector": vector,
+                "latency": latency,
+                "create_time": time.time(),
+                "expire_at": time.time() + self.ttl,
+            }
+        )
+        self._set_entries(context_key, entries)
+        self._evict()
+
+    def _record_miss(self, oxy_name):
+        self.misses += 1
+        metrics.semantic_cache_lookups.inc(oxy_name, "miss")
+        return None
+
+    def _set_entries(self, context_key, entries):
+        self._matrices.pop(context_key, None)
+        if entries:
+            self.entries[context_key] = entries
+        else:
+            self.entries.pop(context_key, None)
+
+    def _evict(self):
+        size = sum(len(entries) for entries in self.entries.values())
+        if size > self.max_entries:
+            # Entries are appended in creation order, the oldest comes first
+            context_key = min(
+                self.entries, key=lambda key: self.entries[key][0]["create_time"]
+            )
+            self._set_entries(context_key, self.entries[context_key][1:])
+
+    async def _embed(self, text):
+        try:
+            if self.embed is not None:
+                vector = await self.embed(text)
+            else:
+                if self._embedding_cache is None:
+                    self._embedding_cache = EmbeddingCache()
+                vector = await self._embedding_cache.get(text)
+        except Exception as e:
+            logger.warning(f"Semantic cache embedding failed: {e}")
+            return None
+        if vector is None:
+            return None
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
@@ -0,0 +1,258 @@
+"""Token accounting for LLM prompts.
+
+Agents assemble a prompt from the system prompt (tool descriptions included),
+the short memory of the session, the query and the ReAct memory of the
+current call. A :class:`TokenCounter` counts the tokens of these messages:
+
+- with ``func_tokenize``, a function from a text to its tokens (or to their
+  count) matching the served model, e.g. a Hugging Face tokenizer's
+  ``encode``;
+- otherwise with ``tiktoken`` when it is installed. Its encoding files may
+  be downloaded on first use, so they are loaded off the event loop: by
+  :func:`load_tiktoken_encoding` when an LLM starts, or in a thread on the
+  first count, which is approximated meanwhile;
+- otherwise with :func:`approximate_token_count`, which counts CJK characters
+  one by one and splits other text like a BPE tokenizer roughly does.
+
+Counts are cached per string, since the same system prompt and history are
+counted again at every round of an agent. :func:`pack_messages` then fits a
+prompt into a token budget.
+"""
+
+import asyncio
+import logging
+import re
+import threading
+from collections import OrderedDict
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# Tokens added by the chat template around each message and before the reply
+MESSAGE_OVERHEAD = 3
+REPLY_OVERHEAD = 3
+# Tokens counted for an image, video or file part of a multimodal message
+MEDIA_PART_TOKENS = 85
+
+_CJK_PATTERN = re.compile(
+    r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff\uff00-\uffef]"
+)
+_PIECE_PATTERN = re.compile(r"[^\W\d_]+|\d{1,3}|\S")
+
+# model name -> tiktoken encoding, None when it cannot be loaded
+_encodings = {}
+# model names whose encoding is being loaded
+_loading = set()
+
+
+def approximate_token_count(text: str) -> int:
+    """Estimate the tokens of a text without a tokenizer.
+
+    Each CJK character is a token, a run of letters is a token per 4
+    characters, digits go by groups of 3 and every other symbol is a token.
+    """
+    if not text:
+        return 0
+    count = len(_CJK_PATTERN.findall(text))
+    for piece in _PIECE_PATTERN.findall(_CJK_PATTERN.sub(" ", text)):
+        count += (len(piece) + 3) // 4 if piece[0].isalpha() else 1
+    return count
+
+
+def _load_tiktoken_encoding(model_name: str):
+    try:
+        try:
+            encoding = tiktoken.encoding_for_model(model_name)
+        except KeyError:
+            encoding = tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        # The encoding files are downloaded on first use
+        logger.warning(f"Cannot load tiktoken encoding, approximating: {e}")
+        encoding = None
+    _encodings[model_name] = encoding
+    _loading.discard(model_name)
+    return encoding
+
+
+async def load_tiktoken_encoding(model_name: str):
+    """Load the tiktoken encoding of a model in a worker thread."""
+    if tiktoken is None or model_name in _encodings:
+        return _encodings.get(model_name)
+    _loading.add(model_name)
+    return await asyncio.get_running_loop().run_in_executor(
+        None, _load_tiktoken_encoding, model_name
+    )
+
+
+def _get_tiktoken_encoding(model_name: str):
+    """Return the loaded encoding of a model, None while it is not loaded."""
+    if tiktoken is None:
+        return None
+    if model_name not in _encodings and model_name not in _loading:
+        _loading.add(model_name)
+        threading.Thread(
+            target=_load_tiktoken_encoding, args=(model_name,), daemon=True
+        ).start()
+    return _encodings.get(model_name)
+
+
+class TokenCounter:
+    """Count the tokens of texts and chat messages, with a per-string cache.
+
+    Example:
+        >>> counter = TokenCounter(model_name="gpt-4o")
+        >>> counter.count("你好, world")
+        >>> counter.count_messages([{"role": "user", "content": "Hi"}])
+    """
+
+    def __init__(
+        self,
+        func_tokenize: Optional[Callable] = None,
+        model_name: str = "",
+        max_cached: int = 8192,
+    ):
+        """Create a counter.
+
+        Args:
+            func_tokenize: Function from a text to its tokens or their count.
+            model_name (str): Model whose tiktoken encoding is used when there
+                is no ``func_tokenize``.
+            max_cached (int): Strings whose count is kept, in LRU order.
+        """
+        self.func_tokenize = func_tokenize
+        self.model_name = model_name
+        self.max_cached = max_cached
+        self._cache = OrderedDict()
+
+    @property
+    def is_exact(self) -> bool:
+        """Whether counts come from a real tokenizer."""
+        return (
+            self.func_tokenize is not None
+            or _get_tiktoken_encoding(self.model_name) is not None
+        )
+
+    def _is_settled(self) -> bool:
+        """Whether the way texts are counted will not change any more."""
+        return (
+            self.func_tokenize is not None
+            or tiktoken is None
+            or self.model_name in _encodings
+        )
+
+    def _count(self, text: str) -> int:
+        if self.func_tokenize is not None:
+            tokens = self.func_tokenize(text)
+            return tokens if isinstance(tokens, int) else len(tokens)
+        encoding = _get_tiktoken_encoding(self.model_name)
+        if encoding is not None:
+            return len(encoding.encode(text, disallowed_special=()))
+        return approximate_token_count(text)
+
+    def count(self, text) -> int:
+        if not text:
+            return 0
+        text = str(text)
+        count = self._cache.get(text)
+        if count is not None:
+            self._cache.move_to_end(text)
+            return count
+        count = self._count(text)
+        if not self._is_settled():
+            # Approximated while the encoding loads, counted again later
+            return count
+        self._cache[text] = count
+        if len(self._cache) > self.max_cached:
+            self._cache.popitem(last=False)
+        return count
+
+    def count_message(self, message: dict) -> int:
+        """Tokens of a chat message, multimodal content parts included."""
+        content = message.get("content", "")
+        if isinstance(content, list):
+            count = 0
+            for part in content:
+                if isinstance(part, dict) and part.get("type", "text") != "text":
+                    count += MEDIA_PART_TOKENS
+                else:
+                    text = part.get("text", "") if isinstance(part, dict) else part
+                    count += self.count(text)
+        else:
+            count = self.count(content)
+        return count + MESSAGE_OVERHEAD
+
+    def count_messages(self, messages: List[dict]) -> int:
+        """Tokens of a whole prompt."""
+        return sum(self.count_message(m) for m in messages) + REPLY_OVERHEAD
+
+
+# Counter of the agents whose LLM has no tokenizer of its own
+default_token_counter = TokenCounter()
+
+
+def _chunk_exchanges(messages: List[dict]) -> List[List[dict]]:
+    """Split messages into exchanges, each starting at a non-assistant message."""
+    exchanges = []
+    for message in messages:
+        if exchanges and message.get("role") == "assistant":
+            exchanges[-1].append(message)
+        else:
+            exchanges.append([message])
+    return exchanges
+
+
+def pack_messages(
+    counter: TokenCounter,
+    max_tokens: int,
+    system: List[dict],
+    short_memory: List[dict],
+    query: List[dict],
+    react_memory: List[dict] = (),
+) -> List[dict]:
+    """Fit the prompt of an agent into ``max_tokens``.
+
+    The system messages and the query are always kept. The rest of the
+    budget goes to the ReAct memory of the current call, then to the short
+    memory of the session, most recent first. Exchanges (a question and the
+    answers that follow it, or a tool call and its observation) are kept or
+    dropped whole, so the prompt never starts in the middle of one.
+
+    Returns:
+        list: system + kept short memory + query + kept ReAct memory.
+    """
+    budget = (
+        max_tokens
+        - REPLY_OVERHEAD
+        - sum(counter.count_message(m) for m in list(system) + list(query))
+    )
+    if budget < 0:
+        logger.warning(
+            f"System prompt and query exceed the budget of {max_tokens} tokens "
+            f"by {-budget}"
+        )
+
+    def take_recent(exchanges):
+        nonlocal budget
+        kept = []
+        for exchange in reversed(exchanges):
+            tokens = sum(counter.count_message(m) for m in exchange)
+            if tokens > budget:
+                break
+            budget -= tokens
+            kept = exchange + kept
+        return kept
+
+    react_memory = list(react_memory)
+    kept_react = take_recent(
+        [react_memory[i : i + 2] for i in range(0, len(react_memory), 2)]
+    )
+    kept_short = take_recent(_chunk_exchanges(short_memory))
+    dropped = len(react_memory) + len(short_memory) - len(kept_react) - len(kept_short)
+    if dropped:
+        logger.info(f"Dropped {dropped} memory messages to fit {max_tokens} tokens")
+    return list(system) + kept_short + list(query) + kept_react
@@ -0,0 +1,250 @@
+"""Span export of OxyGent traces.
+
+Each ``Oxy.execute`` ends as one span in the OpenTelemetry (OTLP-JSON)
+format, so OxyGent traces can be correlated with the rest of a stack:
+
+- span ids are derived from ``node_id`` and trace ids from
+  ``current_trace_id``, so parent links need no shared state;
+- a :class:`BatchSpanProcessor` queues finished spans and hands them in
+  batches to an exporter in a worker thread, off the event loop;
+- :class:`OTLPJsonFileExporter` appends OTLP-JSON lines to a local file,
+  the format read by the file receiver of the OpenTelemetry collector. Any
+  object with ``export(spans)`` can be used instead;
+- the W3C ``traceparent`` of a node is sent by ``SSEOxyGent``, so the nodes
+  of a remote MAS join the trace of their caller.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import deque
+
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+TRACEPARENT_PATTERN = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+
+# OTLP span kind and status codes
+SPAN_KIND_INTERNAL = 1
+STATUS_CODE_OK = 1
+STATUS_CODE_ERROR = 2
+
+
+def get_otel_trace_id(trace_id: str) -> str:
+    return hashlib.md5(trace_id.encode()).hexdigest()
+
+
+def get_otel_span_id(node_id: str) -> str:
+    return hashlib.md5(node_id.encode()).hexdigest()[:16]
+
+
+def parse_traceparent(traceparent: str):
+    """Return the (trace_id, span_id) of a W3C traceparent, or None."""
+    match = TRACEPARENT_PATTERN.match((traceparent or "").strip().lower())
+    return match.groups() if match else None
+
+
+def get_traceparent(oxy_request) -> str:
+    """Return the W3C traceparent of the node of ``oxy_request``."""
+    trace_id, _ = _get_trace_context(oxy_request)
+    return f"00-{trace_id}-{get_otel_span_id(oxy_request.node_id)}-01"
+
+
+def _get_trace_context(oxy_request):
+    """Return the OTLP trace id and parent span id of a node.
+
+    A node called by a remote MAS (``trace_parent`` set, called by "user")
+    is the child of the remote node, the other ones of their father node.
+    """
+    remote = parse_traceparent(oxy_request.trace_parent)
+    trace_id = remote[0] if remote else get_otel_trace_id(oxy_request.current_trace_id)
+    if remote and oxy_request.caller_category == "user":
+        return trace_id, remote[1]
+    if oxy_request.father_node_id:
+        return trace_id, get_otel_span_id(oxy_request.father_node_id)
+    return trace_id, ""
+
+
+def _to_attribute(key, value):
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+def build_span(oxy, oxy_request, oxy_response, timings) -> dict:
+    """Build the OTLP-JSON span of a finished ``Oxy.execute``."""
+    trace_id, parent_span_id = _get_trace_context(oxy_request)
+    end_time = time.time()
+    start_time = timings.get("start_time", end_time)
+    attributes = {
+        "oxy.callee": oxy_request.callee,
+        "oxy.caller": oxy_request.caller,
+        "oxy.category": oxy.category,
+        "oxy.state": oxy_response.state.name,
+        "oxy.attempts": len(timings.get("execute", [])),
+        "oxy.trace_id": oxy_request.current_trace_id,
+        "oxy.node_id": oxy_request.node_id,
+    }
+    if oxy_request.pre_node_ids and isinstance(oxy_request.pre_node_ids, list):
+        attributes["oxy.pre_node_ids"] = ",".join(
+            filter(None, oxy_request.pre_node_ids)
+        )
+    usage = oxy_response.extra.get("usage")
+    if isinstance(usage, dict):
+        for key, value in usage.items():
+            if isinstance(value, (int, float)):
+                attributes[f"llm.usage.{key}"] = value
+    for phase in ("queue_wait", "pre_process", "post_process", "send"):
+        if phase in timings:
+            attributes[f"oxy.timings.{phase}_ms"] = float(timings[phase])
+    is_failed = oxy_response.state.name == "FAILED"
+    span = {
+        "traceId": trace_id,
+        "spanId": get_otel_span_id(oxy_request.node_id),
+        "name": oxy_request.callee or oxy.name,
+        "kind": SPAN_KIND_INTERNAL,
+        "startTimeUnixNano": str(int(start_time * 1e9)),
+        "endTimeUnixNano": str(int(end_time * 1e9)),
+        "attributes": [_to_attribute(k, v) for k, v in attributes.items()],
+        "status": {"code": STATUS_CODE_ERROR if is_failed else STATUS_CODE_OK},
+    }
+    if parent_span_id:
+        span["parentSpanId"] = parent_span_id
+    if is_failed:
+        span["status"]["message"] = str(oxy_response.output)[:256]
+    return span
+
+
+class OTLPJsonFileExporter:
+    """Append spans to a file, one OTLP-JSON ``ExportTraceServiceRequest`` per
+    line.
+
+    ``export`` is blocking and runs in a worker thread of the processor.
+    """
+
+    def __init__(self, path=None, service_name=None):
+        self.path = path or os.path.join(Config.get_cache_save_dir(), "traces.jsonl")
+        self.service_name = service_name or Config.get_app_name()
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+    def export(self, spans: list):
+        line = json.dumps(
+            {
+                "resourceSpans": [
+                    {
+                        "resource": {
+                            "attributes": [
+                                _to_attribute("service.name", self.service_name)
+                            ]
+                        },
+                        "scopeSpans": [{"scope": {"name": "oxygent"}, "spans": spans}],
+                    }
+                ]
+            },
+            ensure_ascii=False,
+        )
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+    def shutdown(self):
+        pass
+
+
+class BatchSpanProcessor:
+    """Queue finished spans and export them in batches off the event loop.
+
+    Example:
+        >>> processor = BatchSpanProcessor(OTLPJsonFileExporter())
+        >>> processor.on_end(span)
+        >>> await processor.shutdown()  # exports what is left
+    """
+
+    def __init__(
+        self, exporter, max_queue_size=4096, max_batch_size=512, schedule_delay=1.0
+    ):
+        """Create an empty processor, its exporting task starts with the first
+        span.
+
+        Args:
+            exporter: Object with a blocking ``export(spans)`` method and an
+                optional ``shutdown()``.
+            max_queue_size (int): Spans kept before new ones are dropped.
+            max_batch_size (int): Spans handed to one ``export`` call.
+            schedule_delay (float): Seconds a span may wait for a full batch.
+        """
+        self.exporter = exporter
+        self.max_queue_size = max_queue_size
+        self.max_batch_size = max_batch_size
+        self.schedule_delay = schedule_delay
+        self.spans = deque()
+        self.exported = 0
+        self.dropped = 0
+        self.failed = 0
+        self._task = None
+        self._is_shutdown = False
+        self._wakeup = asyncio.Event()
+
+    def on_end(self, span: dict):
+        """Queue a finished span, never blocking the caller."""
+        if self._is_shutdown:
+            return
+        if len(self.spans) >= self.max_queue_size:
+            self.dropped += 1
+            return
+        self.spans.append(span)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        if len(self.spans) >= self.max_batch_size:
+            self._wakeup.set()
+
+    async def force_flush(self):
+        """Export every queued span now."""
+        while self.spans:
+            await self._export_batch()
+
+    async def shutdown(self):
+        self._is_shutdown = True
+        self._wakeup.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        await self.force_flush()
+        shutdown = getattr(self.exporter, "shutdown", None)
+        if shutdown is not None:
+            await asyncio.to_thread(shutdown)
+
+    async def _run(self):
+        while not self._is_shutdown:
+            if len(self.spans) < self.max_batch_size:
+                try:
+                    await asyncio.wait_for(
+                        self._wakeup.wait(), timeout=self.schedule_delay
+                    )
+                except asyncio.TimeoutError:
+                    pass
+            self._wakeup.clear()
+            await self._export_batch()
+
+    async def _export_batch(self):
+        batch = []
+        while self.spans and len(batch) < self.max_batch_size:
+            batch.append(self.spans.popleft())
+        if not batch:
+            return
+        try:
+            await asyncio.to_thread(self.exporter.export, batch)
+            self.exported += len(batch)
+        except Exception as e:
+            self.failed += len(batch)
+            logger.warning(f"Span export failed: {e}")
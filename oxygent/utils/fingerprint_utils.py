@@ -0,0 +1,112 @@
+"""Fast structural fingerprints of call arguments.
+
+The fingerprint of an argument dict is used as ``input_md5`` to match nodes of
+a reference trace on restart. It replaces ``get_md5(to_json(arguments))``:
+
+- the hash is always ``xxh3_128``, so every process computes the same keys;
+- containers are hashed Merkle-style from the digests of their items, so no
+  JSON document of the whole input is ever built;
+- digests of large strings (message contents, documents ...) are cached by
+  identity, so a memory list shared across rounds is re-fingerprinted in time
+  proportional to its number of items, not to its size in bytes. The cache
+  keeps its strings alive, so it is bounded by their total size too.
+"""
+
+import sys
+from collections import OrderedDict
+
+import xxhash
+
+# Strings shorter than this are hashed directly, caching them costs more
+MIN_CACHED_STR_LEN = 256
+MAX_CACHED_STRS = 4096
+# Bound on the size of the strings kept alive by the cache
+MAX_CACHED_BYTES = 64 * 1024 * 1024
+
+# id(str) -> (str, digest). The string is kept alive so its id is not reused.
+_str_digest_cache: "OrderedDict[int, tuple]" = OrderedDict()
+_str_digest_cache_bytes = 0
+
+
+def _new_hasher():
+    return xxhash.xxh3_128()
+
+
+def _hash_bytes(data: bytes) -> bytes:
+    hasher = _new_hasher()
+    hasher.update(data)
+    return hasher.digest()
+
+
+def _str_digest(value: str) -> bytes:
+    global _str_digest_cache_bytes
+    if len(value) < MIN_CACHED_STR_LEN:
+        return _hash_bytes(b"s" + value.encode("utf-8", "surrogatepass"))
+    key = id(value)
+    cached = _str_digest_cache.get(key)
+    if cached is not None and cached[0] is value:
+        _str_digest_cache.move_to_end(key)
+        return cached[1]
+    digest = _hash_bytes(b"s" + value.encode("utf-8", "surrogatepass"))
+    size = sys.getsizeof(value)
+    if size > MAX_CACHED_BYTES:
+        return digest
+    _str_digest_cache[key] = (value, digest)
+    _str_digest_cache_bytes += size
+    while (
+        len(_str_digest_cache) > MAX_CACHED_STRS
+        or _str_digest_cache_bytes > MAX_CACHED_BYTES
+    ):
+        evicted, _ = _str_digest_cache.popitem(last=False)[1]
+        _str_digest_cache_bytes -= sys.getsizeof(evicted)
+    return digest
+
+
+def _digest(value) -> bytes:
+    """Return the 16-byte digest of a JSON-like value."""
+    if isinstance(value, str):
+        return _str_digest(value)
+    if value is None or isinstance(value, (bool, int, float)):
+        return _hash_bytes(f"{type(value).__name__}:{value!r}".encode())
+    if isinstance(value, dict):
+        hasher = _new_hasher()
+        hasher.update(b"d")
+        for k in sorted(value, key=str):
+            hasher.update(_digest(str(k)))
+            hasher.update(_digest(value[k]))
+        return hasher.digest()
+    if isinstance(value, (list, tuple)):
+        hasher = _new_hasher()
+        hasher.update(b"l")
+        for item in value:
+            hasher.update(_digest(item))
+        return hasher.digest()
+    if isinstance(value, (set, frozenset)):
+        hasher = _new_hasher()
+        hasher.update(b"e")
+        for item_digest in sorted(_digest(item) for item in value):
+            hasher.update(item_digest)
+        return hasher.digest()
+    if isinstance(value, bytes):
+        return _hash_bytes(b"b" + value)
+    # Same fallback as to_json(default=str)
+    return _str_digest(str(value))
+
+
+def get_fingerprint(value) -> str:
+    """Return the hex fingerprint of a JSON-like value."""
+    return _digest(value).hex()
+
+
+def get_arguments_fingerprint(arguments: dict) -> str:
+    """Return the fingerprint of the JSON-like arguments of a call.
+
+    Only plain data values take part, as in the former md5 of the arguments.
+    """
+    return get_fingerprint(
+        {
+            k: v
+            for k, v in arguments.items()
+            if isinstance(v, (int, str, float, list, dict, tuple, set))
+        }
+    )
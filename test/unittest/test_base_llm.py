@@ -2,10 +2,13 @@
 Unit tests for BaseLLM
 """
 
+import asyncio
+from collections import deque
 from unittest.mock import AsyncMock, patch
 
 import pytest
 
+from oxygent import metrics
 from oxygent.oxy.llms.base_llm import BaseLLM
 from oxygent.schemas import OxyRequest, OxyResponse, OxyState
 
@@ -93,3 +96,86 @@ async def test_get_messages_url_to_base64(monkeypatch, llm, oxy_request):
 
         assert blob[1]["image_url"]["url"] == "img64"
         assert blob[2]["video_url"]["url"] == "vid64"
+
+
+# ───────────────────────────────────────────────────────────────────────────────
+# ❹ Hedged requests
+# ───────────────────────────────────────────────────────────────────────────────
+class SlowLLM(BaseLLM):
+    """Answer after the next delay of ``delays``, failing on a negative one."""
+
+    delays: list = []
+    started: int = 0
+    cancelled: int = 0
+
+    async def _execute(self, oxy_request: OxyRequest) -> OxyResponse:
+        call = self.started
+        self.started += 1
+        delay = self.delays[call] if call < len(self.delays) else 0
+        try:
+            await asyncio.sleep(abs(delay))
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if delay < 0:
+            raise RuntimeError(f"call {call} failed")
+        return OxyResponse(state=OxyState.COMPLETED, output=f"call {call}")
+
+
+def make_hedged_llm(**kwargs):
+    params = {
+        "name": "hedged_llm",
+        "is_hedge_request": True,
+        "hedge_min_samples": 3,
+        "hedge_min_delay": 0.01,
+        "hedge_budget": 0.5,
+    }
+    params.update(kwargs)
+    llm = SlowLLM(**params)
+    llm._hedge_latencies = deque([0.001] * 3, maxlen=llm.hedge_window)
+    llm._hedged_calls = deque([False] * 3, maxlen=llm.hedge_window)
+    return llm
+
+
+@pytest.mark.asyncio
+async def test_slow_call_is_hedged_and_loser_cancelled(oxy_request):
+    llm = make_hedged_llm(delays=[1.0, 0.0])
+    won = metrics.llm_hedges.get("hedged_llm", "won")
+
+    resp = await llm._execute_once(oxy_request)
+
+    assert resp.output == "call 1"
+    assert resp.extra["hedge"] == {"delay": 0.01, "sent": 1, "won": True}
+    assert llm.cancelled == 1
+    assert metrics.llm_hedges.get("hedged_llm", "won") == won + 1
+
+
+@pytest.mark.asyncio
+async def test_failed_first_finisher_lets_the_other_win(oxy_request):
+    llm = make_hedged_llm(delays=[0.05, -0.02])
+    resp = await llm._execute_once(oxy_request)
+    assert resp.output == "call 0"
+    assert resp.extra["hedge"]["won"] is False
+
+    llm = make_hedged_llm(delays=[-0.05, -0.06])
+    with pytest.raises(RuntimeError, match="call 0"):
+        await llm._execute_once(oxy_request)
+
+
+@pytest.mark.asyncio
+async def test_no_hedge_when_fast_unmeasured_streaming_or_over_budget(oxy_request):
+    llm = make_hedged_llm(delays=[0.0])
+    assert "hedge" not in (await llm._execute_once(oxy_request)).extra
+
+    llm = make_hedged_llm(delays=[0.05], hedge_min_samples=100)
+    assert "hedge" not in (await llm._execute_once(oxy_request)).extra
+
+    llm = make_hedged_llm(delays=[0.05], llm_params={"stream": True})
+    assert "hedge" not in (await llm._execute_once(oxy_request)).extra
+
+    llm = make_hedged_llm(delays=[0.05, 0.05, 0.05])
+    llm.hedge_budget = 0.25  # one hedge per 4 calls
+    await llm._execute_once(oxy_request)
+    resp = await llm._execute_once(oxy_request)
+    assert "hedge" not in resp.extra
+    assert llm.started == 3
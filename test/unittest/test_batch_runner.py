@@ -0,0 +1,155 @@
+"""
+Unit tests for BatchRunner
+"""
+
+import asyncio
+import json
+import logging
+
+import pytest
+
+from oxygent.batch_runner import BatchRunner, get_percentile
+from oxygent.mas import MAS
+from oxygent.schemas import OxyResponse, OxyState
+
+
+class DummyChat:
+    """Answer each query after a short delay, failing on "boom"."""
+
+    def __init__(self, delay=0.01):
+        self.delay = delay
+        self.running = 0
+        self.max_running = 0
+        self.payloads = []
+
+    async def __call__(self, payload=None):
+        self.payloads.append(payload)
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(self.delay)
+            if payload["query"] == "boom":
+                raise RuntimeError("boom")
+            return OxyResponse(
+                state=OxyState.COMPLETED, output=f"answer to {payload['query']}"
+            )
+        finally:
+            self.running -= 1
+
+
+class DummyMAS:
+    def __init__(self, chat):
+        self.chat_with_agent = chat
+
+
+def read_records(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Runner
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.mark.asyncio
+async def test_runs_with_bounded_concurrency(tmp_path):
+    chat = DummyChat()
+
+    def queries():
+        for i in range(50):
+            yield f"q{i}"
+
+    runner = BatchRunner(chat, concurrency=4, output_path=str(tmp_path / "out.jsonl"))
+    report = await runner.run(queries())
+
+    assert chat.max_running == 4
+    assert report["total"] == report["completed"] == 50
+    assert report["throughput"] > 0
+    assert 0 < report["latency"]["p50"] <= report["latency"]["p99"]
+
+    records = read_records(tmp_path / "out.jsonl")
+    assert sorted(int(r["id"]) for r in records) == list(range(50))
+    assert all(r["trace_id"] and r["state"] == "COMPLETED" for r in records)
+    assert {r["trace_id"] for r in records} == {
+        p["current_trace_id"] for p in chat.payloads
+    }
+    assert all(p["priority"] == "batch" for p in chat.payloads)
+
+
+@pytest.mark.asyncio
+async def test_source_is_read_as_it_is_consumed():
+    chat = DummyChat(delay=0.05)
+    pulled = []
+
+    def queries():
+        for i in range(100):
+            pulled.append(i)
+            yield f"q{i}"
+
+    runner = BatchRunner(chat, concurrency=2)
+    task = asyncio.create_task(runner.run(queries()))
+    await asyncio.sleep(0.02)
+    assert len(pulled) <= 2 + 2 * 2 + 1
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+
+@pytest.mark.asyncio
+async def test_restart_skips_completed_items(tmp_path):
+    output_path = tmp_path / "out.jsonl"
+    source = tmp_path / "queries.jsonl"
+    source.write_text(
+        "\n".join(
+            json.dumps({"request_id": f"r{i}", "body": q})
+            for i, q in enumerate(["a", "boom", "c"])
+        )
+    )
+    runner = BatchRunner(
+        DummyChat(),
+        concurrency=2,
+        output_path=str(output_path),
+        id_key="request_id",
+        query_key="body",
+    )
+    report = await runner.run(str(source))
+    assert (report["completed"], report["failed"]) == (2, 1)
+    failed = [r for r in read_records(output_path) if r["state"] == "FAILED"]
+    assert failed[0]["id"] == "r1" and "boom" in failed[0]["error"]
+
+    # A crash cut the last line: it is ignored, and the failed item retried
+    with open(output_path, "a", encoding="utf-8") as f:
+        f.write('{"id": "r2", "sta')
+    chat = DummyChat()
+    runner.func_run = chat
+    report = await runner.run(str(source))
+    assert report["skipped"] == 2
+    assert [p["query"] for p in chat.payloads] == ["boom"]
+    last_line = output_path.read_text(encoding="utf-8").splitlines()[-1]
+    assert json.loads(last_line)["id"] == "r1"
+
+
+def test_percentile():
+    assert get_percentile([], 0.5) == 0.0
+    assert get_percentile([1, 2, 3, 4, 5], 0.5) == 3
+    assert get_percentile([1, 2, 3, 4, 5], 0.99) == 4
+    with pytest.raises(ValueError):
+        BatchRunner(DummyChat(), concurrency=0)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# MAS integration
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.mark.asyncio
+async def test_start_batch_processing_keeps_input_order(monkeypatch):
+    monkeypatch.setattr("oxygent.mas.logger", logging.getLogger(__name__))
+    chat = DummyChat()
+    mas = DummyMAS(chat)
+    queries = [f"q{i}" for i in range(10)] + ["boom"]
+
+    outputs = await MAS.start_batch_processing(mas, queries, concurrency=3)
+    assert outputs[:10] == [f"answer to q{i}" for i in range(10)]
+    assert "boom" in outputs[10]
+    assert chat.max_running == 3
+
+    outputs = await MAS.start_batch_processing(mas, ["x"], return_trace_id=True)
+    assert outputs[0]["output"] == "answer to x" and outputs[0]["trace_id"]
@@ -0,0 +1,78 @@
+"""
+Unit tests for oxygent.utils.fingerprint_utils
+"""
+
+from oxygent.utils import fingerprint_utils
+from oxygent.utils.fingerprint_utils import (
+    get_arguments_fingerprint,
+    get_fingerprint,
+)
+
+
+def make_memory(n=200):
+    return [
+        {"role": "user", "content": f"question {i} " + "x" * 2000} for i in range(n)
+    ]
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# get_fingerprint
+# ──────────────────────────────────────────────────────────────────────────────
+def test_fingerprint_is_stable_and_sized_like_md5():
+    value = {"query": "hi", "n": 1, "items": [1.5, None, True]}
+    assert get_fingerprint(value) == get_fingerprint(dict(value))
+    assert len(get_fingerprint(value)) == 32
+
+
+def test_fingerprint_ignores_dict_order():
+    assert get_fingerprint({"a": 1, "b": 2}) == get_fingerprint({"b": 2, "a": 1})
+
+
+def test_fingerprint_distinguishes_types_and_structure():
+    digests = {
+        get_fingerprint(v)
+        for v in [1, "1", 1.0, True, None, [1], [[1]], {"1": 1}, ["a", "b"], ["ab"]]
+    }
+    assert len(digests) == 10
+
+
+def test_fingerprint_reuses_large_string_digest():
+    content = "y" * 10_000
+    get_fingerprint([content])
+    assert fingerprint_utils._str_digest_cache[id(content)][0] is content
+    # An equal but distinct string hashes to the same value
+    assert get_fingerprint([content]) == get_fingerprint(["y" * 10_000])
+
+
+def test_fingerprint_cache_is_bounded_by_size(monkeypatch):
+    monkeypatch.setattr(fingerprint_utils, "MAX_CACHED_BYTES", 50_000)
+    contents = [str(i) * 10_000 for i in range(10)]
+    for content in contents:
+        get_fingerprint(content)
+    assert fingerprint_utils._str_digest_cache_bytes <= 50_000
+    assert id(contents[-1]) in fingerprint_utils._str_digest_cache
+    assert id(contents[0]) not in fingerprint_utils._str_digest_cache
+    huge = "z" * 60_000
+    get_fingerprint(huge)
+    assert id(huge) not in fingerprint_utils._str_digest_cache
+
+
+def test_fingerprint_follows_in_place_changes():
+    memory = make_memory(3)
+    before = get_fingerprint(memory)
+    memory.append({"role": "assistant", "content": "ok"})
+    assert get_fingerprint(memory) != before
+    memory[0]["content"] = "edited"
+    assert get_fingerprint(memory[:1]) != get_fingerprint(make_memory(1))
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# get_arguments_fingerprint
+# ──────────────────────────────────────────────────────────────────────────────
+def test_arguments_fingerprint_skips_non_data_values():
+    class Opaque:
+        pass
+
+    assert get_arguments_fingerprint(
+        {"query": "q", "obj": Opaque()}
+    ) == get_arguments_fingerprint({"query": "q"})
@@ -92,3 +92,16 @@ def test_sync_function_wrapped_async(func_hub):
 
     result = asyncio.run(async_inc(41))
     assert result == 42
+
+
+@pytest.mark.asyncio
+async def test_init_passes_cache_settings(mas_env):
+    hub = FunctionHub(name="hub", desc="cached hub", cache_ttl=30)
+    hub.set_mas(mas_env)
+
+    @hub.tool("now")
+    def now():
+        return "12:00"
+
+    await hub.init()
+    assert mas_env.oxy_name_to_oxy["now"].cache_ttl == 30
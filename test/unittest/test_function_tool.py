@@ -71,3 +71,25 @@ async def test_execute_failure(error_tool):
     resp = await error_tool._execute(req)
     assert resp.state is OxyState.FAILED
     assert "boom" in resp.output
+
+
+@pytest.mark.asyncio
+async def test_execute_uses_result_cache(oxy_request):
+    calls = []
+
+    async def lookup(a: int):
+        calls.append(a)
+        return a * 10
+
+    tool = FunctionTool(name="lookup", desc="cached", func_process=lookup, cache_ttl=60)
+    for _ in range(3):
+        resp = await tool.execute(oxy_request.clone_with(arguments={"a": 1}))
+        assert resp.output == 10
+    assert calls == [1]
+    assert resp.extra["cache_hit"] == "memory"
+    assert tool.get_result_cache().stats()["hits"] == 2
+
+    uncached = FunctionTool(name="lookup2", desc="", func_process=lookup)
+    await uncached.execute(oxy_request.clone_with(arguments={"a": 1}))
+    assert calls == [1, 1]
+    assert uncached.get_result_cache() is None
@@ -128,3 +128,74 @@ async def test_execute_http_error(monkeypatch, llm, oxy_request):
 
     with pytest.raises(FakeErrResponse):
         await llm._execute(oxy_request)
+
+
+def test_get_usage_formats():
+    assert HttpLLM._get_usage({"usage": {"total_tokens": 7}}) == {"total_tokens": 7}
+    assert HttpLLM._get_usage({"prompt_eval_count": 3, "eval_count": 4}) == {
+        "prompt_tokens": 3,
+        "completion_tokens": 4,
+        "total_tokens": 7,
+    }
+    assert HttpLLM._get_usage({"message": {"content": "hi"}}) == {}
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Pooled client
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.mark.asyncio
+async def test_client_is_reused_and_closed(monkeypatch, llm, oxy_request):
+    created = []
+
+    class FakeResponse:
+        def json(self):
+            return {"choices": [{"message": {"content": "Hi"}}]}
+
+        def raise_for_status(self):
+            pass
+
+    class FakeClient:
+        def __init__(self, **kwargs):
+            self.kwargs = kwargs
+            self.is_closed = False
+            created.append(self)
+
+        async def post(self, url, headers=None, json=None):
+            return FakeResponse()
+
+        async def aclose(self):
+            self.is_closed = True
+
+    monkeypatch.setattr("oxygent.oxy.llms.http_llm.httpx.AsyncClient", FakeClient)
+
+    await llm.init()
+    await llm._execute(oxy_request)
+    await llm._execute(oxy_request)
+    assert len(created) == 1
+    limits = created[0].kwargs["limits"]
+    assert limits.max_keepalive_connections == llm.max_keepalive_connections
+    assert limits.keepalive_expiry == llm.keepalive_expiry
+
+    await llm.cleanup()
+    assert created[0].is_closed
+    # A call after cleanup opens a new pool
+    await llm._execute(oxy_request)
+    assert len(created) == 2
+
+
+def test_http2_falls_back_without_h2(monkeypatch, llm):
+    import builtins
+
+    real_import = builtins.__import__
+
+    def no_h2(name, *args, **kwargs):
+        if name == "h2":
+            raise ImportError(name)
+        return real_import(name, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "__import__", no_h2)
+    monkeypatch.setattr(
+        "oxygent.oxy.llms.http_llm.httpx.AsyncClient", lambda **kwargs: kwargs
+    )
+    llm.is_http2 = True
+    assert llm._get_client()["http2"] is False
@@ -2,9 +2,10 @@
 Unit tests for JimdbApRedis
 """
 
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from aioredis.exceptions import ConnectionError
 
 from oxygent.databases.db_redis.jimdb_ap_redis import JimdbApRedis
 
@@ -69,3 +70,58 @@ async def test_lpush_and_rpop(redis_client):
     pipe.__aenter__.return_value = pipe
     pipe.execute.return_value = [3]
     r.pipeline
+
+
+@pytest.mark.asyncio
+async def test_simulated_brpop_polls_until_value_or_timeout(redis_client):
+    r = redis_client.redis_pool
+    r.rpop.side_effect = [None, None, b"v"]
+    assert await redis_client.brpop("k", timeout=1) == b"v"
+    assert r.rpop.await_count == 3
+
+    r.rpop.side_effect = None
+    r.rpop.return_value = None
+    assert await redis_client.brpop("k", timeout=0.05) is None
+    r.brpop.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_native_brpop(redis_client):
+    redis_client.is_brpop_supported = True
+    r = redis_client.redis_pool
+    r.brpop.return_value = (b"k", b"v")
+    assert await redis_client.brpop("k", timeout=0.5) == b"v"
+    r.brpop.assert_awaited_with("k", timeout=1)
+
+    r.brpop.return_value = None
+    assert await redis_client.brpop("k") is None
+
+
+@pytest.mark.asyncio
+async def test_xadd_and_xread(redis_client):
+    r = redis_client.redis_pool
+    pipe = MagicMock()
+    pipe.__aenter__.return_value = pipe
+    pipe.execute = AsyncMock(return_value=[b"1-0", True])
+    r.pipeline = lambda **kwargs: pipe
+
+    assert await redis_client.xadd("s", b"v", maxlen=10) == "1-0"
+    pipe.xadd.assert_called_with("s", {"data": b"v"}, maxlen=10, approximate=True)
+    pipe.expire.assert_called_with("s", redis_client.default_expire_time)
+
+    r.xread.return_value = [[b"s", [(b"1-0", {b"data": b"v"})]]]
+    assert await redis_client.xread("s", "0", timeout=0.5) == [("1-0", b"v")]
+    r.xread.assert_awaited_with({"s": "0"}, count=None, block=500)
+
+    r.xread.return_value = []
+    assert await redis_client.xread("s", "1-0") == []
+
+
+@pytest.mark.asyncio
+async def test_xread_retries_after_connection_error(redis_client):
+    r = redis_client.redis_pool
+    r.xread.side_effect = [
+        ConnectionError("reset"),
+        [[b"s", [(b"2-0", {b"data": b"w"})]]],
+    ]
+    assert await redis_client.xread("s", "1-0") == [("2-0", b"w")]
@@ -92,3 +92,22 @@ async def test_close_client(jes_es, mock_client):
     res = await jes_es.close()
     assert res is None
     mock_client.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_bulk_docs(jes_es, mock_client):
+    mock_client.bulk.return_value = {"errors": False, "items": []}
+    await jes_es.bulk(
+        [
+            {"op_type": "index", "index_name": "idx", "doc_id": "1", "body": {"a": 1}},
+            {"op_type": "update", "index_name": "idx", "doc_id": "2", "body": {"b": 2}},
+        ]
+    )
+    mock_client.bulk.assert_awaited_once_with(
+        body=[
+            {"index": {"_index": "idx", "_id": "1"}},
+            {"a": 1},
+            {"update": {"_index": "idx", "_id": "2"}},
+            {"doc": {"b": 2}, "doc_as_upsert": True},
+        ]
+    )
@@ -0,0 +1,177 @@
+"""
+Unit tests for the Oxy concurrency limiters
+"""
+
+import asyncio
+
+import pytest
+
+from oxygent.config import Config
+from oxygent.oxy.base_oxy import Oxy
+from oxygent.oxy.limiters import (
+    AIMDLimiter,
+    GradientLimiter,
+    StaticLimiter,
+    create_limiter,
+)
+from oxygent.schemas import OxyRequest, OxyResponse, OxyState
+
+
+class DummyOxy(Oxy):
+    async def _execute(self, oxy_request: OxyRequest) -> OxyResponse:
+        await asyncio.sleep(0.01)
+        if oxy_request.arguments.get("fail"):
+            raise RuntimeError("fail")
+        return OxyResponse(state=OxyState.COMPLETED, output="ok")
+
+
+async def hold(limiter, seconds, peaks):
+    async with limiter.slot():
+        peaks.append(limiter.in_flight)
+        await asyncio.sleep(seconds)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Limiters
+# ──────────────────────────────────────────────────────────────────────────────
+def test_create_limiter():
+    static = create_limiter("static", 4)
+    assert isinstance(static, StaticLimiter)
+    assert isinstance(static.semaphore, asyncio.Semaphore)
+    aimd = create_limiter("aimd", 8, max_limit=10)
+    assert isinstance(aimd, AIMDLimiter) and aimd.limit == 8
+    with pytest.raises(ValueError):
+        create_limiter("unknown", 1)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("strategy", ["static", "aimd", "gradient"])
+async def test_limit_and_queue_depth(strategy):
+    limiter = create_limiter(
+        strategy, 2, **({} if strategy == "static" else {"max_limit": 2})
+    )
+    peaks = []
+    tasks = [asyncio.create_task(hold(limiter, 0.02, peaks)) for _ in range(5)]
+    await asyncio.sleep(0.005)
+    assert limiter.stats()["in_flight"] == 2
+    assert limiter.stats()["queue_depth"] == 3
+    await asyncio.gather(*tasks)
+    assert max(peaks) <= 2
+    assert limiter.in_flight == 0 and limiter.queue_depth == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_queue():
+    limiter = AIMDLimiter(initial_limit=1, max_limit=1)
+    peaks = []
+    first = asyncio.create_task(hold(limiter, 0.02, peaks))
+    second = asyncio.create_task(hold(limiter, 0.02, peaks))
+    await asyncio.sleep(0.005)
+    second.cancel()
+    await asyncio.gather(first, second, return_exceptions=True)
+    assert limiter.queue_depth == 0 and limiter.in_flight == 0
+    await hold(limiter, 0, peaks)
+
+
+def test_aimd_adapts_to_errors_and_latency():
+    limiter = AIMDLimiter(initial_limit=10, max_limit=12, latency_threshold=1.0)
+    limiter.in_flight = 9
+    limiter.on_sample(0.1, False)
+    assert limiter.limit == 11
+    limiter.on_sample(0.1, True)
+    assert limiter.limit == 9
+    limiter.on_sample(2.0, False)
+    assert limiter.limit == 8
+    limiter.in_flight = 0
+    limiter.on_sample(0.1, False)
+    assert limiter.limit == 8
+    # The sampled call is one of the calls in flight
+    limiter.in_flight = 3
+    limiter.on_sample(0.1, False)
+    assert limiter.limit == 8
+    limiter.in_flight = 4
+    limiter.on_sample(0.1, False)
+    assert limiter.limit == 9
+
+
+def test_gradient_shrinks_when_latency_grows():
+    limiter = GradientLimiter(initial_limit=20, max_limit=40)
+    for _ in range(50):
+        limiter.on_sample(0.1, False)
+    grown = limiter.limit
+    assert grown > 20
+    for _ in range(20):
+        limiter.on_sample(1.0, False)
+    assert limiter.limit < grown
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Oxy integration
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.mark.asyncio
+async def test_oxy_reports_failures_to_limiter():
+    oxy = DummyOxy(
+        name="adaptive",
+        semaphore=10,
+        limiter_strategy="aimd",
+        retries=1,
+        is_save_data=False,
+    )
+    assert oxy._semaphore is None
+    await oxy.execute(OxyRequest(arguments={"fail": True}, caller="test"))
+    stats = oxy.get_concurrency_stats()
+    assert stats["strategy"] == "AIMDLimiter"
+    assert stats["limit"] == 9
+    assert stats["in_flight"] == 0
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Priority scheduling
+# ──────────────────────────────────────────────────────────────────────────────
+async def run_in_order(limiter, priorities):
+    """Queue one waiter per priority behind a busy slot, return service order."""
+    order = []
+
+    async def job(priority, i):
+        async with limiter.slot(priority):
+            order.append(priority)
+            await asyncio.sleep(0)
+
+    blocker = asyncio.create_task(hold(limiter, 0.01, []))
+    await asyncio.sleep(0)
+    tasks = [asyncio.create_task(job(p, i)) for i, p in enumerate(priorities)]
+    await asyncio.gather(blocker, *tasks)
+    return order
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("strategy", ["static", "aimd"])
+async def test_weighted_fair_scheduling(strategy):
+    limiter = create_limiter(
+        strategy, 1, **({} if strategy == "static" else {"max_limit": 1})
+    )
+    order = await run_in_order(limiter, ["batch"] * 9 + ["interactive"] * 8)
+    # Interactive requests queued last are served first, batch keeps a share
+    assert order[:9].count("interactive") == 8
+    assert "batch" in order[:9]
+
+
+@pytest.mark.asyncio
+async def test_strict_priority_scheduling():
+    Config.set_scheduling_policy("strict")
+    try:
+        limiter = create_limiter("static", 1)
+        order = await run_in_order(limiter, ["batch", "default", "interactive"])
+        assert order == ["interactive", "default", "batch"]
+    finally:
+        Config.set_scheduling_policy("weighted")
+
+
+@pytest.mark.asyncio
+async def test_priority_is_inherited_by_child_calls():
+    oxy = DummyOxy(name="child", is_save_data=False)
+    request = OxyRequest(arguments={}, caller="test", priority="batch")
+    child = request.clone_with(callee="child")
+    assert child.priority == "batch"
+    response = await oxy.execute(child)
+    assert response.oxy_request.priority == "batch"
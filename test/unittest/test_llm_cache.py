@@ -0,0 +1,131 @@
+"""
+Unit tests for the LLM response cache
+"""
+
+import pytest
+
+from oxygent.llm_cache import SqliteStore, is_deterministic
+from oxygent.oxy.llms.base_llm import BaseLLM
+from oxygent.schemas import OxyRequest, OxyResponse, OxyState
+
+
+class CountingLLM(BaseLLM):
+    calls: int = 0
+
+    async def _execute(self, oxy_request: OxyRequest) -> OxyResponse:
+        self.calls += 1
+        return OxyResponse(
+            state=OxyState.COMPLETED,
+            output=f"answer {self.calls}",
+            extra={"usage": {"total_tokens": 3}},
+        )
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        "oxygent.llm_cache.Config.get_cache_save_dir", lambda: str(tmp_path)
+    )
+    monkeypatch.setattr(
+        "oxygent.oxy.llms.base_llm.Config.get_llm_config", lambda: {"cls": "x"}
+    )
+    monkeypatch.setattr("oxygent.llm_cache._stores", {})
+    return tmp_path
+
+
+def make_llm(**kwargs):
+    return CountingLLM(
+        name="llm",
+        is_cache_response=True,
+        is_save_data=False,
+        is_send_think=False,
+        llm_params={"temperature": 0},
+        **kwargs,
+    )
+
+
+async def ask(llm, content="Hi", **arguments):
+    oxy_request = OxyRequest(
+        arguments={"messages": [{"role": "user", "content": content}], **arguments},
+        caller="user",
+    )
+    return await llm.execute(oxy_request)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Store
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.mark.asyncio
+async def test_sqlite_store_round_trip(tmp_path):
+    store = SqliteStore(str(tmp_path / "kv.db"))
+    assert await store.get("k") is None
+    await store.set("k", "v", ex=60)
+    await store.set("old", "v", ex=-1)
+    assert await store.get("k") == "v"
+    assert await store.get("old") is None
+    store.close()
+    assert await SqliteStore(str(tmp_path / "kv.db")).get("k") == "v"
+
+
+def test_is_deterministic():
+    assert is_deterministic({"temperature": 0})
+    assert is_deterministic({"temperature": "0.0"})
+    assert not is_deterministic({})
+    assert not is_deterministic({"temperature": 0.7})
+    assert not is_deterministic({"temperature": 0, "stream": True})
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# BaseLLM integration
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.mark.asyncio
+async def test_repeat_is_served_from_memory_then_disk():
+    llm = make_llm()
+    first = await ask(llm)
+    second = await ask(llm)
+    assert llm.calls == 1
+    assert "cache_hit" not in first.extra
+    assert second.output == "answer 1"
+    assert second.extra["cache_hit"] == "memory"
+    assert second.extra["cache_key"].split(":")[1:3] == ["llm_cache", "llm"]
+    assert second.extra["usage"] == {"total_tokens": 3}
+
+    # A new process only has the disk tier
+    restarted = make_llm()
+    third = await ask(restarted)
+    assert restarted.calls == 0
+    assert third.extra["cache_hit"] == "disk"
+
+
+@pytest.mark.asyncio
+async def test_key_covers_messages_and_params():
+    llm = make_llm()
+    await ask(llm, "Hi")
+    await ask(llm, "Hello")
+    await ask(llm, "Hi", max_tokens=10)
+    assert llm.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_sampled_and_streaming_calls_bypass_unless_forced():
+    llm = make_llm()
+    await ask(llm, temperature=0.7)
+    await ask(llm, temperature=0.7)
+    await ask(llm, stream=True)
+    await ask(llm, stream=True)
+    assert llm.calls == 4
+
+    llm.is_cache_forced = True
+    await ask(llm, temperature=0.7)
+    await ask(llm, temperature=0.7)
+    assert llm.calls == 5
+
+
+@pytest.mark.asyncio
+async def test_disabled_by_default(cache_dir):
+    llm = CountingLLM(name="llm", is_save_data=False, llm_params={"temperature": 0})
+    await ask(llm)
+    await ask(llm)
+    assert llm.calls == 2
+    assert llm.get_response_cache() is None
+    assert not (cache_dir / "llm_cache.db").exists()
@@ -86,6 +86,28 @@ async def test_search_term_terms_bool_sort(local_es):
     assert hits[0]["_source"]["n"] == 3
 
 
+@pytest.mark.asyncio
+async def test_bulk(local_es):
+    await local_es.index("idx", "1", {"v": 1})
+    res = await local_es.bulk(
+        [
+            {"op_type": "update", "index_name": "idx", "doc_id": "1", "body": {"x": 2}},
+            {"op_type": "index", "index_name": "idx", "doc_id": "2", "body": {"v": 3}},
+            {"op_type": "update", "index_name": "other", "doc_id": "3", "body": {}},
+        ]
+    )
+    assert res["errors"] is False
+    assert [item["result"] for item in res["items"]] == [
+        "updated",
+        "created",
+        "updated",
+    ]
+    hits = (await local_es.search("idx", {"query": {"term": {"_id": "1"}}}))["hits"]
+    assert hits["hits"][0]["_source"] == {"v": 1, "x": 2}
+    assert await local_es.exists("idx", "2")
+    assert await local_es.exists("other", "3")
+
+
 @pytest.mark.asyncio
 async def test_close(local_es):
     res = await local_es.close()
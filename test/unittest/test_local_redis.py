@@ -2,11 +2,12 @@
 Unit tests for LocalRedis
 """
 
+import asyncio
 import time
 
 import pytest
 
-from oxygent.databases.db_redis.local_redis import LocalRedis
+from oxygent.databases.db_redis.local_redis import LocalRedis, parse_stream_id
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -77,3 +78,77 @@ async def test_expiry(redis):
 @pytest.mark.asyncio
 async def test_close(redis):
     assert await redis.close() is None
+
+
+@pytest.mark.asyncio
+async def test_set_get_and_expiry(redis):
+    await redis.set("kv", "value", ex=1)
+    assert await redis.get("kv") == "value"
+    assert await redis.get("missing") is None
+    redis.expiry["kv"] = time.time() - 1
+    assert await redis.get("kv") is None
+
+
+@pytest.mark.asyncio
+async def test_brpop_waits_for_push(redis):
+    waiter = asyncio.create_task(redis.brpop("blist", timeout=5))
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    await redis.lpush("blist", "x")
+    assert await waiter == "x"
+    assert loop.time() - start < 0.05
+    assert redis.conditions == {} and redis.waiting == {}
+
+
+@pytest.mark.asyncio
+async def test_brpop_returns_ready_value_or_times_out(redis):
+    await redis.lpush("blist", "x")
+    assert await redis.brpop("blist", timeout=1) == "x"
+    assert await redis.brpop("blist", timeout=0.02) is None
+
+
+@pytest.mark.asyncio
+async def test_brpop_serves_one_value_per_waiter(redis):
+    waiters = [asyncio.create_task(redis.brpop("blist", timeout=1)) for _ in range(3)]
+    await asyncio.sleep(0.01)
+    await redis.lpush("blist", "a", "b")
+    results = await asyncio.gather(*waiters)
+    assert sorted(r for r in results if r is not None) == ["a", "b"]
+    assert results.count(None) == 1
+
+
+@pytest.mark.asyncio
+async def test_xadd_xread_from_last_id(redis):
+    first = await redis.xadd("stream", b"a")
+    second = await redis.xadd("stream", b"b")
+    assert parse_stream_id(first) < parse_stream_id(second)
+
+    assert await redis.xread("stream") == [(first, b"a"), (second, b"b")]
+    assert await redis.xread("stream", first) == [(second, b"b")]
+    assert await redis.xread("stream", second) == []
+    assert await redis.xread("stream", "0", count=1) == [(first, b"a")]
+    # Entries are not consumed
+    assert len(await redis.xread("stream")) == 2
+
+
+@pytest.mark.asyncio
+async def test_xadd_trims_to_maxlen(redis):
+    for value in ("a", "b", "c"):
+        await redis.xadd("stream", value, maxlen=2)
+    assert [value for _, value in await redis.xread("stream")] == ["b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_xread_waits_for_new_entries(redis):
+    await redis.xadd("stream", "old")
+    readers = [
+        asyncio.create_task(redis.xread("stream", "$", timeout=5)) for _ in range(2)
+    ]
+    await asyncio.sleep(0.01)
+    entry_id = await redis.xadd("stream", "new")
+
+    assert await asyncio.gather(*readers) == [[(entry_id, "new")]] * 2
+    assert await redis.xread("stream", entry_id, timeout=0.02) == []
@@ -0,0 +1,66 @@
+"""
+Unit tests for oxygent.loop_monitor
+"""
+
+import asyncio
+import logging
+import time
+
+import pytest
+
+from oxygent import metrics
+from oxygent.loop_monitor import LoopMonitor
+from oxygent.oxy.base_oxy import Oxy
+from oxygent.schemas import OxyRequest, OxyResponse, OxyState
+
+
+def blocking_call(seconds):
+    time.sleep(seconds)
+
+
+class BlockingOxy(Oxy):
+    async def _execute(self, oxy_request: OxyRequest) -> OxyResponse:
+        blocking_call(0.3)
+        return OxyResponse(state=OxyState.COMPLETED, output="ok")
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Lag
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.mark.asyncio
+async def test_idle_loop_has_no_block():
+    loop_monitor = LoopMonitor(interval=0.01, block_threshold=0.1)
+    loop_monitor.start()
+    await asyncio.sleep(0.1)
+    await loop_monitor.stop()
+    assert loop_monitor.blocks == 0
+    assert loop_monitor.max_lag < 0.1
+    assert metrics.event_loop_lag.get_count() > 0
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Blocking calls
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.mark.asyncio
+async def test_blocking_oxy_is_reported(caplog):
+    caplog.set_level(logging.WARNING, logger="oxygent.loop_monitor")
+    before = metrics.event_loop_blocks.get("blocking")
+    loop_monitor = LoopMonitor(interval=0.01, block_threshold=0.05)
+    loop_monitor.start()
+    await asyncio.sleep(0.02)
+
+    oxy = BlockingOxy(name="blocking", is_save_data=False)
+    oxy_request = OxyRequest(arguments={}, caller="user", current_trace_id="t1")
+    oxy_request.callee = "blocking"
+    await oxy.execute(oxy_request)
+    await asyncio.sleep(0.05)
+    await loop_monitor.stop()
+
+    assert loop_monitor.blocks == 1
+    assert loop_monitor.max_lag >= 0.25
+    assert metrics.event_loop_blocks.get("blocking") == before + 1
+    (report, summary) = [r for r in caplog.records if "blocked" in r.getMessage()]
+    assert "in blocking" in report.getMessage()
+    assert "blocking_call" in report.getMessage()
+    assert report.trace_id == "t1"
+    assert summary.getMessage().startswith("Event loop was blocked for 0.")
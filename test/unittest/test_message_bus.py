@@ -0,0 +1,228 @@
+"""
+Unit tests for the message buses
+"""
+
+import asyncio
+import json
+import logging
+
+import pytest
+
+from oxygent.databases.db_redis.local_redis import LocalRedis
+from oxygent.mas import MAS
+from oxygent.message_bus import (
+    InProcessMessageBus,
+    RedisMessageBus,
+    StreamMessageBus,
+    create_message_bus,
+)
+
+
+class DummyMAS:
+    _to_sse_message = staticmethod(MAS._to_sse_message)
+
+    def __init__(self, message_bus):
+        self.message_bus = message_bus
+        self.active_tasks = {}
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# In-process bus
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.mark.asyncio
+async def test_in_process_bus_hands_over_the_message_itself():
+    bus = InProcessMessageBus()
+    message = {"type": "stream", "content": {"delta": "hi"}}
+    await bus.publish("k", message)  # nobody subscribed yet: dropped
+    bus.subscribe("k")
+    await bus.publish("k", message)
+
+    assert await bus.get("k", timeout=1) is message
+    assert await bus.get("k", timeout=0.01) is None
+
+    bus.unsubscribe("k")
+    assert "k" not in bus.queues
+
+
+@pytest.mark.asyncio
+async def test_in_process_bus_wakes_reader_without_polling():
+    bus = InProcessMessageBus()
+    bus.subscribe("k")
+    reader = asyncio.create_task(bus.get("k", timeout=5))
+    await asyncio.sleep(0)
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    await bus.publish("k", "delta")
+    assert await reader == "delta"
+    assert loop.time() - start < 0.05
+
+
+@pytest.mark.asyncio
+async def test_in_process_bus_drops_oldest_for_slow_reader():
+    bus = InProcessMessageBus(max_size=2)
+    bus.subscribe("k")
+    for i in range(4):
+        await bus.publish("k", i)
+    assert bus.dropped == 2
+    assert [await bus.get("k", timeout=1) for _ in range(2)] == [2, 3]
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Redis bus and selection
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.mark.asyncio
+async def test_redis_bus_round_trips_through_msgpack():
+    bus = RedisMessageBus(LocalRedis())
+    await bus.publish("k", {"type": "answer", "content": ("a", 1)})
+    assert await bus.get("k", timeout=1) == {"type": "answer", "content": ["a", 1]}
+    assert await bus.get("k", timeout=0.03) is None
+
+
+def test_create_message_bus(monkeypatch):
+    redis_client = LocalRedis()
+    monkeypatch.setattr("oxygent.message_bus.Config.get_redis_config", lambda: {})
+    assert isinstance(create_message_bus(redis_client, "auto"), InProcessMessageBus)
+    assert isinstance(create_message_bus(redis_client, "redis"), RedisMessageBus)
+
+    monkeypatch.setattr(
+        "oxygent.message_bus.Config.get_redis_config", lambda: {"host": "h"}
+    )
+    assert isinstance(create_message_bus(redis_client, "auto"), RedisMessageBus)
+    assert isinstance(create_message_bus(redis_client, "memory"), InProcessMessageBus)
+    assert isinstance(create_message_bus(redis_client, "stream"), StreamMessageBus)
+
+    with pytest.raises(ValueError):
+        create_message_bus(redis_client, "kafka")
+
+
+@pytest.mark.asyncio
+async def test_stream_bus_fans_out_and_resumes():
+    bus = StreamMessageBus(LocalRedis())
+    ids = [await bus.publish("k", {"n": n}) for n in range(3)]
+
+    # Every reader gets every message, from its own position
+    for _ in range(2):
+        entries = await bus.read("k", None, timeout=1)
+        assert entries == [(ids[n], {"n": n}) for n in range(3)]
+    assert await bus.read("k", ids[1], timeout=1) == [(ids[2], {"n": 2})]
+    assert await bus.read("k", ids[2], timeout=0.02) == []
+
+    bus.subscribe("k")
+    assert [await bus.get("k", timeout=1) for _ in range(3)] == [
+        {"n": n} for n in range(3)
+    ]
+    assert await bus.get("k", timeout=0.02) is None
+
+
+@pytest.mark.asyncio
+async def test_stream_bus_waits_out_a_failed_read():
+    class FailingRedis(LocalRedis):
+        async def xread(self, *args, **kwargs):
+            return None
+
+    bus = StreamMessageBus(FailingRedis())
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    assert await bus.read("k", None, timeout=0.05) == []
+    assert await bus.get("k", timeout=0.05) is None
+    assert loop.time() - start >= 0.09
+
+
+@pytest.mark.asyncio
+async def test_only_stream_bus_reports_known_keys():
+    bus = StreamMessageBus(LocalRedis())
+    assert not await bus.exists("k")
+    await bus.publish("k", {"n": 1})
+    assert await bus.exists("k")
+
+    bus = InProcessMessageBus()
+    bus.subscribe("k")
+    await bus.publish("k", {"n": 1})
+    assert not await bus.exists("k")
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# SSE stream
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.mark.asyncio
+async def test_event_stream_forwards_without_changing_sent_messages(monkeypatch):
+    monkeypatch.setattr("oxygent.mas.logger", logging.getLogger(__name__))
+    bus = InProcessMessageBus()
+    mas = DummyMAS(bus)
+    arguments = {"query": [{"type": "text", "text": "hello"}]}
+    tool_call = {"type": "tool_call", "content": {"arguments": arguments}}
+    observation = {"type": "observation", "content": {"output": {"a": 1}}}
+
+    async def chat():
+        for message in (tool_call, observation, {"event": "close", "data": "done"}):
+            await bus.publish("k", message)
+
+    bus.subscribe("k")
+    task = asyncio.create_task(chat())
+    events = [e async for e in MAS.event_stream(mas, "k", "trace", task)]
+
+    assert json.loads(events[0]["data"])["content"]["arguments"]["query"] == "hello"
+    assert json.loads(events[1]["data"])["content"]["output"] == '{"a": 1}'
+    assert events[2] == {"event": "close", "data": "done"}
+    assert arguments["query"] == [{"type": "text", "text": "hello"}]
+    assert observation["content"]["output"] == {"a": 1}
+    assert "k" not in bus.queues
+
+
+@pytest.mark.asyncio
+async def test_event_stream_sends_heartbeat_when_idle(monkeypatch):
+    monkeypatch.setattr("oxygent.mas.logger", logging.getLogger(__name__))
+    monkeypatch.setattr(
+        "oxygent.mas.Config.get_message_heartbeat_interval", lambda: 0.02
+    )
+    bus = RedisMessageBus(LocalRedis())
+    mas = DummyMAS(bus)
+
+    async def chat():
+        await asyncio.sleep(0.05)
+        await bus.publish("k", {"event": "close", "data": "done"})
+
+    task = asyncio.create_task(chat())
+    events = [e async for e in MAS.event_stream(mas, "k", "trace", task)]
+    assert events[0] == {"comment": "heartbeat"}
+    assert events[-1] == {"event": "close", "data": "done"}
+
+
+@pytest.mark.asyncio
+async def test_event_stream_resumes_after_last_event_id(monkeypatch):
+    monkeypatch.setattr("oxygent.mas.logger", logging.getLogger(__name__))
+    bus = StreamMessageBus(LocalRedis())
+    mas = DummyMAS(bus)
+    ids = [await bus.publish("k", {"type": "answer", "content": n}) for n in range(3)]
+    await bus.publish("k", {"event": "close", "data": "done"})
+
+    events = [e async for e in MAS.event_stream(mas, "k", "trace")]
+    assert [e.get("id") for e in events[:3]] == ids
+    assert events[-1]["event"] == "close" and events[-1]["id"]
+
+    events = [e async for e in MAS.event_stream(mas, "k", "trace", None, ids[1])]
+    assert [json.loads(e["data"])["content"] for e in events[:-1]] == [2]
+
+
+@pytest.mark.asyncio
+async def test_disconnect_cancels_chat_unless_resumable(monkeypatch):
+    monkeypatch.setattr("oxygent.mas.logger", logging.getLogger(__name__))
+
+    async def disconnect(bus):
+        mas = DummyMAS(bus)
+        chat = asyncio.create_task(asyncio.sleep(5))
+        stream = asyncio.create_task(
+            MAS.event_stream(mas, "k", "trace", chat).__anext__()
+        )
+        await asyncio.sleep(0.01)
+        stream.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await stream
+        await asyncio.sleep(0)
+        cancelled = chat.cancelled()
+        chat.cancel()
+        return cancelled
+
+    assert await disconnect(InProcessMessageBus())
+    assert not await disconnect(StreamMessageBus(LocalRedis()))
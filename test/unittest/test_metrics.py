@@ -0,0 +1,90 @@
+"""
+Unit tests for oxygent.metrics
+"""
+
+import pytest
+
+from oxygent import metrics
+from oxygent.databases.base_db import BaseDB
+from oxygent.metrics import MetricsRegistry
+from oxygent.oxy.base_oxy import Oxy
+from oxygent.routes import get_metrics
+from oxygent.schemas import OxyRequest, OxyResponse, OxyState
+
+
+class DummyOxy(Oxy):
+    async def _execute(self, oxy_request: OxyRequest) -> OxyResponse:
+        return OxyResponse(state=OxyState.COMPLETED, output="ok")
+
+
+class DummyDB(BaseDB):
+    async def read(self):
+        return "ok"
+
+    async def broken(self):
+        raise RuntimeError("down")
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Registry
+# ──────────────────────────────────────────────────────────────────────────────
+def test_counter_and_gauge_render():
+    registry = MetricsRegistry()
+    calls = registry.counter("calls_total", "Calls.", ["oxy", "state"])
+    calls.inc("search", "completed")
+    calls.inc("search", "completed", amount=2)
+    registry.gauge("depth", "Depth.", ["oxy"], callback=lambda: {("a",): 3})
+    registry.gauge("streams", "Streams.", callback=lambda: 1)
+
+    text = registry.render()
+    assert "# TYPE calls_total counter" in text
+    assert 'calls_total{oxy="search",state="completed"} 3' in text
+    assert 'depth{oxy="a"} 3' in text
+    assert "streams 1" in text
+    # The same name returns the same metric
+    assert registry.counter("calls_total", "Calls.", ["oxy", "state"]) is calls
+    with pytest.raises(ValueError):
+        registry.gauge("calls_total", "Calls.")
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency", "Latency.", ["oxy"], buckets=(0.1, 1))
+    for value in (0.05, 0.1, 0.5, 3):
+        latency.observe(value, 'a"b')
+
+    lines = registry.render().splitlines()
+    assert 'latency_bucket{oxy="a\\"b",le="0.1"} 2' in lines
+    assert 'latency_bucket{oxy="a\\"b",le="1"} 3' in lines
+    assert 'latency_bucket{oxy="a\\"b",le="+Inf"} 4' in lines
+    assert 'latency_sum{oxy="a\\"b"} 3.65' in lines
+    assert 'latency_count{oxy="a\\"b"} 4' in lines
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Instrumentation
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.mark.asyncio
+async def test_oxy_calls_are_recorded():
+    oxy = DummyOxy(name="metered", is_save_data=False)
+    before = metrics.oxy_calls.get("metered", "COMPLETED")
+    await oxy.execute(OxyRequest(arguments={}, caller="test"))
+    assert metrics.oxy_calls.get("metered", "COMPLETED") == before + 1
+    assert metrics.oxy_call_duration.get_count("metered") >= 1
+
+
+@pytest.mark.asyncio
+async def test_db_client_latency_and_errors_are_recorded():
+    db = DummyDB()
+    await db.read()
+    assert await db.broken() is None
+    assert metrics.db_client_duration.get_count("DummyDB", "read") == 1
+    assert metrics.db_client_errors.get("DummyDB", "broken") == 1
+    assert metrics.db_client_errors.get("DummyDB", "read") == 0
+
+
+@pytest.mark.asyncio
+async def test_metrics_route():
+    response = await get_metrics()
+    assert response.media_type.startswith("text/plain")
+    assert "# TYPE oxygent_oxy_calls_total counter" in response.body.decode()
@@ -0,0 +1,109 @@
+"""
+Unit tests for OpenAILLM
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from oxygent.oxy.llms.openai_llm import OpenAILLM
+from oxygent.schemas import OxyRequest, OxyState
+
+
+class FakeUsage:
+    def model_dump(self):
+        return {"total_tokens": 5}
+
+
+class FakeAsyncOpenAI:
+    created = []
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.closed = False
+        self.payloads = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+        FakeAsyncOpenAI.created.append(self)
+
+    async def create(self, **payload):
+        self.payloads.append(payload)
+        message = SimpleNamespace(content="Hi there!")
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=message)], usage=FakeUsage()
+        )
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self):
+        self.closed = True
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Fixtures
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.fixture(autouse=True)
+def patch_client(monkeypatch):
+    FakeAsyncOpenAI.created = []
+    monkeypatch.setattr(
+        "oxygent.oxy.llms.openai_llm.Config.get_llm_config", lambda: {}, raising=True
+    )
+    monkeypatch.setattr("oxygent.oxy.llms.openai_llm.AsyncOpenAI", FakeAsyncOpenAI)
+
+    async def passthrough(self, req: OxyRequest):
+        return req.arguments["messages"]
+
+    monkeypatch.setattr(
+        "oxygent.oxy.llms.base_llm.BaseLLM._get_messages", passthrough, raising=True
+    )
+
+
+@pytest.fixture
+def llm():
+    return OpenAILLM(
+        name="openai_llm",
+        api_key="sk-123",
+        base_url="https://api.fake.com/v1",
+        model_name="gpt-ut",
+        timeout=42,
+        llm_params={"temperature": 0.3},
+    )
+
+
+@pytest.fixture
+def oxy_request():
+    return OxyRequest(
+        arguments={"messages": [{"role": "user", "content": "Hello"}]},
+        caller="tester",
+        current_trace_id="trace123",
+    )
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Tests
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.mark.asyncio
+async def test_client_is_created_once(llm, oxy_request):
+    await llm.init()
+    first = await llm._execute(oxy_request)
+    await llm._execute(oxy_request)
+
+    (client,) = FakeAsyncOpenAI.created
+    assert client.kwargs["timeout"] == 42
+    assert client.kwargs["max_retries"] == 0
+    assert len(client.payloads) == 2
+    assert client.payloads[0]["temperature"] == 0.3
+    assert first.state is OxyState.COMPLETED
+    assert first.output == "Hi there!"
+    assert first.extra["usage"] == {"total_tokens": 5}
+
+
+@pytest.mark.asyncio
+async def test_cleanup_closes_the_client(llm, oxy_request):
+    await llm.init()
+    await llm.cleanup()
+    assert FakeAsyncOpenAI.created[0].closed
+    await llm.cleanup()  # no client left, nothing to do
+
+    await llm._execute(oxy_request)
+    assert len(FakeAsyncOpenAI.created) == 2
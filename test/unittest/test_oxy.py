@@ -10,10 +10,11 @@ Because Oxy is abstract, we define a DummyOxy subclass for testing.
 """
 
 import asyncio
+import time
 
 import pytest
 
-from oxygent.oxy.base_oxy import Oxy
+from oxygent.oxy.base_oxy import ExecutionPipeline, Oxy
 from oxygent.schemas import OxyRequest, OxyResponse, OxyState
 
 
@@ -67,3 +68,221 @@ class TestBaseOxy:
         assert response.state == OxyState.COMPLETED
         assert response.output == "dummy_output"
         assert response.oxy_request == oxy_request
+
+    def test_pipeline_skips_default_steps(self, dummy_oxy):
+        """Default hooks with sending/saving disabled are compiled out."""
+        dummy_oxy.is_save_data = False
+        dummy_oxy.is_send_tool_call = False
+        dummy_oxy.is_send_observation = False
+        dummy_oxy.is_send_answer = False
+        pipeline = dummy_oxy._pipeline
+        assert not pipeline.is_process_input
+        assert not pipeline.is_save_data
+        assert not pipeline.is_format_input
+        assert not pipeline.is_pre_send_message
+        assert not pipeline.is_before_execute
+        assert not pipeline.is_after_execute
+        assert not pipeline.is_post_process
+        assert not pipeline.is_format_output
+        assert not pipeline.is_post_send_message
+
+    @pytest.mark.asyncio
+    async def test_pipeline_recompiles_on_setattr(self, dummy_oxy):
+        """Reassigning a hook function re-enables its step."""
+
+        async def shout(oxy_response):
+            oxy_response.output = oxy_response.output.upper()
+            return oxy_response
+
+        dummy_oxy.is_save_data = False
+        assert not dummy_oxy._pipeline.is_format_output
+        dummy_oxy.func_format_output = shout
+        assert dummy_oxy._pipeline.is_format_output
+        oxy_request = OxyRequest(arguments={}, caller="test", current_trace_id="t1")
+        response = await dummy_oxy.execute(oxy_request)
+        assert response.output == "DUMMY_OUTPUT"
+
+    def test_pipeline_keeps_overridden_hooks(self):
+        """Hooks overridden by a subclass are always run."""
+
+        class HookedOxy(DummyOxy):
+            async def _after_execute(self, oxy_response):
+                return oxy_response
+
+        oxy = HookedOxy(name="hooked", is_save_data=False)
+        assert oxy._pipeline.is_after_execute
+        assert not oxy._pipeline.is_before_execute
+
+    @pytest.mark.asyncio
+    async def test_execute_overhead_benchmark(self):
+        """Compare the overhead of execute() with and without a compiled pipeline.
+
+        The uncompiled pipeline runs every lifecycle step, saving included,
+        as execute() did before the pipeline was compiled.
+        """
+        oxy = DummyOxy(
+            name="bench",
+            is_save_data=False,
+            is_send_tool_call=False,
+            is_send_observation=False,
+            is_send_answer=False,
+        )
+        rounds = 1000
+
+        async def best_time(func):
+            times = []
+            for _ in range(3):
+                requests = [
+                    OxyRequest(arguments={}, caller="test", current_trace_id="t")
+                    for _ in range(rounds)
+                ]
+                start = time.perf_counter()
+                for request in requests:
+                    await func(request)
+                times.append((time.perf_counter() - start) / rounds)
+            return min(times)
+
+        direct = await best_time(oxy._execute)
+        compiled = await best_time(oxy.execute) - direct
+        oxy._pipeline = ExecutionPipeline()
+        uncompiled = await best_time(oxy.execute) - direct
+        assert compiled < uncompiled * 0.8
+
+    @pytest.mark.asyncio
+    async def test_single_flight_collapses_identical_calls(self):
+        """Identical concurrent calls share one execution, each keeps its node."""
+        calls = []
+
+        class SlowOxy(DummyOxy):
+            async def _execute(self, oxy_request):
+                calls.append(oxy_request.node_id)
+                await asyncio.sleep(0.05)
+                return OxyResponse(state=OxyState.COMPLETED, output={"v": 1})
+
+        oxy = SlowOxy(name="slow", is_single_flight=True, semaphore=1)
+        requests = [
+            OxyRequest(arguments={"q": "same"}, caller="test", current_trace_id="t")
+            for _ in range(5)
+        ]
+        responses = await asyncio.gather(*(oxy.execute(r) for r in requests))
+
+        assert len(calls) == 1
+        assert [r.output for r in responses] == [{"v": 1}] * 5
+        followers = [r for r in responses if "single_flight" in r.extra]
+        assert len(followers) == 4
+        assert {r.extra["single_flight"]["leader_node_id"] for r in followers} == {
+            calls[0]
+        }
+        assert len({r.oxy_request.node_id for r in responses}) == 5
+        assert oxy._in_flight == {}
+
+        # Different arguments, or sequential calls, are not collapsed
+        await asyncio.gather(
+            oxy.execute(OxyRequest(arguments={"q": "a"}, caller="test")),
+            oxy.execute(OxyRequest(arguments={"q": "b"}, caller="test")),
+        )
+        await oxy.execute(OxyRequest(arguments={"q": "a"}, caller="test"))
+        assert len(calls) == 4
+
+        # Nor are calls continuing different conversations
+        await asyncio.gather(
+            oxy.execute(
+                OxyRequest(arguments={"q": "a"}, caller="test", from_trace_id="t1")
+            ),
+            oxy.execute(
+                OxyRequest(arguments={"q": "a"}, caller="test", from_trace_id="t2")
+            ),
+            oxy.execute(
+                OxyRequest(
+                    arguments={"q": "a"}, caller="test", shared_data={"user": "u"}
+                )
+            ),
+        )
+        assert len(calls) == 7
+
+    @pytest.mark.asyncio
+    async def test_single_flight_followers_recover_from_cancelled_leader(self):
+        """Followers run the call themselves when the leader is cancelled."""
+        calls = []
+
+        class SlowOxy(DummyOxy):
+            async def _execute(self, oxy_request):
+                calls.append(oxy_request.node_id)
+                await asyncio.sleep(0.05)
+                return OxyResponse(state=OxyState.COMPLETED, output="done")
+
+        oxy = SlowOxy(name="slow", is_single_flight=True)
+        leader = asyncio.create_task(
+            oxy.execute(OxyRequest(arguments={"q": "x"}, caller="test"))
+        )
+        await asyncio.sleep(0.01)
+        follower = asyncio.create_task(
+            oxy.execute(OxyRequest(arguments={"q": "x"}, caller="test"))
+        )
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        response = await follower
+        assert response.output == "done"
+        assert "single_flight" not in response.extra
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_retries_skipped_without_budget(self):
+        """A failed attempt is not retried when the deadline can't cover it."""
+        calls = []
+
+        class FlakyOxy(DummyOxy):
+            async def _execute(self, oxy_request):
+                calls.append(1)
+                raise RuntimeError("flaky")
+
+        oxy = FlakyOxy(name="flaky", retries=3, delay=0.01, is_save_data=False)
+        response = await oxy.execute(OxyRequest(arguments={}, caller="test"))
+        assert len(calls) == 3
+        assert response.state == OxyState.FAILED
+
+        calls.clear()
+        oxy_request = OxyRequest(arguments={}, caller="test")
+        oxy_request.set_timeout(0.005)
+        response = await oxy.execute(oxy_request)
+        assert len(calls) == 1
+        assert response.state == OxyState.FAILED
+
+    @pytest.mark.asyncio
+    async def test_execute_records_phase_timings(self):
+        """Each phase is timed in ms, with one execute entry per attempt."""
+        attempts = []
+
+        class SlowFlakyOxy(DummyOxy):
+            async def _execute(self, oxy_request):
+                attempts.append(1)
+                await asyncio.sleep(0.02)
+                if len(attempts) == 1:
+                    raise RuntimeError("flaky")
+                return OxyResponse(state=OxyState.COMPLETED, output="done")
+
+        oxy = SlowFlakyOxy(name="slow", retries=2, delay=0, semaphore=1)
+        first = asyncio.create_task(
+            oxy.execute(OxyRequest(arguments={"q": 1}, caller="test"))
+        )
+        await asyncio.sleep(0)
+        second = await oxy.execute(OxyRequest(arguments={"q": 2}, caller="test"))
+        first = await first
+
+        timings = first.extra["timings"]
+        assert {
+            "start_time",
+            "queue_wait",
+            "pre_process",
+            "interceptor",
+            "execute",
+            "post_process",
+            "send",
+            "total",
+        } <= set(timings)
+        assert len(timings["execute"]) == 2
+        assert all(duration >= 20 for duration in timings["execute"])
+        assert timings["total"] >= sum(timings["execute"])
+        # The second call waited for the slot of the first one
+        assert second.extra["timings"]["queue_wait"] >= 30
+        assert len(second.extra["timings"]["execute"]) == 1
@@ -3,6 +3,8 @@ Unit tests for OxyRequest & OxyResponse
 """
 
 import asyncio
+import copy
+import tracemalloc
 
 import pytest
 
@@ -41,6 +43,7 @@ class DummyOxy:
         self.retries = 3
 
     async def execute(self, req: OxyRequest):
+        self.last_request = req
         if self._delay:
             await asyncio.sleep(self._delay)
         if self._succeed:
@@ -80,6 +83,52 @@ def test_deepcopy_resets_parallel_ids(base_request):
     assert dup.latest_node_ids == []
 
 
+def test_clone_with_shares_payloads(base_request):
+    short_memory = [{"role": "user", "content": "hi"}]
+    base_request.arguments = {"query": "q", "short_memory": short_memory}
+    base_request.group_data = {"g": 1}
+    child = base_request.clone_with(callee="dummy")
+    # Large payloads are shared, containers the child mutates are not
+    assert child.arguments["short_memory"] is short_memory
+    assert child.arguments is not base_request.arguments
+    assert child.shared_data is base_request.shared_data
+    child.arguments["query"] = "changed"
+    child.call_stack.append("dummy")
+    child.group_data["g"] = 2
+    assert base_request.arguments["query"] == "q"
+    assert base_request.call_stack == ["user"]
+    assert base_request.group_data == {"g": 1}
+
+
+def test_clone_with_copies_overridden_arguments(base_request):
+    arguments = {"x": 1}
+    child = base_request.clone_with(arguments=arguments)
+    child.arguments["y"] = 2
+    assert arguments == {"x": 1}
+
+
+def test_input_md5_is_lazy(base_request):
+    base_request.arguments = {"query": "q"}
+    base_request.snapshot_input()
+    assert base_request.input_md5 == ""
+    base_request.arguments["query"] = "changed"
+    md5 = base_request.get_input_md5()
+    assert md5 and base_request.input_md5 == md5
+    base_request.snapshot_input()
+    assert base_request.get_input_md5() != md5
+
+
+def test_input_md5_ignores_later_nested_changes(base_request):
+    memory = [{"role": "user", "content": "hi"}]
+    base_request.arguments = {"query": "q", "short_memory": memory}
+    base_request.snapshot_input()
+    md5 = base_request.input_md5
+    assert md5
+
+    memory.append({"role": "assistant", "content": "hello"})
+    assert base_request.get_input_md5() == md5
+
+
 # ──────────────────────────────────────────────────────────────────────────────
 # ❹ retry_execute
 # ──────────────────────────────────────────────────────────────────────────────
@@ -164,6 +213,83 @@ async def test_call_timeout(mas_env):
     assert "timed out" in resp.output
 
 
+@pytest.mark.asyncio
+async def test_call_uses_remaining_deadline(mas_env):
+    agentA = DummyOxy("agentA")
+    slow_tool = DummyOxy("slow", delay=0.2)
+    agentA.permitted_tool_name_list = ["slow"]
+    mas_env.oxy_name_to_oxy.update({"agentA": agentA, "slow": slow_tool})
+
+    req = OxyRequest(
+        caller="agentA",
+        callee="agentA",
+        caller_category="agent",
+        callee_category="agent",
+    )
+    req.set_mas(mas_env)
+    req.set_timeout(0.05)
+    assert 0 < req.get_remaining_time() <= 0.05
+
+    resp = await req.call(callee="slow", arguments={})
+    assert resp.state is OxyState.FAILED
+    assert "timed out" in resp.output
+    assert slow_tool.last_request.deadline == req.deadline
+
+    # Once the budget is spent, nested calls are not even started
+    slow_tool.last_request = None
+    resp = await req.call(callee="slow", arguments={})
+    assert "deadline reached" in resp.output
+    assert slow_tool.last_request is None
+
+
+@pytest.mark.asyncio
+async def test_call_allocations_benchmark(mas_env, monkeypatch):
+    """Compare bytes allocated per call() before/after structural sharing."""
+    agentA = DummyOxy("agentA")
+    toolX = DummyOxy("toolX")
+    agentA.permitted_tool_name_list = ["toolX"]
+    mas_env.oxy_name_to_oxy.update({"agentA": agentA, "toolX": toolX})
+
+    short_memory = [
+        {"role": "user", "content": [{"type": "text", "text": f"message {i}"}]}
+        for i in range(200)
+    ]
+
+    async def measure(rounds=20):
+        req = OxyRequest(
+            caller="agentA",
+            callee="agentA",
+            caller_category="agent",
+            callee_category="agent",
+            arguments={"query": "q", "short_memory": short_memory},
+        )
+        req.set_mas(mas_env)
+        await req.call(callee="toolX")
+        children = []
+        tracemalloc.start()
+        before, _ = tracemalloc.get_traced_memory()
+        for _ in range(rounds):
+            await req.call(callee="toolX")
+            children.append(toolX.last_request)
+        after, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return (after - before) / rounds, children
+
+    after_bytes, children = await measure()
+
+    def deep_clone_with(self, **kwargs):
+        new_instance = copy.deepcopy(self)
+        for key, value in kwargs.items():
+            setattr(new_instance, key, value)
+        return new_instance
+
+    monkeypatch.setattr(OxyRequest, "clone_with", deep_clone_with)
+    before_bytes, _ = await measure()
+
+    assert children[-1].arguments["short_memory"] is short_memory
+    assert after_bytes < before_bytes / 5
+
+
 # ──────────────────────────────────────────────────────────────────────────────
 # ❻ send_message
 # ──────────────────────────────────────────────────────────────────────────────
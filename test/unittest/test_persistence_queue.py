@@ -0,0 +1,228 @@
+"""
+Unit tests for oxygent.persistence_queue
+"""
+
+import asyncio
+import logging
+
+import pytest
+
+from oxygent.mas import MAS
+from oxygent.oxy.base_oxy import Oxy
+from oxygent.persistence_queue import PersistenceQueue
+from oxygent.schemas import OxyRequest, OxyResponse, OxyState
+
+
+class DummyEs:
+    def __init__(self, delay=0.0, is_failing=False, is_raising=False):
+        self.delay = delay
+        self.is_failing = is_failing
+        self.is_raising = is_raising
+        self.batches = []
+
+    async def bulk(self, actions):
+        await asyncio.sleep(self.delay)
+        self.batches.append(actions)
+        if self.is_raising:
+            raise ConnectionError("ES is down")
+        if self.is_failing:
+            return None
+        return {"errors": False, "items": [{"result": "created"} for _ in actions]}
+
+
+class DummyMas:
+    def __init__(self, persistence_queue):
+        self.persistence_queue = persistence_queue
+        self.es_client = persistence_queue.es_client
+
+
+class DummyOxy(Oxy):
+    async def _execute(self, oxy_request: OxyRequest) -> OxyResponse:
+        return OxyResponse(state=OxyState.COMPLETED, output="done")
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Coalescing and flushing
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.mark.asyncio
+async def test_pre_and_post_save_are_coalesced():
+    es = DummyEs()
+    queue = PersistenceQueue(es, flush_interval=10)
+    await queue.put("app_node", "n1", {"node_id": "n1", "create_time": "t0"})
+    await queue.put("app_node", "n1", {"output": "ok"}, is_update=True)
+    await queue.put("app_trace", "t1", {"output": ""})
+    await queue.close()
+
+    assert es.batches == [
+        [
+            {
+                "op_type": "index",
+                "index_name": "app_node",
+                "doc_id": "n1",
+                "body": {"node_id": "n1", "create_time": "t0", "output": "ok"},
+            },
+            {
+                "op_type": "index",
+                "index_name": "app_trace",
+                "doc_id": "t1",
+                "body": {"output": ""},
+            },
+        ]
+    ]
+    stats = queue.stats()
+    assert stats["coalesced"] == 1
+    assert stats["flushed"] == 2
+    assert stats["pending"] == 0
+
+
+@pytest.mark.asyncio
+async def test_flushes_by_size_and_by_time():
+    es = DummyEs()
+    queue = PersistenceQueue(es, max_batch_size=2, flush_interval=0.05)
+    await queue.put("idx", "1", {})
+    await queue.put("idx", "2", {})
+    await asyncio.sleep(0.01)
+    assert [len(batch) for batch in es.batches] == [2]
+
+    await queue.put("idx", "3", {})
+    await asyncio.sleep(0.1)
+    assert [len(batch) for batch in es.batches] == [2, 1]
+    assert queue.stats()["max_queue_lag"] > 0
+    await queue.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_bulk_is_counted():
+    queue = PersistenceQueue(DummyEs(is_failing=True), flush_interval=10)
+    await queue.put("idx", "1", {})
+    await queue.close()
+    assert queue.stats()["failed"] == 1
+    assert queue.stats()["flushed"] == 0
+
+
+@pytest.mark.asyncio
+async def test_raising_bulk_is_counted():
+    queue = PersistenceQueue(DummyEs(is_raising=True), flush_interval=10)
+    await queue.put("idx", "1", {})
+    await queue.put("idx", "2", {})
+    await queue.close()
+    assert queue.stats()["failed"] == 2
+    assert queue.stats()["pending"] == 0
+
+
+@pytest.mark.asyncio
+async def test_put_after_close_raises():
+    queue = PersistenceQueue(DummyEs())
+    await queue.close()
+    with pytest.raises(RuntimeError):
+        await queue.put("idx", "1", {})
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Overflow policies
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.mark.asyncio
+async def test_drop_policy_drops_new_records_only():
+    queue = PersistenceQueue(
+        DummyEs(), max_queue_size=1, flush_interval=10, overflow_policy="drop"
+    )
+    assert await queue.put("idx", "1", {"a": 1})
+    assert not await queue.put("idx", "2", {"a": 2})
+    # Coalescing into a pending record needs no room
+    assert await queue.put("idx", "1", {"b": 2}, is_update=True)
+    assert queue.stats()["dropped"] == 1
+    await queue.close()
+
+
+@pytest.mark.asyncio
+async def test_block_policy_waits_for_a_flush():
+    es = DummyEs(delay=0.05)
+    queue = PersistenceQueue(es, max_queue_size=1, flush_interval=10)
+    await queue.put("idx", "1", {})
+    # Room is made as soon as the flusher takes the first record
+    await asyncio.wait_for(queue.put("idx", "2", {}), timeout=1)
+    assert list(queue.pending) == [("idx", "2")]
+    await queue.close()
+    assert [batch[0]["doc_id"] for batch in es.batches] == ["1", "2"]
+
+
+def test_unknown_overflow_policy():
+    with pytest.raises(ValueError):
+        PersistenceQueue(DummyEs(), overflow_policy="spill")
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Oxy integration
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.mark.asyncio
+async def test_execute_writes_one_node_document():
+    es = DummyEs()
+    queue = PersistenceQueue(es, flush_interval=10)
+    oxy = DummyOxy(name="dummy", is_send_tool_call=False, is_send_observation=False)
+    oxy.mas = DummyMas(queue)
+
+    oxy_request = OxyRequest(arguments={"query": "q"}, caller="user")
+    oxy_request.callee = "dummy"
+    await oxy.execute(oxy_request)
+    await queue.close()
+
+    (batch,) = es.batches
+    (action,) = [a for a in batch if a["index_name"].endswith("_node")]
+    assert action["op_type"] == "index"
+    assert action["body"]["node_id"] == oxy_request.node_id
+    assert action["body"]["state"] == OxyState.COMPLETED.value
+    assert "create_time" in action["body"] and "update_time" in action["body"]
+
+
+@pytest.mark.asyncio
+async def test_execute_saves_output_before_formatting():
+    class FailingOxy(Oxy):
+        async def _execute(self, oxy_request: OxyRequest) -> OxyResponse:
+            return OxyResponse(state=OxyState.FAILED, output="raw error")
+
+    es = DummyEs()
+    queue = PersistenceQueue(es, flush_interval=10)
+    oxy = FailingOxy(
+        name="dummy",
+        is_send_tool_call=False,
+        is_send_observation=False,
+        friendly_error_text="Please try again",
+    )
+    oxy.mas = DummyMas(queue)
+
+    oxy_request = OxyRequest(arguments={"query": "q"}, caller="user")
+    oxy_request.callee = "dummy"
+    oxy_response = await oxy.execute(oxy_request)
+    await queue.close()
+
+    assert oxy_response.output == "Please try again"
+    (action,) = [a for a in es.batches[0] if a["index_name"].endswith("_node")]
+    assert action["body"]["output"] == "raw error"
+    assert "post_process" in action["body"]["timings"]
+
+
+@pytest.mark.asyncio
+async def test_continued_chat_reads_after_queued_writes(monkeypatch):
+    """A request with from_trace_id sees the records of the previous turn."""
+
+    class StopChat(Exception):
+        pass
+
+    class ReadingEs(DummyEs):
+        async def search(self, index_name, body):
+            pending_at_read.append(queue.stats()["pending"])
+            raise StopChat()
+
+    monkeypatch.setattr("oxygent.mas.logger", logging.getLogger(__name__))
+    pending_at_read = []
+    es = ReadingEs()
+    queue = PersistenceQueue(es, flush_interval=10)
+    mas = DummyMas(queue)
+    mas.func_filter = lambda payload: payload
+    await queue.put("app_history", "t1__user__agent", {"memory": "{}"})
+
+    with pytest.raises(StopChat):
+        await MAS.chat_with_agent(mas, {"query": "q", "from_trace_id": "t1"})
+    assert pending_at_read == [0]
+    assert [a["doc_id"] for a in es.batches[0]] == ["t1__user__agent"]
+    await queue.close()
@@ -0,0 +1,110 @@
+"""
+Unit tests for oxygent.profiling
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from oxygent import profiling
+from oxygent.oxy.base_oxy import Oxy
+from oxygent.profiling import TraceProfiler, watch_current_task
+from oxygent.routes import get_profile
+from oxygent.schemas import OxyRequest, OxyResponse, OxyState
+
+
+def burn_traced(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def burn_other(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+class BurningOxy(Oxy):
+    async def _execute(self, oxy_request: OxyRequest) -> OxyResponse:
+        burn_traced(0.05)
+        return OxyResponse(state=OxyState.COMPLETED, output="ok")
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        "oxygent.profiling.Config.get_cache_save_dir", lambda: str(tmp_path)
+    )
+    return tmp_path
+
+
+async def run_other_trace():
+    for _ in range(5):
+        burn_other(0.01)
+        await asyncio.sleep(0)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Sampling
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.mark.asyncio
+async def test_only_tasks_of_the_trace_are_sampled(cache_dir):
+    other = asyncio.create_task(run_other_trace())
+    async with TraceProfiler("t1", interval=0.001) as profiler:
+        for _ in range(5):
+            burn_traced(0.01)
+            await asyncio.sleep(0)
+    await other
+
+    assert "t1" not in profiling.active_profilers
+    assert profiler.samples > 0
+    text = (cache_dir / "profiles" / "t1.collapsed").read_text()
+    assert "burn_traced" in text
+    assert "burn_other" not in text
+    stack, count = text.splitlines()[0].rsplit(" ", 1)
+    assert int(count) > 0 and ";" in stack
+
+
+@pytest.mark.asyncio
+async def test_oxy_execute_adds_its_task(cache_dir):
+    oxy = BurningOxy(name="burning", is_save_data=False)
+
+    async def call():
+        oxy_request = OxyRequest(arguments={}, caller="user", current_trace_id="t2")
+        oxy_request.callee = "burning"
+        await oxy.execute(oxy_request)
+
+    async with TraceProfiler("t2", interval=0.001):
+        # A child task, as created by parallel calls
+        await asyncio.create_task(call())
+
+    assert "burn_traced" in (cache_dir / "profiles" / "t2.collapsed").read_text()
+
+
+@pytest.mark.asyncio
+async def test_watch_is_a_noop_without_profiler():
+    assert profiling.active_profilers == {}
+    watch_current_task("t3")
+    assert profiling.active_profilers == {}
+
+
+@pytest.mark.asyncio
+async def test_trace_cannot_be_profiled_twice(cache_dir):
+    async with TraceProfiler("t4"):
+        with pytest.raises(RuntimeError):
+            async with TraceProfiler("t4"):
+                pass
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Route
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.mark.asyncio
+async def test_profile_route(cache_dir):
+    (cache_dir / "profiles").mkdir()
+    (cache_dir / "profiles" / "t5.collapsed").write_text("main (a.py:1) 3\n")
+    assert (await get_profile("t5")).body.decode() == "main (a.py:1) 3\n"
+    assert (await get_profile("missing"))["code"] == 404
+    assert (await get_profile("../t5"))["code"] == 404
@@ -0,0 +1,79 @@
+"""
+Unit tests for ResultCache
+"""
+
+import pytest
+
+from oxygent.databases.db_redis.local_redis import LocalRedis
+from oxygent.result_cache import ResultCache
+from oxygent.schemas import OxyResponse, OxyState
+
+
+def completed(output):
+    return OxyResponse(state=OxyState.COMPLETED, output=output)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Tests
+# ──────────────────────────────────────────────────────────────────────────────
+def test_key_normalises_arguments():
+    assert ResultCache.get_key("t", {"a": 1, "b": 2}) == ResultCache.get_key(
+        "t", {"b": 2, "a": 1}
+    )
+    assert ResultCache.get_key("t", {"a": 1}) != ResultCache.get_key("u", {"a": 1})
+
+
+@pytest.mark.asyncio
+async def test_hit_miss_and_only_completed():
+    cache = ResultCache(ttl=60)
+    assert await cache.get("k") is None
+    await cache.set("k", OxyResponse(state=OxyState.FAILED, output="boom"))
+    assert await cache.get("k") is None
+    await cache.set("k", completed({"v": 1}))
+    hit = await cache.get("k")
+    assert hit.output == {"v": 1}
+    assert hit.extra["cache_hit"] == "memory"
+    # Callers can not corrupt the cached value
+    hit.output["v"] = 2
+    assert (await cache.get("k")).output == {"v": 1}
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 2
+
+
+@pytest.mark.asyncio
+async def test_ttl_expiry():
+    cache = ResultCache(ttl=0)
+    await cache.set("k", completed("v"))
+    assert await cache.get("k") is None
+    assert cache.stats()["entries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction_by_entries_and_bytes():
+    cache = ResultCache(ttl=60, max_entries=2)
+    await cache.set("a", completed("1"))
+    await cache.set("b", completed("2"))
+    await cache.get("a")
+    await cache.set("c", completed("3"))
+    assert set(cache.data) == {"a", "c"}
+    assert cache.stats()["evictions"] == 1
+
+    cache = ResultCache(ttl=60, max_bytes=100)
+    await cache.set("big", completed("x" * 200))
+    assert "big" not in cache.data
+    await cache.set("a", completed("x" * 40))
+    await cache.set("b", completed("x" * 40))
+    assert list(cache.data) == ["b"]
+    assert cache.stats()["bytes"] <= 100
+
+
+@pytest.mark.asyncio
+async def test_redis_tier_is_shared():
+    redis = LocalRedis()
+    writer = ResultCache(ttl=60, redis_client=redis)
+    reader = ResultCache(ttl=60, redis_client=redis)
+    await writer.set("k", completed(["a", "b"]))
+    hit = await reader.get("k")
+    assert hit.output == ["a", "b"]
+    assert hit.extra["cache_hit"] == "redis"
+    assert (await reader.get("k")).extra["cache_hit"] == "memory"
@@ -0,0 +1,208 @@
+"""
+Unit tests for RouterLLM
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from oxygent import metrics
+from oxygent.oxy.llms.router_llm import RouterLLM, is_endpoint_fault
+from oxygent.schemas import OxyRequest
+
+
+class FakeServers:
+    """Answer completions per host: a status code, or 200 after a delay."""
+
+    def __init__(self):
+        self.status = {}
+        self.delay = {}
+        self.calls = []
+
+    async def handle(self, request: httpx.Request):
+        host = request.url.host
+        self.calls.append(host)
+        await asyncio.sleep(self.delay.get(host, 0))
+        status = self.status.get(host, 200)
+        if status != 200:
+            return httpx.Response(status, json={"error": {"message": "down"}})
+        return httpx.Response(
+            200, json={"choices": [{"message": {"content": f"from {host}"}}]}
+        )
+
+
+@pytest.fixture(autouse=True)
+def config_patch(monkeypatch):
+    monkeypatch.setattr(
+        "oxygent.oxy.llms.http_llm.Config.get_llm_config", lambda: {}, raising=True
+    )
+
+
+@pytest.fixture
+def servers():
+    return FakeServers()
+
+
+@pytest.fixture
+def make_router(servers):
+    def make(**kwargs):
+        router = RouterLLM(
+            name="router",
+            api_key="sk-123",
+            model_name="m",
+            endpoints=[
+                {"base_url": "http://a/v1", "name": "a"},
+                {"base_url": "http://b/v1", "name": "b"},
+                {"base_url": "http://c/v1", "name": "c"},
+            ],
+            **kwargs,
+        )
+        for endpoint in router._endpoints:
+            endpoint.llm._client = httpx.AsyncClient(
+                transport=httpx.MockTransport(servers.handle)
+            )
+        return router
+
+    return make
+
+
+def make_request():
+    return OxyRequest(
+        arguments={"messages": [{"role": "user", "content": "hi"}]},
+        caller="user",
+    )
+
+
+def stats(router):
+    return {s["name"]: s for s in router.get_endpoint_stats()}
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Tests
+# ──────────────────────────────────────────────────────────────────────────────
+def test_endpoint_config_is_merged():
+    router = RouterLLM(
+        name="router",
+        api_key="sk-shared",
+        model_name="m",
+        timeout=12,
+        endpoints=[
+            {"base_url": "http://a/v1"},
+            {"base_url": "http://b/v1", "model_name": "n"},
+        ],
+    )
+    first, second = (endpoint.llm for endpoint in router._endpoints)
+    assert (first.api_key, first.model_name, first.timeout) == ("sk-shared", "m", 12)
+    assert second.model_name == "n"
+    assert router._endpoints[0].name == "http://a/v1"
+
+    with pytest.raises(ValueError):
+        RouterLLM(name="router", endpoints=[])
+
+
+def test_is_endpoint_fault():
+    def status_error(code):
+        request = httpx.Request("POST", "http://a")
+        return httpx.HTTPStatusError(
+            "", request=request, response=httpx.Response(code, request=request)
+        )
+
+    assert is_endpoint_fault(httpx.ConnectTimeout("timeout"))
+    assert is_endpoint_fault(status_error(503))
+    assert is_endpoint_fault(status_error(429))
+    assert not is_endpoint_fault(status_error(400))
+
+
+@pytest.mark.asyncio
+async def test_spreads_concurrent_calls_over_least_outstanding(make_router, servers):
+    router = make_router()
+    servers.delay = {"a": 0.05, "b": 0.05, "c": 0.05}
+    responses = await asyncio.gather(
+        *(router._execute(make_request()) for _ in range(3))
+    )
+
+    assert sorted(r.extra["endpoint"] for r in responses) == ["a", "b", "c"]
+    assert all(s["outstanding"] == 0 for s in stats(router).values())
+
+
+@pytest.mark.asyncio
+async def test_latency_strategy_prefers_fast_endpoint(make_router, servers):
+    router = make_router(strategy="latency")
+    servers.delay = {"a": 0.03, "b": 0.0, "c": 0.03}
+    for _ in range(3):  # one call on each endpoint to learn latencies
+        await router._execute(make_request())
+    servers.calls.clear()
+
+    for _ in range(3):
+        await router._execute(make_request())
+    assert servers.calls == ["b", "b", "b"]
+
+
+@pytest.mark.asyncio
+async def test_fails_over_and_ejects_broken_endpoint(make_router, servers):
+    router = make_router(cooldown=60)
+    servers.status = {"a": 503}
+    before = metrics.llm_endpoint_ejections.get("router", "a")
+
+    for _ in range(6):
+        response = await router._execute(make_request())
+        assert response.extra["endpoint"] in ("b", "c")
+
+    assert servers.calls.count("a") == 1
+    assert stats(router)["a"]["ejections"] == 1
+    assert stats(router)["a"]["cooldown_remaining"] > 0
+    assert "503" in stats(router)["a"]["last_error"]
+    assert metrics.llm_endpoint_ejections.get("router", "a") == before + 1
+
+
+@pytest.mark.asyncio
+async def test_fails_over_from_hanging_endpoint(make_router, servers):
+    router = make_router(timeout=0.3, cooldown=60)
+    servers.delay = {"a": 10, "b": 10}
+    router._turn = -1  # ties go to a, then b
+
+    response = await asyncio.wait_for(router._execute(make_request()), 0.3)
+    assert response.extra["endpoint"] == "c"
+    assert servers.calls == ["a", "b", "c"]
+    for name in ("a", "b"):
+        assert stats(router)[name]["ejections"] == 1
+        assert "TimeoutError" in stats(router)[name]["last_error"]
+
+
+@pytest.mark.asyncio
+async def test_ejected_endpoint_gets_a_trial_after_cooldown(make_router, servers):
+    router = make_router(cooldown=0.01)
+    servers.status = {"a": 503}
+    for _ in range(3):
+        await router._execute(make_request())
+    servers.status = {}
+    await asyncio.sleep(0.02)
+
+    for _ in range(3):
+        await router._execute(make_request())
+    assert stats(router)["a"]["consecutive_failures"] == 0
+
+
+@pytest.mark.asyncio
+async def test_client_errors_and_exhausted_pool_are_raised(make_router, servers):
+    router = make_router()
+    servers.status = {"a": 400, "b": 400, "c": 400}
+    with pytest.raises(httpx.HTTPStatusError):
+        await router._execute(make_request())
+    assert len(servers.calls) == 1
+    assert all(s["ejections"] == 0 for s in stats(router).values())
+
+    servers.calls.clear()
+    servers.status = {"a": 502, "b": 502, "c": 502}
+    with pytest.raises(httpx.HTTPStatusError):
+        await router._execute(make_request())
+    assert sorted(servers.calls) == ["a", "b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_cleanup_closes_endpoint_clients(make_router):
+    router = make_router()
+    clients = [endpoint.llm._client for endpoint in router._endpoints]
+    await router.cleanup()
+    assert all(client.is_closed for client in clients)
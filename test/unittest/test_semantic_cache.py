@@ -0,0 +1,185 @@
+"""
+Unit tests for the semantic answer cache
+"""
+
+import re
+
+import numpy as np
+import pytest
+
+from oxygent import metrics
+from oxygent.oxy.base_oxy import Oxy
+from oxygent.schemas import OxyRequest, OxyResponse, OxyState
+from oxygent.semantic_cache import SemanticCache, get_query_text
+
+VOCABULARY = ["price", "cost", "apple", "banana", "weather", "today"]
+SYNONYMS = {"cost": "price"}
+
+
+async def bag_of_words(text):
+    """Embed a text as the counts of the vocabulary words it contains."""
+    words = [SYNONYMS.get(w, w) for w in re.findall(r"\w+", text.lower())]
+    return np.array([words.count(w) for w in VOCABULARY], dtype=np.float32)
+
+
+class CountingAgent(Oxy):
+    calls: int = 0
+
+    async def _execute(self, oxy_request: OxyRequest) -> OxyResponse:
+        self.calls += 1
+        return OxyResponse(
+            state=OxyState.COMPLETED, output=f"answer {self.calls}", extra={"n": 1}
+        )
+
+
+def make_agent(cache, **kwargs):
+    return CountingAgent(
+        name="faq_agent",
+        desc="",
+        semantic_cache=cache,
+        is_save_data=False,
+        **kwargs,
+    )
+
+
+async def ask(agent, query, **kwargs):
+    return await agent.execute(
+        OxyRequest(arguments={"query": query}, caller="user", **kwargs)
+    )
+
+
+@pytest.fixture
+def cache():
+    return SemanticCache(threshold=0.8, embed=bag_of_words)
+
+
+def lookups(result):
+    return metrics.semantic_cache_lookups.get("faq_agent", result)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Index
+# ──────────────────────────────────────────────────────────────────────────────
+def test_get_query_text():
+    messages = [
+        {"role": "system", "content": "be brief"},
+        {"role": "user", "content": [{"type": "text", "text": "apple price"}]},
+    ]
+    assert get_query_text(OxyRequest(arguments={"messages": messages})) == (
+        "apple price",
+        messages[:1],
+    )
+    assert get_query_text(OxyRequest(arguments={"query": "hi"})) == ("hi", [])
+
+
+@pytest.mark.asyncio
+async def test_hit_above_threshold_and_miss_below(cache):
+    answer = OxyResponse(state=OxyState.COMPLETED, output="3 dollars")
+    await cache.add("apple price", "ctx", answer, latency=2.0)
+
+    hit = await cache.lookup("apple price today", "ctx")
+    assert hit.output == "3 dollars"
+    assert hit.extra["cache_hit"] == "semantic"
+    assert hit.extra["cache_query"] == "apple price"
+    assert hit.extra["cache_similarity"] < 1
+
+    assert await cache.lookup("banana price", "ctx") is None
+    assert await cache.lookup("apple price", "other ctx") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+    assert cache.stats()["saved_seconds"] == 2.0
+
+
+@pytest.mark.asyncio
+async def test_failed_answers_are_not_stored(cache):
+    await cache.add("apple", "ctx", OxyResponse(state=OxyState.FAILED, output="x"))
+    assert cache.stats()["entries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_expired_and_rejected_entries_are_dropped(cache):
+    answer = OxyResponse(state=OxyState.COMPLETED, output="sunny")
+    cache.ttl = -1
+    await cache.add("weather today", "ctx", answer)
+    assert await cache.lookup("weather today", "ctx") is None
+    assert cache.stats()["entries"] == 0
+
+    cache.ttl = 60
+    cache.validator = lambda entry: entry["output"] != "sunny"
+    await cache.add("weather today", "ctx", answer)
+    assert await cache.lookup("weather today", "ctx") is None
+    assert cache.stats()["entries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_invalidate_and_evict(cache):
+    answer = OxyResponse(state=OxyState.COMPLETED, output="ok")
+    await cache.add("apple", "a", answer)
+    await cache.add("banana", "a", answer)
+    await cache.add("weather", "b", answer)
+
+    assert cache.invalidate(lambda entry: entry["query"] == "apple") == 1
+    assert cache.invalidate(context_key="a") == 1
+    assert cache.stats()["entries"] == 1
+
+    cache.max_entries = 1
+    await cache.add("today", "b", answer)
+    assert [e["query"] for e in cache.entries["b"]] == ["today"]
+
+
+@pytest.mark.asyncio
+async def test_evict_keeps_other_contexts_indexed(cache):
+    answer = OxyResponse(state=OxyState.COMPLETED, output="ok")
+    cache.max_entries = 2
+    await cache.add("apple", "a", answer)
+    await cache.add("weather", "b", answer)
+    assert await cache.lookup("weather", "b") is not None
+    matrix = cache._matrices["b"]
+
+    await cache.add("banana", "a", answer)
+    assert [e["query"] for e in cache.entries["a"]] == ["banana"]
+    assert cache._matrices["b"] is matrix
+
+
+@pytest.mark.asyncio
+async def test_hits_do_not_share_the_cached_output(cache):
+    answer = OxyResponse(state=OxyState.COMPLETED, output={"items": [1]})
+    await cache.add("apple", "ctx", answer)
+    answer.output["items"].append(2)
+
+    hit = await cache.lookup("apple", "ctx")
+    hit.output["items"].append(3)
+    assert (await cache.lookup("apple", "ctx")).output == {"items": [1]}
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Oxy integration
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.mark.asyncio
+async def test_agent_reuses_answer_of_paraphrase(cache):
+    agent = make_agent(cache)
+    hits, misses = lookups("hit"), lookups("miss")
+
+    first = await ask(agent, "apple price")
+    second = await ask(agent, "How much does an apple cost?")
+    assert agent.calls == 1
+    assert second.output == first.output == "answer 1"
+    assert second.extra["cache_hit"] == "semantic"
+    assert lookups("hit") == hits + 1
+    assert lookups("miss") == misses + 1
+
+    await ask(agent, "banana price")
+    assert agent.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_context_version_and_history_bypass(cache):
+    agent = make_agent(cache)
+    await ask(agent, "apple price")
+
+    agent.semantic_cache_context = "tools-v2"
+    await ask(agent, "apple price")
+    assert agent.calls == 2
+
+    await ask(agent, "apple price", from_trace_id="trace-1")
+    assert agent.calls == 3
@@ -0,0 +1,220 @@
+"""
+Unit tests for token accounting and prompt packing
+"""
+
+import threading
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from oxygent import tokenizer
+from oxygent.oxy.agents.chat_agent import ChatAgent
+from oxygent.oxy.llms.base_llm import BaseLLM
+from oxygent.schemas import OxyRequest, OxyResponse, OxyState
+from oxygent.tokenizer import (
+    MEDIA_PART_TOKENS,
+    MESSAGE_OVERHEAD,
+    REPLY_OVERHEAD,
+    TokenCounter,
+    approximate_token_count,
+    pack_messages,
+)
+
+
+class DummyLLM(BaseLLM):
+    async def _execute(self, oxy_request: OxyRequest) -> OxyResponse:
+        return OxyResponse(state=OxyState.COMPLETED, output="")
+
+
+class DummyMAS:
+    def __init__(self, **oxys):
+        self.oxy_name_to_oxy = oxys
+
+
+def word_tokenize(text):
+    """One token per whitespace-separated word."""
+    return text.split()
+
+
+def user(content):
+    return {"role": "user", "content": content}
+
+
+def assistant(content):
+    return {"role": "assistant", "content": content}
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Counting
+# ──────────────────────────────────────────────────────────────────────────────
+def test_approximate_count_is_not_character_count():
+    assert approximate_token_count("") == 0
+    assert approximate_token_count("你好世界") == 4
+    assert approximate_token_count("international") == 4
+    assert approximate_token_count("x = 1234;") == 5
+    # CJK takes far more tokens per character than English
+    assert approximate_token_count("今天天气很好") > approximate_token_count("weather")
+
+
+def test_counter_caches_per_string():
+    calls = []
+
+    def tokenize(text):
+        calls.append(text)
+        return word_tokenize(text)
+
+    counter = TokenCounter(func_tokenize=tokenize, max_cached=2)
+    assert counter.is_exact
+    assert counter.count("a b c") == 3
+    assert counter.count("a b c") == 3
+    assert calls == ["a b c"]
+
+    counter.count("d")
+    counter.count("e f")
+    counter.count("a b c")
+    assert calls == ["a b c", "d", "e f", "a b c"]
+
+
+def test_counter_accepts_token_counts_and_multimodal_messages():
+    counter = TokenCounter(func_tokenize=lambda text: len(text))
+    message = user(
+        [
+            {"type": "text", "text": "abcd"},
+            {"type": "image_url", "image_url": {"url": "http://x/1.png"}},
+        ]
+    )
+    assert counter.count_message(message) == 4 + MEDIA_PART_TOKENS + MESSAGE_OVERHEAD
+    assert counter.count_messages([user("ab")]) == 2 + MESSAGE_OVERHEAD + REPLY_OVERHEAD
+
+
+class SlowTiktoken:
+    """Stand-in of tiktoken whose encoding takes a while to download."""
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def encoding_for_model(self, model_name):
+        self.release.wait(5)
+        return SimpleNamespace(encode=lambda text, **kwargs: text.split())
+
+
+@pytest.mark.asyncio
+async def test_tiktoken_encoding_loads_off_the_loop(monkeypatch):
+    fake = SlowTiktoken()
+    monkeypatch.setattr(tokenizer, "tiktoken", fake)
+    monkeypatch.setattr(tokenizer, "_encodings", {})
+    monkeypatch.setattr(tokenizer, "_loading", set())
+
+    counter = TokenCounter(model_name="slow-model")
+    text = "international weather"
+    # Approximated while loading, and not cached
+    assert counter.count(text) == approximate_token_count(text)
+    assert counter._cache == {}
+
+    fake.release.set()
+    await tokenizer.load_tiktoken_encoding("slow-model")
+    assert counter.is_exact
+    assert counter.count(text) == 2
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Packing
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.fixture
+def counter():
+    return TokenCounter(func_tokenize=word_tokenize)
+
+
+def test_pack_keeps_everything_within_budget(counter):
+    system, query = [{"role": "system", "content": "be brief"}], [user("q")]
+    short = [user("one"), assistant("two")]
+    react = [assistant("call"), user("observation")]
+    packed = pack_messages(counter, 1000, system, short, query, react)
+    assert packed == system + short + query + react
+
+
+def test_pack_drops_oldest_exchanges_whole(counter):
+    system, query = [{"role": "system", "content": "s"}], [user("q")]
+    short = [
+        user("old question"),
+        assistant("old answer"),
+        user("new question"),
+        assistant("new answer"),
+    ]
+    react = [
+        assistant("call one"),
+        user("long observation " * 5),
+        assistant("call two"),
+        user("result"),
+    ]
+    fixed = 2 * (1 + MESSAGE_OVERHEAD) + REPLY_OVERHEAD
+    last_react = 2 + 1 + 2 * MESSAGE_OVERHEAD
+    last_short = 4 + 2 * MESSAGE_OVERHEAD
+
+    packed = pack_messages(
+        counter, fixed + last_react + last_short, system, short, query, react
+    )
+    assert packed == system + short[2:] + query + react[2:]
+
+    # ReAct memory of the current call comes before the session history
+    packed = pack_messages(counter, fixed + last_react, system, short, query, react)
+    assert packed == system + query + react[2:]
+
+
+def test_pack_never_drops_system_or_query(counter):
+    system, query = [{"role": "system", "content": "a b c d e"}], [user("f g h")]
+    packed = pack_messages(counter, 1, system, [user("x"), assistant("y")], query)
+    assert packed == system + query
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# LLM and agent integration
+# ──────────────────────────────────────────────────────────────────────────────
+def test_llm_budget_and_counter(monkeypatch):
+    monkeypatch.setattr(
+        "oxygent.oxy.llms.base_llm.Config.get_llm_config", lambda: {"max_tokens": 100}
+    )
+    llm = DummyLLM(name="llm", func_tokenize=word_tokenize)
+    assert llm.get_prompt_budget() == 0
+    llm.context_window = 1000
+    assert llm.get_prompt_budget() == 900
+    llm.llm_params = {"max_tokens": 300}
+    assert llm.get_prompt_budget() == 700
+    assert llm.get_token_counter() is llm.get_token_counter()
+    assert llm.get_token_counter().count("a b") == 2
+
+
+@pytest.mark.asyncio
+async def test_chat_agent_packs_into_budget(monkeypatch):
+    llm = DummyLLM(name="llm", func_tokenize=word_tokenize)
+    agent = ChatAgent(name="chat", desc="", llm_model="llm", prompt="be brief")
+    agent.set_mas(DummyMAS(llm=llm))
+    oxy_request = OxyRequest(
+        arguments={
+            "query": "new question",
+            "short_memory": [
+                user("old question"),
+                assistant("old answer " * 50),
+                user("recent question"),
+                assistant("recent answer"),
+            ],
+        },
+        caller="user",
+    )
+    call = AsyncMock(return_value=OxyResponse(state=OxyState.COMPLETED, output=""))
+    monkeypatch.setattr("oxygent.schemas.OxyRequest.call", call)
+
+    await agent._execute(oxy_request)
+    assert len(call.call_args.kwargs["arguments"]["messages"]) == 6
+
+    agent.max_prompt_tokens = 40
+    await agent._execute(oxy_request)
+    messages = call.call_args.kwargs["arguments"]["messages"]
+    assert [m["content"] for m in messages] == [
+        "be brief",
+        "recent question",
+        "recent answer",
+        "new question",
+    ]
+    assert llm.get_token_counter().count_messages(messages) <= 40
@@ -0,0 +1,155 @@
+"""
+Unit tests for oxygent.tracing
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from oxygent.oxy.base_oxy import Oxy
+from oxygent.schemas import OxyRequest, OxyResponse, OxyState
+from oxygent.tracing import (
+    BatchSpanProcessor,
+    OTLPJsonFileExporter,
+    get_otel_span_id,
+    get_otel_trace_id,
+    get_traceparent,
+    parse_traceparent,
+)
+
+
+class DummyExporter:
+    def __init__(self):
+        self.batches = []
+
+    def export(self, spans):
+        self.batches.append(spans)
+
+
+class DummyMas:
+    def __init__(self, span_processor):
+        self.span_processor = span_processor
+        self.oxy_name_to_oxy = {}
+        self.message_prefix = "oxygent"
+        self.name = "app"
+
+    async def send_message(self, message, redis_key):
+        pass
+
+
+class DummyOxy(Oxy):
+    async def _execute(self, oxy_request: OxyRequest) -> OxyResponse:
+        if oxy_request.arguments.get("depth", 0) > 0:
+            await oxy_request.call(callee="dummy", arguments={"depth": 0})
+        return OxyResponse(
+            state=OxyState.COMPLETED, output="ok", extra={"usage": {"total_tokens": 9}}
+        )
+
+
+def get_attributes(span):
+    return {a["key"]: next(iter(a["value"].values())) for a in span["attributes"]}
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Trace context
+# ──────────────────────────────────────────────────────────────────────────────
+def test_traceparent_round_trip():
+    oxy_request = OxyRequest(arguments={}, current_trace_id="t1", node_id="n1")
+    traceparent = get_traceparent(oxy_request)
+    assert parse_traceparent(traceparent) == (
+        get_otel_trace_id("t1"),
+        get_otel_span_id("n1"),
+    )
+    assert parse_traceparent("garbage") is None
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Processor and exporter
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.mark.asyncio
+async def test_processor_batches_by_size_and_on_shutdown():
+    exporter = DummyExporter()
+    processor = BatchSpanProcessor(exporter, max_batch_size=2, schedule_delay=10)
+    for i in range(3):
+        processor.on_end({"spanId": str(i)})
+    await asyncio.sleep(0.05)
+    assert [len(batch) for batch in exporter.batches] == [2]
+    await processor.shutdown()
+    assert [len(batch) for batch in exporter.batches] == [2, 1]
+    assert processor.exported == 3
+
+
+@pytest.mark.asyncio
+async def test_processor_drops_when_full():
+    processor = BatchSpanProcessor(DummyExporter(), max_queue_size=1)
+    processor.on_end({})
+    processor.on_end({})
+    assert processor.dropped == 1
+    await processor.shutdown()
+
+
+def test_file_exporter_writes_otlp_json_lines(tmp_path):
+    exporter = OTLPJsonFileExporter(str(tmp_path / "traces.jsonl"), "app")
+    exporter.export([{"spanId": "a"}])
+    exporter.export([{"spanId": "b"}])
+    lines = (tmp_path / "traces.jsonl").read_text().splitlines()
+    assert len(lines) == 2
+    resource_spans = json.loads(lines[0])["resourceSpans"][0]
+    assert resource_spans["scopeSpans"][0]["spans"] == [{"spanId": "a"}]
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Oxy integration
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.mark.asyncio
+async def test_execute_exports_linked_spans():
+    exporter = DummyExporter()
+    processor = BatchSpanProcessor(exporter)
+    mas = DummyMas(processor)
+    oxy = DummyOxy(
+        name="dummy",
+        is_save_data=False,
+        is_send_tool_call=False,
+    )
+    oxy.mas = mas
+    mas.oxy_name_to_oxy["dummy"] = oxy
+    oxy.add_permitted_tool("dummy")
+
+    oxy_request = OxyRequest(
+        arguments={"depth": 1}, caller="user", current_trace_id="t1", mas=mas
+    )
+    oxy_request.callee = "dummy"
+    oxy_request.node_id = "root"
+    await oxy.execute(oxy_request)
+    await processor.shutdown()
+
+    child, root = [span for batch in exporter.batches for span in batch]
+    assert root["spanId"] == get_otel_span_id("root")
+    assert "parentSpanId" not in root
+    assert child["parentSpanId"] == root["spanId"]
+    assert child["traceId"] == root["traceId"] == get_otel_trace_id("t1")
+    attributes = get_attributes(root)
+    assert attributes["oxy.state"] == "COMPLETED"
+    assert attributes["oxy.attempts"] == "1"
+    assert attributes["llm.usage.total_tokens"] == "9"
+
+
+@pytest.mark.asyncio
+async def test_remote_root_joins_the_caller_trace():
+    exporter = DummyExporter()
+    processor = BatchSpanProcessor(exporter)
+    oxy = DummyOxy(name="dummy", is_save_data=False)
+    oxy.mas = DummyMas(processor)
+
+    caller = OxyRequest(arguments={}, current_trace_id="remote", node_id="sse")
+    oxy_request = OxyRequest(
+        arguments={}, caller="user", trace_parent=get_traceparent(caller)
+    )
+    oxy_request.callee = "dummy"
+    await oxy.execute(oxy_request)
+    await processor.shutdown()
+
+    (span,) = exporter.batches[0]
+    assert span["traceId"] == get_otel_trace_id("remote")
+    assert span["parentSpanId"] == get_otel_span_id("sse")